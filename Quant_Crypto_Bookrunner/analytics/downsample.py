@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points that keep the shape of ``y``.
+
+    The first and last points are always kept; every bucket in between contributes
+    the point forming the largest triangle with the previously kept point and the
+    average of the next bucket.  ``x`` must be increasing; NaNs in ``y`` are never chosen
+    unless a whole bucket is NaN.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.empty(threshold, dtype=np.int64)
+    edges[:-1] = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    edges[-1] = n
+    # Bucket averages, computed once; bucket i's triangle uses the average of bucket i + 1.
+    y_filled = np.where(np.isnan(y), np.nanmean(y) if not np.isnan(y).all() else 0.0, y)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x, edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y_filled, edges[:-1]) / sizes
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y_filled[a]
+        area = np.abs((ax - avg_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y[i + 1] - ay))
+        a = lo + (int(np.nanargmax(area)) if not np.isnan(area).all() else 0)
+        out[i + 1] = a
+    return out
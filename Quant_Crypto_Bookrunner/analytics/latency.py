@@ -0,0 +1,162 @@
+from typing import Dict, List, Tuple
+import asyncio
+from time import perf_counter_ns
+
+# Mantissa bits per power-of-two range: 2**-(SIG_BITS - 1) ~ 3% worst-case bucket error.
+SIG_BITS = 6
+_HALF = 1 << (SIG_BITS - 1)
+_N_BUCKETS = (64 - SIG_BITS + 1) * _HALF + _HALF
+
+STAGES = ("fetch", "decode", "strategy", "order_send")
+
+now_ns = perf_counter_ns
+
+
+def _bucket_value(index: int) -> int:
+    """Highest value that maps to bucket ``index``."""
+    if index < 2 * _HALF:
+        return index
+    shift = index // _HALF - 1
+    mantissa = index - shift * _HALF
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of nanosecond durations.
+
+    ``record`` is a couple of integer ops and one list increment with no locking;
+    each histogram is meant to have a single writer (the event-loop thread).
+    """
+
+    __slots__ = ("counts", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.max = 0
+
+    def record(self, ns: int):
+        bits = ns.bit_length()
+        self.counts[ns if bits <= SIG_BITS else (bits - SIG_BITS) * _HALF + (ns >> (bits - SIG_BITS))] += 1
+        self.count += 1
+        if ns > self.max:
+            self.max = ns
+
+    def record_since(self, start_ns: int) -> int:
+        """Record the time since ``start_ns`` and return the current clock."""
+        end = perf_counter_ns()
+        self.record(end - start_ns)
+        return end
+
+    def percentile(self, q: float) -> int:
+        """Duration (ns) at percentile ``q`` in [0, 100], accurate to the bucket width."""
+        if not self.count:
+            return 0
+        rank = max(1, int(self.count * q / 100 + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_value(index), self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.max = 0
+
+
+class _NullHistogram:
+    __slots__ = ()
+    count = 0
+    max = 0
+
+    def record(self, ns: int):
+        pass
+
+    def record_since(self, start_ns: int) -> int:
+        return 0
+
+    def percentile(self, q: float) -> int:
+        return 0
+
+
+class LatencyRecorder:
+    """Histograms keyed by (exchange, symbol, stage).
+
+    Look a histogram up once with ``histogram`` and keep it on the hot path::
+
+        h = recorder.histogram("binance", "BTC/USDT", "strategy")
+        t0 = now_ns()
+        strategy.on_tick(symbol, book)
+        h.record_since(t0)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+
+    def histogram(self, exchange: str, symbol: str, stage: str) -> LatencyHistogram:
+        key = (exchange, symbol, stage)
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = LatencyHistogram()
+        return hist
+
+    def summary(self) -> List[Dict]:
+        """One row per histogram with count and p50/p99/p99.9/max in microseconds."""
+        rows = []
+        for (exchange, symbol, stage), hist in sorted(self.histograms.items()):
+            if not hist.count:
+                continue
+            rows.append({
+                "exchange": exchange,
+                "symbol": symbol,
+                "stage": stage,
+                "count": hist.count,
+                "p50_us": hist.percentile(50) / 1000,
+                "p99_us": hist.percentile(99) / 1000,
+                "p99.9_us": hist.percentile(99.9) / 1000,
+                "max_us": hist.max / 1000,
+            })
+        return rows
+
+    def format_line(self) -> str:
+        return " | ".join(
+            f"{r['exchange']} {r['symbol']} {r['stage']} n={r['count']} "
+            f"p50={r['p50_us']:.0f}us p99={r['p99_us']:.0f}us p99.9={r['p99.9_us']:.0f}us"
+            for r in self.summary()
+        )
+
+    async def report_every(self, interval: float):
+        """Print the percentile line every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            line = self.format_line()
+            if line:
+                print("[Latency]", line)
+
+
+class NullLatencyRecorder(LatencyRecorder):
+    """Drop-in recorder whose histograms ignore every sample."""
+
+    enabled = False
+    _NULL = _NullHistogram()
+
+    def histogram(self, exchange: str, symbol: str, stage: str) -> _NullHistogram:
+        return self._NULL
+
+    def summary(self) -> List[Dict]:
+        return []
+
+    async def report_every(self, interval: float):
+        return
+
+
+NULL_RECORDER = NullLatencyRecorder()
@@ -5,6 +5,9 @@ def summary(perf: pd.DataFrame) -> pd.DataFrame:
     """Return common performance metrics from a trade log DataFrame.
 
     Expected columns: ['timestamp', 'pnl']
+
+    Recomputes over the whole frame; for live sessions use the incremental
+    ``analytics.streaming.PerformanceAccumulator``.
     """
     cumulative = perf["pnl"].cumsum()
     out = {
@@ -1,9 +1,211 @@
-from typing import Dict
+from statistics import NormalDist
+from typing import Dict, Iterable, Mapping, Sequence
 
+import numpy as np
+import pandas as pd
 
-def compute_var(inventory: Dict[str, float], price_map: Dict[str, float], confidence: float = 0.95) -> float:
-    """Compute a naive Value-at-Risk assuming independence & normal returns (demo only)."""
-    # Placeholder implementation
+RISKMETRICS_DECAY = 0.94
+
+
+def compute_var(inventory: Dict[str, float], price_map: Dict[str, float], confidence: float = 0.95,
+                engine: "RiskEngine | None" = None) -> float:
+    """Compute Value-at-Risk for ``inventory``.
+
+    With a ``RiskEngine`` this is parametric VaR from its EWMA covariance; without
+    one it falls back to a naive 2% move on gross exposure (demo only).
+    """
+    if engine is not None:
+        return engine.parametric_var(engine.exposures(inventory, price_map), confidence)
     exposure = sum(value * price_map.get(asset, 0.0) for asset, value in inventory.items())
     var = exposure * 0.02  # assume 2% daily move at 95% conf
-    return var
\ No newline at end of file
+    return var
+
+
+class RiskEngine:
+    """Portfolio VaR over a fixed asset universe with an incrementally updated EWMA covariance.
+
+    * ``update_prices`` takes one bar of closes: it appends the log returns to a
+      ``window``-long ring buffer and applies the RiskMetrics rank-one update
+      ``cov = decay * cov + (1 - decay) * r r^T``.
+    * ``parametric_var``, ``historical_var`` and ``filtered_historical_var`` value any
+      exposure vector in one NumPy pass.
+    * For pre-trade checks the engine also holds current positions: ``set_positions``,
+      ``mark`` and ``apply_fill`` keep ``cov @ w`` and ``w^T cov w`` up to date in O(n), so
+      ``projected_var``/``check`` are a handful of scalar operations per tick.
+
+    VaR is reported as a positive loss over one bar (scaled by ``sqrt(horizon)``).
+    """
+
+    def __init__(self, assets: Sequence[str], *, decay: float = RISKMETRICS_DECAY, window: int = 500,
+                 confidence: float = 0.99, horizon: float = 1.0, var_limit: float | None = None):
+        self.assets = list(assets)
+        self.index = {asset: i for i, asset in enumerate(self.assets)}
+        n = len(self.assets)
+        self.decay = decay
+        self.window = window
+        self.confidence = confidence
+        self.horizon = horizon
+        self.var_limit = var_limit
+        self.cov = np.zeros((n, n))
+        self.returns = np.zeros((window, n))
+        self.vols = np.zeros((window, n))  # EWMA vol in force when each return arrived
+        self.bars = 0
+        self._last = np.full(n, np.nan)
+        # Live book for pre-trade checks.
+        self.qty = np.zeros(n)
+        self.prices = np.full(n, np.nan)
+        self._w = np.zeros(n)
+        self._cov_w = np.zeros(n)
+        self._var_w = 0.0
+        self._z = NormalDist().inv_cdf(confidence)
+
+    # ------------- Market data ------------- #
+    def update_prices(self, closes: Mapping[str, float] | np.ndarray):
+        """Feed one bar of closing prices (dict by asset or array in ``assets`` order)."""
+        prices = self._vector(closes)
+        if not np.isnan(self._last).all():
+            r = np.log(prices / self._last)
+            r[~np.isfinite(r)] = 0.0
+            vol = np.sqrt(np.diag(self.cov))
+            slot = self.bars % self.window
+            self.returns[slot] = r
+            self.vols[slot] = vol
+            if self.bars == 0:
+                self.cov = np.outer(r, r)
+            else:
+                self.cov *= self.decay
+                self.cov += (1 - self.decay) * np.outer(r, r)
+            self.bars += 1
+        self._last = np.where(np.isnan(prices), self._last, prices)
+        self.mark_all(prices)
+
+    @classmethod
+    def from_bars(cls, closes: Mapping[str, pd.DataFrame | pd.Series], **kwargs) -> "RiskEngine":
+        """Build from per-asset history, e.g. ``TiingoConnector.get_historical_prices`` frames."""
+        series = {asset: (bars["close"] if isinstance(bars, pd.DataFrame) else bars) for asset, bars in closes.items()}
+        aligned = pd.DataFrame(series).sort_index().ffill().dropna()
+        engine = cls(list(aligned.columns), **kwargs)
+        for row in aligned.to_numpy():
+            engine.update_prices(row)
+        return engine
+
+    def _vector(self, values: Mapping[str, float] | np.ndarray) -> np.ndarray:
+        if isinstance(values, np.ndarray):
+            return values.astype(float)
+        out = np.full(len(self.assets), np.nan)
+        for asset, value in values.items():
+            i = self.index.get(asset)
+            if i is not None:
+                out[i] = value
+        return out
+
+    def exposures(self, inventory: Mapping[str, float], prices: Mapping[str, float] | None = None) -> np.ndarray:
+        """Signed notional per asset (``qty * price``, using the last marks for missing prices)."""
+        qty = np.nan_to_num(self._vector(inventory))
+        px = self.prices
+        if prices is not None:
+            marks = self._vector(prices)
+            px = np.where(np.isnan(marks), px, marks)
+        return np.nan_to_num(qty * px)
+
+    # ------------- VaR ------------- #
+    def parametric_var(self, w: np.ndarray | None = None, confidence: float | None = None) -> float:
+        z = self._z if confidence is None else NormalDist().inv_cdf(confidence)
+        variance = self._var_w if w is None else float(w @ self.cov @ w)
+        return z * float(np.sqrt(max(variance, 0.0) * self.horizon))
+
+    def historical_var(self, w: np.ndarray | None = None, confidence: float | None = None) -> float:
+        """Loss quantile of today's exposures replayed over the stored return window."""
+        w = self._w if w is None else w
+        return self._loss_quantile(self._filled(self.returns) @ w, confidence)
+
+    def filtered_historical_var(self, w: np.ndarray | None = None, confidence: float | None = None) -> float:
+        """Historical VaR with each past return rescaled from its own EWMA vol to today's.
+
+        Returns that arrived before any vol estimate (the first bar) are used unscaled.
+        """
+        w = self._w if w is None else w
+        returns, vols = self._filled(self.returns), self._filled(self.vols)
+        now = np.sqrt(np.diag(self.cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = np.where(vols > 0, returns / vols * now, returns)
+        return self._loss_quantile(scaled @ w, confidence)
+
+    def _filled(self, buf: np.ndarray) -> np.ndarray:
+        return buf[: min(self.bars, self.window)]
+
+    def _loss_quantile(self, pnl: np.ndarray, confidence: float | None) -> float:
+        if not len(pnl):
+            return 0.0
+        q = 1 - (self.confidence if confidence is None else confidence)
+        return float(max(-np.quantile(pnl, q), 0.0) * np.sqrt(self.horizon))
+
+    # ------------- Live positions & pre-trade checks ------------- #
+    def set_positions(self, inventory: Mapping[str, float]):
+        self.qty = np.nan_to_num(self._vector(inventory))
+        self._rebuild()
+
+    def mark_all(self, prices: Mapping[str, float] | np.ndarray):
+        p = self._vector(prices)
+        self.prices = np.where(np.isnan(p), self.prices, p)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._w = np.nan_to_num(self.qty * self.prices)
+        self._cov_w = self.cov @ self._w
+        self._var_w = float(self._w @ self._cov_w)
+
+    def _shift(self, i: int, d: float):
+        """Exposure of asset ``i`` changes by ``d``: O(n) update of ``cov @ w`` and ``w^T cov w``."""
+        row = self.cov[i]
+        self._var_w += 2 * d * self._cov_w[i] + d * d * row[i]
+        self._cov_w += d * row
+        self._w[i] += d
+
+    def mark(self, asset: str, price: float):
+        """Update one asset's live price (e.g. a new mid)."""
+        i = self.index[asset]
+        old = self.prices[i]
+        self.prices[i] = price
+        if self.qty[i]:
+            self._shift(i, self.qty[i] * (price - (0.0 if old != old else old)))
+
+    def apply_fill(self, asset: str, delta_qty: float, price: float | None = None):
+        i = self.index[asset]
+        if price is not None:
+            self.mark(asset, price)
+        self.qty[i] += delta_qty
+        if self.prices[i] == self.prices[i]:
+            self._shift(i, delta_qty * self.prices[i])
+
+    def projected_var(self, asset: str, delta_qty: float) -> float:
+        """Parametric VaR if ``delta_qty`` of ``asset`` were traded at its current mark."""
+        i = self.index[asset]
+        d = delta_qty * self.prices[i]
+        if d != d:
+            d = 0.0
+        variance = self._var_w + 2 * d * self._cov_w[i] + d * d * self.cov[i, i]
+        return self._z * (max(variance, 0.0) * self.horizon) ** 0.5
+
+    def check(self, asset: str, delta_qty: float) -> bool:
+        """True when the trade keeps parametric VaR within ``var_limit`` (or does not increase it)."""
+        if self.var_limit is None or asset not in self.index:
+            return True
+        projected = self.projected_var(asset, delta_qty)
+        return projected <= self.var_limit or projected <= self.parametric_var()
+
+    def report(self, confidence: float | None = None) -> Dict[str, float]:
+        return {
+            "parametric_var": self.parametric_var(confidence=confidence),
+            "historical_var": self.historical_var(confidence=confidence),
+            "filtered_historical_var": self.filtered_historical_var(confidence=confidence),
+        }
+
+
+def closes_from_tiingo(tiingo, assets: Iterable[str], start_date: str, end_date: str,
+                       quote: str = "usd") -> Dict[str, pd.Series]:
+    """Daily closes per base asset from Tiingo (served from its on-disk cache when warm)."""
+    return {
+        asset: tiingo.get_historical_prices(f"{asset.lower()}{quote}", start_date, end_date)["close"]
+        for asset in assets
+    }
@@ -0,0 +1,214 @@
+"""Online versions of ``post_trade.summary`` that update in O(1) per PnL sample.
+
+``PerformanceAccumulator`` keeps running totals (Welford mean/variance, running
+peak and drawdown, turnover, fills) for a whole session and can ``merge`` the
+accumulators of consecutive back-test shards.  ``RollingPerformance`` keeps the
+same statistics over the last ``window`` samples in a ring buffer.
+"""
+from collections import deque
+import math
+
+import numpy as np
+import pandas as pd
+
+ANNUALIZATION = 252 ** 0.5
+
+
+def _sharpe(mean: float, var: float) -> float:
+    # Same epsilon and scaling as post_trade.summary.
+    return mean / (math.sqrt(max(var, 0.0)) + 1e-9) * ANNUALIZATION
+
+
+class PerformanceAccumulator:
+    """Running PnL statistics that agree with ``post_trade.summary`` on the same samples.
+
+    Feed one ``update`` per PnL sample (a fill or a mark-to-market step); fills and
+    traded notional can be attributed to the same call.
+    """
+
+    __slots__ = ("count", "mean", "m2", "total", "peak", "trough", "max_drawdown", "turnover", "fills")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.peak = -math.inf  # highest cumulative PnL so far
+        self.trough = math.inf  # lowest cumulative PnL so far (needed to merge shards)
+        self.max_drawdown = 0.0
+        self.turnover = 0.0
+        self.fills = 0
+
+    def update(self, pnl: float, notional: float = 0.0, fills: int = 0):
+        self.count += 1
+        delta = pnl - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (pnl - self.mean)
+        self.total += pnl
+        if self.total > self.peak:
+            self.peak = self.total
+        elif self.peak - self.total > self.max_drawdown:
+            self.max_drawdown = self.peak - self.total
+        if self.total < self.trough:
+            self.trough = self.total
+        self.turnover += abs(notional)
+        self.fills += fills
+
+    def on_fill(self, fill: dict, pnl: float = 0.0):
+        """Count a fill dict (``filled``/``price`` as sent to ``on_order_fill``) with its PnL impact."""
+        self.update(pnl, float(fill["filled"]) * float(fill["price"]), 1)
+
+    @classmethod
+    def from_frame(cls, perf: pd.DataFrame) -> "PerformanceAccumulator":
+        """Vectorized build from a ``timestamp, pnl[, fills, notional]`` frame (e.g. one shard)."""
+        acc = cls()
+        pnl = perf["pnl"].to_numpy(dtype=float)
+        if not len(pnl):
+            return acc
+        cumulative = np.cumsum(pnl)
+        acc.count = len(pnl)
+        acc.mean = float(pnl.mean())
+        acc.m2 = float(((pnl - acc.mean) ** 2).sum())
+        acc.total = float(cumulative[-1])
+        acc.peak = float(cumulative.max())
+        acc.trough = float(cumulative.min())
+        acc.max_drawdown = float((np.maximum.accumulate(cumulative) - cumulative).max())
+        if "notional" in perf:
+            acc.turnover = float(np.abs(perf["notional"].to_numpy(dtype=float)).sum())
+        if "fills" in perf:
+            acc.fills = int(perf["fills"].sum())
+        return acc
+
+    def merge(self, other: "PerformanceAccumulator") -> "PerformanceAccumulator":
+        """Append ``other``, which must cover the samples right after this one (a later shard)."""
+        if not other.count:
+            return self
+        if not self.count:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        # Shard paths start at zero: shift ``other`` by our total. A drawdown either
+        # stays inside one shard or runs from our peak to their lowest point.
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown, self.peak - (self.total + other.trough))
+        self.peak = max(self.peak, self.total + other.peak)
+        self.trough = min(self.trough, self.total + other.trough)
+        self.total += other.total
+        self.turnover += other.turnover
+        self.fills += other.fills
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        return _sharpe(self.mean, self.variance)
+
+    @property
+    def drawdown(self) -> float:
+        """Current distance below the running peak."""
+        return self.peak - self.total if self.count else 0.0
+
+    def summary(self) -> pd.Series:
+        """``post_trade.summary`` keys plus turnover and fill count."""
+        return pd.Series({
+            "total_pnl": self.total,
+            "max_drawdown": self.max_drawdown,
+            "sharpe": self.sharpe,
+            "turnover": self.turnover,
+            "fills": self.fills,
+        })
+
+
+class RollingPerformance:
+    """PnL statistics over the most recent ``window`` samples.
+
+    Mean and variance use Welford's update with the evicted sample removed in the
+    same step, and are recomputed from the ring buffer once per ``window`` updates
+    so rounding error cannot accumulate.  ``drawdown`` is the distance below the
+    highest cumulative PnL inside the window (a monotonic deque keeps it amortized O(1)).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._pnl = np.zeros(window)
+        self._notional = np.zeros(window)
+        self._fills = np.zeros(window, dtype=np.int64)
+        self._i = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.turnover = 0.0
+        self.fills = 0
+        self._cumulative = 0.0  # cumulative PnL since the start of the stream
+        self._highs: deque = deque()  # (sample number, cumulative), cumulative decreasing
+        self._seen = 0
+
+    def update(self, pnl: float, notional: float = 0.0, fills: int = 0):
+        i = self._i
+        if self.count == self.window:
+            old = self._pnl[i]
+            mean = self.mean + (pnl - old) / self.count
+            self.m2 += (pnl - old) * (pnl - mean + old - self.mean)
+            self.mean = mean
+            self.turnover -= self._notional[i]
+            self.fills -= int(self._fills[i])
+        else:
+            self.count += 1
+            delta = pnl - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (pnl - self.mean)
+        self._pnl[i] = pnl
+        self._notional[i] = abs(notional)
+        self._fills[i] = fills
+        self.turnover += abs(notional)
+        self.fills += fills
+        self._i = (i + 1) % self.window
+        if self._i == 0:
+            self._resync()
+
+        self._cumulative += pnl
+        self._seen += 1
+        highs = self._highs
+        while highs and highs[-1][1] <= self._cumulative:
+            highs.pop()
+        highs.append((self._seen, self._cumulative))
+        if highs[0][0] <= self._seen - self.window:
+            highs.popleft()
+
+    def _resync(self):
+        pnl = self._pnl[: self.count]
+        self.mean = float(pnl.mean())
+        self.m2 = float(((pnl - self.mean) ** 2).sum())
+        self.turnover = float(self._notional[: self.count].sum())
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        return _sharpe(self.mean, self.variance)
+
+    @property
+    def drawdown(self) -> float:
+        return self._highs[0][1] - self._cumulative if self._highs else 0.0
+
+    def summary(self) -> pd.Series:
+        return pd.Series({
+            "total_pnl": self.total,
+            "drawdown": self.drawdown,
+            "sharpe": self.sharpe,
+            "turnover": self.turnover,
+            "fills": self.fills,
+        })
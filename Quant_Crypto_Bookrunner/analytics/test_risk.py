@@ -0,0 +1,88 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from strategies.bookrunner import BookrunnerStrategy
+from strategies.quote_manager import QuoteManager
+
+from .risk import RiskEngine
+
+
+def _engine():
+    rng = np.random.default_rng(4)
+    engine = RiskEngine(["BTC", "ETH"], var_limit=1_000.0)
+    for row in np.exp(np.cumsum(rng.normal(0.0, 0.02, (60, 2)), axis=0)) * (30_000.0, 2_000.0):
+        engine.update_prices(row)
+    return engine
+
+
+def test_strategy_fills_move_engine_positions():
+    engine = _engine()
+    strategy = BookrunnerStrategy(None, verbose=False)
+    strategy.risk = engine
+    for side, qty, price in (("buy", 0.5, 30_100.0), ("sell", 0.2, 30_200.0), ("buy", 0.1, 30_000.0)):
+        strategy.on_order_fill({"symbol": "BTC/USDT", "side": side, "filled": qty, "price": price})
+
+    expected = _engine()
+    expected.mark("BTC", 30_000.0)
+    expected.set_positions({"BTC": 0.4})
+    assert engine.qty.tolist() == pytest.approx([0.4, 0.0])
+    assert engine.parametric_var() == pytest.approx(expected.parametric_var())
+
+
+class FillingVenue:
+    """Venue double whose orders fill completely right after they are placed."""
+
+    class exchange:
+        id = "fake"
+
+    def __init__(self):
+        self.orders = {}
+
+    def supports(self, feature):
+        return False
+
+    async def place_order_async(self, symbol, side, amount, price=None, order_type="limit"):
+        order_id = str(len(self.orders) + 1)
+        self.orders[order_id] = {"id": order_id, "symbol": symbol, "side": side, "price": price, "amount": amount,
+                                 "filled": amount, "status": "closed"}
+        return {"id": order_id, "status": "open", "filled": 0.0}
+
+    async def fetch_open_orders_async(self, symbol):
+        return []
+
+    async def fetch_order_async(self, order_id, symbol):
+        return self.orders[order_id]
+
+
+def test_quote_manager_fills_move_engine_positions():
+    engine = _engine()
+    venue = FillingVenue()
+    strategy = BookrunnerStrategy(venue, verbose=False)
+    strategy.risk = engine
+    quotes = QuoteManager(venue, order_size=0.5, on_fill=strategy.on_order_fill)
+
+    async def run():
+        await quotes.update("BTC/USDT", 30_100.0, None)
+        await quotes.reconcile_fills("BTC/USDT")
+
+    asyncio.run(run())
+    assert strategy.inventory == {"BTC": 0.5}
+    assert engine.qty.tolist() == pytest.approx([0.5, 0.0])
+    # Pre-trade checks now see the filled position, not the starting one.
+    expected = _engine()
+    expected.mark("BTC", 30_100.0)
+    expected.set_positions({"BTC": 0.5})
+    assert engine.parametric_var() == pytest.approx(expected.parametric_var())
+    assert engine.parametric_var() > 0.0
+
+
+def test_live_bar_extends_history():
+    engine = _engine()
+    engine.set_positions({"BTC": 1.0})
+    bars = engine.bars
+    engine.mark("BTC", engine.prices[0] * 1.05)
+    engine.update_prices(engine.prices.copy())
+    assert engine.bars == bars + 1
+    assert engine.returns[(bars) % engine.window][0] == pytest.approx(np.log(1.05))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from .post_trade import summary
+from .streaming import ANNUALIZATION, PerformanceAccumulator, RollingPerformance
+
+
+def _perf(n=5_000, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"timestamp": np.arange(n), "pnl": rng.normal(0.01, 1.0, n)})
+
+
+def _assert_matches(acc, expected):
+    got = acc.summary()
+    for key in ("total_pnl", "max_drawdown", "sharpe"):
+        assert got[key] == pytest.approx(expected[key], rel=1e-9, abs=1e-9)
+
+
+def test_accumulator_matches_summary():
+    perf = _perf()
+    acc = PerformanceAccumulator()
+    for pnl in perf["pnl"].tolist():
+        acc.update(pnl)
+    _assert_matches(acc, summary(perf))
+    _assert_matches(PerformanceAccumulator.from_frame(perf), summary(perf))
+
+
+def test_merged_shards_match_summary():
+    perf = _perf()
+    acc = PerformanceAccumulator()
+    for shard in np.array_split(np.arange(len(perf)), 7):
+        acc.merge(PerformanceAccumulator.from_frame(perf.iloc[shard]))
+    _assert_matches(acc, summary(perf))
+
+
+def test_rolling_matches_pandas_rolling():
+    window = 250
+    rng = np.random.default_rng(4)
+    perf = _perf(3_000, seed=4)
+    perf["notional"] = rng.uniform(-100.0, 100.0, len(perf))
+    perf["fills"] = rng.integers(0, 3, len(perf))
+    rolling = perf.rolling(window, min_periods=1)
+    cumulative = perf["pnl"].cumsum()
+    expected = pd.DataFrame({
+        "total_pnl": rolling["pnl"].sum(),
+        "drawdown": cumulative.rolling(window, min_periods=1).max() - cumulative,
+        "sharpe": rolling["pnl"].mean() / (rolling["pnl"].std(ddof=0) + 1e-9) * ANNUALIZATION,
+        "turnover": perf["notional"].abs().rolling(window, min_periods=1).sum(),
+        "fills": rolling["fills"].sum(),
+    })
+
+    acc = RollingPerformance(window)
+    for i, (pnl, notional, fills) in enumerate(perf[["pnl", "notional", "fills"]].itertuples(index=False)):
+        acc.update(pnl, notional, int(fills))
+        got = acc.summary()
+        for key, value in expected.iloc[i].items():
+            assert got[key] == pytest.approx(value, rel=1e-7, abs=1e-7), (i, key)
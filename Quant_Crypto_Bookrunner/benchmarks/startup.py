@@ -0,0 +1,105 @@
+"""Startup benchmark: how long before ``main.py`` can send its first request.
+
+Measures, each in a fresh interpreter (best of ``--repeat``):
+
+* ``import main`` and the other entry-point modules, and which heavy libraries
+  they drag in eagerly (none of ``EAGER_FORBIDDEN`` may be imported by ``main``);
+* priming each connector's markets from the on-disk cache, for every exchange
+  that has one (run ``main.py`` once to populate it).
+
+Run from the project root::
+
+    python benchmarks/startup.py --max-import-ms 150
+
+Exits non-zero when a budget is exceeded or a forbidden import is found, so it
+can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+MODULES = ("main", "data.exchange_connectors", "ui.live_feed")
+# Heavy libraries that must only be imported by the code paths that need them.
+EAGER_FORBIDDEN = ("ccxt", "pandas", "requests", "arxiv", "aiohttp", "websockets")
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in {forbidden!r} if m in sys.modules)}}))
+"""
+
+_MARKETS_PROBE = """
+import json, time
+from data import exchange_connectors
+cls = getattr(exchange_connectors, {cls!r})
+start = time.perf_counter()
+connector = cls()
+connector.load_markets()
+print(json.dumps({{"seconds": time.perf_counter() - start, "markets": len(connector.exchange.markets)}}))
+"""
+
+CONNECTORS = {"binance": "BinanceConnector", "coinbase": "CoinbaseConnector", "kraken": "KrakenConnector"}
+
+
+def _probe(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _best(code: str, repeat: int) -> dict:
+    runs = [_probe(code) for _ in range(repeat)]
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def run(repeat: int = 5) -> dict:
+    results = {"imports": {}, "markets": {}}
+    for module in MODULES:
+        results["imports"][module] = _best(_IMPORT_PROBE.format(module=module, forbidden=EAGER_FORBIDDEN), repeat)
+    cache_root = os.path.join(ROOT, "cache", "markets")
+    for exchange, cls in CONNECTORS.items():
+        if os.path.exists(os.path.join(cache_root, f"{exchange}.json")):
+            results["markets"][exchange] = _best(_MARKETS_PROBE.format(cls=cls), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, help="Fail if `import main` is slower than this")
+    parser.add_argument("--max-markets-ms", type=float, help="Fail if priming cached markets is slower than this")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for module, res in results["imports"].items():
+            eager = f"  eager: {', '.join(res['modules'])}" if res["modules"] else ""
+            print(f"import {module:<28} {res['seconds'] * 1e3:8.1f} ms{eager}")
+        for exchange, res in results["markets"].items():
+            print(f"markets {exchange:<27} {res['seconds'] * 1e3:8.1f} ms  ({res['markets']} markets, cached)")
+
+    failures = []
+    main_import = results["imports"]["main"]
+    if main_import["modules"]:
+        failures.append(f"main imports {', '.join(main_import['modules'])} eagerly")
+    if args.max_import_ms is not None and main_import["seconds"] * 1e3 > args.max_import_ms:
+        failures.append(f"import main took {main_import['seconds'] * 1e3:.1f} ms > {args.max_import_ms} ms")
+    if args.max_markets_ms is not None:
+        for exchange, res in results["markets"].items():
+            if res["seconds"] * 1e3 > args.max_markets_ms:
+                failures.append(f"{exchange} markets took {res['seconds'] * 1e3:.1f} ms > {args.max_markets_ms} ms")
+    for failure in failures:
+        print("FAIL:", failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""Hot-path benchmark suite on seeded synthetic data (``data.synthetic``).
+
+Every case runs at each ``--sizes`` and reports:
+
+* ``ticks_per_sec`` - units processed per second (best of ``--repeat`` runs, each on
+  a fresh setup, after one untimed warm-up run);
+* ``latency_ns``    - p50/p99/p99.9/max per call of the best run, for per-tick cases
+  (HDR histogram);
+* ``peak_bytes``    - peak traced allocation of one run (``tracemalloc``).
+
+Run from the project root::
+
+    python benchmarks/suite.py --out bench.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json   # exit 1 on regression
+    python benchmarks/suite.py --cases strategy --sizes 1000000 --save-baseline benchmarks/baseline.json
+
+Timings depend on the machine: compare against a baseline recorded on the same
+host.  Throughput is compared case by case; a drop of more than ``--tolerance``
+counts as a regression.
+"""
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from analytics.latency import LatencyHistogram  # noqa: E402
+from analytics.post_trade import summary  # noqa: E402
+from analytics.risk import RiskEngine  # noqa: E402
+from analytics.streaming import PerformanceAccumulator  # noqa: E402
+from data.consolidated_book import ConsolidatedBook  # noqa: E402
+from data.exchange_connectors.simulated import SimulatedMarket  # noqa: E402
+from data.feature_store import FeatureStore  # noqa: E402
+from data.order_book import OrderBook  # noqa: E402
+from data.synthetic import book_columns, book_diffs, correlated_closes  # noqa: E402
+from strategies.backtester import Backtester  # noqa: E402
+from strategies.bookrunner import BookrunnerStrategy  # noqa: E402
+from strategies.runner import StrategyRunner  # noqa: E402
+
+SYMBOL = "BTC/USDT"
+DEFAULT_SIZES = (10_000, 100_000)
+SEED = 7
+FEATURES_DIR = os.path.join(tempfile.gettempdir(), "bookrunner-bench-features")
+
+# name -> (setup(n) -> workload, per_call).  A per-call workload is ``(fn, args)``
+# and is timed call by call; otherwise it is a no-argument callable timed as a whole.
+CASES: Dict[str, Tuple[Callable, bool]] = {}
+
+
+def case(name: str, per_call: bool = False):
+    def register(setup):
+        CASES[name] = (setup, per_call)
+        return setup
+    return register
+
+
+def _strategy() -> BookrunnerStrategy:
+    return BookrunnerStrategy(exchange=None, verbose=False)
+
+
+# ------------- Order books ------------- #
+@case("order_book.apply_delta", per_call=True)
+def _apply_delta(n):
+    snapshot, updates = book_diffs(n, seed=SEED)
+    book = OrderBook.from_ccxt(snapshot, capacity=100)
+    return book.apply_delta, updates[:n]
+
+
+@case("consolidated_book.update", per_call=True)
+def _consolidated_update(n):
+    cols = book_columns(n, depth=20, seed=SEED)
+    venues = ("binance", "coinbase", "kraken")
+    consolidated = ConsolidatedBook(SYMBOL, venues)
+
+    def update(venue, book):
+        consolidated.update(venue, book)
+        return consolidated.microprice
+
+    return update, [(venues[i % 3], book) for i, book in enumerate(cols.iter_snapshots(SYMBOL))]
+
+
+@case("consolidated_book.depth", per_call=True)
+def _consolidated_depth(n):
+    cols = book_columns(n, depth=20, seed=SEED)
+    venues = ("binance", "coinbase", "kraken")
+    consolidated = ConsolidatedBook(SYMBOL, venues)
+
+    def update(venue, book):
+        consolidated.update(venue, book)
+        return consolidated.levels("bids")
+
+    return update, [(venues[i % 3], book) for i, book in enumerate(cols.iter_snapshots(SYMBOL))]
+
+
+@case("simulated.event_to_quote", per_call=True)
+def _simulated(n):
+    # One simulated venue event: match, publish, apply the deltas to the local book, quote.
+    market = SimulatedMarket(SYMBOL, 30_000.0, rate=0.0, tick_size=0.01, depth=50, seed=SEED)
+    book = OrderBook(SYMBOL, capacity=100)
+    book.reset(*market.engine.levels(100))
+    queue = deque()
+    market.subscribers.append(queue)
+    strategy = _strategy()
+
+    def event():
+        market._event()
+        market.publish()
+        while queue:
+            for side, price, size in queue.popleft():
+                book.apply_delta(side, price, size)
+        return strategy.on_tick(SYMBOL, book)
+
+    return event, [()] * n
+
+
+# ------------- Strategy ------------- #
+@case("strategy.on_tick", per_call=True)
+def _on_tick(n):
+    strategy = _strategy()
+    cols = book_columns(n, depth=5, seed=SEED)
+    return strategy.on_tick, [(SYMBOL, book) for book in cols.iter_snapshots(SYMBOL)]
+
+
+@case("strategy.on_ticks_batch")
+def _on_ticks_batch(n):
+    strategy, cols = _strategy(), book_columns(n, seed=SEED)
+    return lambda: strategy.on_ticks_batch(SYMBOL, cols)
+
+
+@case("strategy_runner.on_book_360", per_call=True)
+def _runner(n):
+    # 360 paper variants dispatched from one book per tick.
+    runner = StrategyRunner(SYMBOL)
+    runner.add_grid({"spread_bps": range(1, 21), "inventory_clip": (0.1, 0.2, 0.5), "hold_time": (60, 120, 300),
+                     "price_source": ("mid", "microprice")})
+    cols = book_columns(n, depth=5, seed=SEED)
+    return runner.on_book, [(book,) for book in cols.iter_snapshots(SYMBOL)]
+
+
+# ------------- Back-testing ------------- #
+@case("backtester.run")
+def _backtest(n):
+    cols = book_columns(n, seed=SEED)
+    return lambda: Backtester(_strategy(), cols, SYMBOL).run()
+
+
+@case("backtester.run_scalar")
+def _backtest_scalar(n):
+    cols = book_columns(n, seed=SEED)
+    return lambda: Backtester(_strategy(), cols, SYMBOL).run(batch=False)
+
+
+@case("backtester.run_features")
+def _backtest_features(n):
+    # Same back-test reading mid from the feature cache, as every sweep point after the first does.
+    cols = book_columns(n, seed=SEED)
+    features = FeatureStore(FEATURES_DIR).features(cols).compute(["mid"])
+    return lambda: Backtester(_strategy(), cols, SYMBOL, features=features).run()
+
+
+@case("feature_store.compute")
+def _feature_compute(n):
+    cols = book_columns(n, depth=5, seed=SEED)
+    root = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, root, True)
+    # A fresh directory per run so every feature is computed, not read back.
+    return lambda: FeatureStore(tempfile.mkdtemp(dir=root)).features(cols).compute()
+
+
+@case("backtester.simulate")
+def _simulate(n):
+    cols = book_columns(n, depth=5, seed=SEED)
+    return lambda: Backtester(_strategy(), cols, SYMBOL).simulate(order_size=0.01)
+
+
+# ------------- Analytics ------------- #
+def _pnl(n) -> np.ndarray:
+    return np.random.default_rng(SEED).normal(0.0, 1.0, n)
+
+
+@case("analytics.post_trade.summary")
+def _summary(n):
+    perf = pd.DataFrame({"timestamp": np.arange(n), "pnl": _pnl(n)})
+    return lambda: summary(perf)
+
+
+@case("analytics.streaming.update", per_call=True)
+def _streaming(n):
+    acc = PerformanceAccumulator()
+    return acc.update, [(x,) for x in _pnl(n).tolist()]
+
+
+# ------------- Risk ------------- #
+RISK_ASSETS = ("BTC", "ETH", "SOL", "XRP", "ADA", "DOGE", "AVAX", "DOT", "LINK", "LTC")
+
+
+@case("risk.update_prices", per_call=True)
+def _risk_update(n):
+    closes = correlated_closes(RISK_ASSETS, n, seed=SEED)
+    engine = RiskEngine(RISK_ASSETS)
+    rows = np.column_stack([closes[a].to_numpy() for a in RISK_ASSETS])
+    return engine.update_prices, [(row,) for row in rows]
+
+
+@case("risk.mark_and_check", per_call=True)
+def _risk_check(n):
+    engine = RiskEngine.from_bars(correlated_closes(RISK_ASSETS, 500, seed=SEED), var_limit=1e9)
+    engine.set_positions({a: 1.0 for a in RISK_ASSETS})
+    rng = np.random.default_rng(SEED)
+    assets = rng.choice(RISK_ASSETS, n).tolist()
+    prices = (100 * np.exp(rng.normal(0, 0.001, n))).tolist()
+
+    def mark_and_check(asset, price):
+        engine.mark(asset, price)
+        return engine.check(asset, 0.01)
+
+    return mark_and_check, list(zip(assets, prices))
+
+
+# ------------- Runner ------------- #
+def _time_calls(fn, args: List[tuple]) -> Tuple[float, LatencyHistogram]:
+    hist = LatencyHistogram()
+    clock, record = time.perf_counter_ns, hist.record
+    start = clock()
+    for a in args:
+        t0 = clock()
+        fn(*a)
+        record(clock() - t0)
+    return (clock() - start) / 1e9, hist
+
+
+def run_case(name: str, n: int, repeat: int) -> Dict:
+    setup, per_call = CASES[name]
+    result: Dict = {"case": name, "size": n}
+    if per_call:
+        fn, args = setup(n)
+        for a in args:  # warm-up: imports, caches and allocator pools
+            fn(*a)
+        seconds, hist = float("inf"), None
+        for _ in range(repeat):
+            fn, args = setup(n)
+            run_seconds, run_hist = _time_calls(fn, args)
+            if run_seconds < seconds:
+                seconds, hist = run_seconds, run_hist
+        result["latency_ns"] = {
+            "p50": hist.percentile(50), "p99": hist.percentile(99), "p99.9": hist.percentile(99.9), "max": hist.max,
+        }
+        fn, args = setup(n)
+        tracemalloc.start()
+        for a in args:
+            fn(*a)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        setup(n)()  # warm-up
+        seconds = float("inf")
+        for _ in range(repeat):
+            work = setup(n)
+            start = time.perf_counter()
+            work()
+            seconds = min(seconds, time.perf_counter() - start)
+        work = setup(n)
+        tracemalloc.start()
+        work()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    result["seconds"] = seconds
+    result["ticks_per_sec"] = n / seconds if seconds else float("inf")
+    return result
+
+
+def _meta() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Print throughput vs ``baseline`` and return the regressions."""
+    previous = {(r["case"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        base = previous.get((r["case"], r["size"]))
+        if base is None:
+            continue
+        ratio = r["ticks_per_sec"] / base["ticks_per_sec"]
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{r['case']}@{r['size']}: {ratio:.2f}x baseline throughput")
+        print(f"  {r['case']:<32} {r['size']:>9}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", help="Only run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="Write results JSON here (default: stdout summary only)")
+    parser.add_argument("--baseline", help="Compare against this results JSON; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop vs baseline")
+    parser.add_argument("--save-baseline", help="Also write the results JSON as the new baseline")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.cases or any(sel in name for sel in args.cases)]
+    results = []
+    for name in names:
+        for n in args.sizes:
+            r = run_case(name, n, args.repeat)
+            results.append(r)
+            lat = r.get("latency_ns")
+            lat = f"  p50 {lat['p50']:>6} ns  p99 {lat['p99']:>7} ns" if lat else ""
+            print(f"{name:<32} {n:>9}  {r['ticks_per_sec']:>14,.0f}/s  {r['peak_bytes'] / 2**20:8.1f} MiB{lat}")
+
+    report = {"meta": _meta(), "results": results}
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        print(f"vs baseline {baseline.get('meta', {}).get('commit', '?')}:")
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print("FAIL:", regression, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""On-disk OHLCV bar cache with coverage tracking, keyed by source / ticker / frequency.
+
+Each series is a structured ``.npy`` array sorted by timestamp plus a JSON list of
+the ``[start, end)`` ms intervals already downloaded::
+
+    root/tiingo/btcusd/1day.npy
+    root/tiingo/btcusd/1day.json
+
+Callers ask ``missing`` which sub-ranges still need fetching, ``merge`` whatever
+they downloaded and ``read`` the requested range straight from the memory-mapped
+file.  Intervals with no trading still count as covered, so they are not re-fetched.
+"""
+from typing import List, Tuple
+import json
+import os
+
+import numpy as np
+
+BAR_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("volume", "<f8"), ("volume_notional", "<f8"), ("trades_done", "<i8"),
+])
+
+Interval = Tuple[int, int]
+
+_UNIT_MS = {"min": 60_000, "hour": 3_600_000, "day": 86_400_000}
+
+
+def freq_ms(freq: str) -> int:
+    """Bar length in ms for a Tiingo-style ``resampleFreq`` such as ``5min``, ``1hour``, ``1day``."""
+    for unit, ms in _UNIT_MS.items():
+        if freq.endswith(unit):
+            return int(freq[: -len(unit)] or 1) * ms
+    raise ValueError(f"Unsupported resample frequency: {freq}")
+
+
+def _normalize(intervals: List[Interval]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif start < end:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(start: int, end: int, covered: List[Interval]) -> List[Interval]:
+    """Parts of ``[start, end)`` not inside any of the (normalized) ``covered`` intervals."""
+    gaps = []
+    cursor = start
+    for lo, hi in covered:
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class BarCache:
+    """Persistent store of bar series; one writer per series at a time."""
+
+    def __init__(self, root: str, source: str):
+        self.root = os.path.join(root, source)
+
+    def _path(self, ticker: str, freq: str) -> str:
+        return os.path.join(self.root, ticker.lower(), freq)
+
+    def coverage(self, ticker: str, freq: str) -> List[Interval]:
+        path = self._path(ticker, freq) + ".json"
+        if not os.path.exists(path):
+            return []
+        with open(path) as fh:
+            return [tuple(iv) for iv in json.load(fh)]
+
+    def missing(self, ticker: str, freq: str, start: int, end: int) -> List[Interval]:
+        return subtract(start, end, self.coverage(ticker, freq))
+
+    def read(self, ticker: str, freq: str, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Bars with ``start <= timestamp < end`` (a view of the memory-mapped file when cached)."""
+        path = self._path(ticker, freq) + ".npy"
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        bars = np.load(path, mmap_mode="r")
+        ts = bars["timestamp"]
+        lo = int(np.searchsorted(ts, start)) if start is not None else 0
+        hi = int(np.searchsorted(ts, end)) if end is not None else len(bars)
+        return bars[lo:hi]
+
+    def merge(self, ticker: str, freq: str, bars: np.ndarray, covered: List[Interval]):
+        """Add freshly downloaded ``bars`` and mark ``covered`` as fetched.
+
+        Newer rows replace cached rows with the same timestamp.  Both files are
+        written to a temp path and renamed, so readers never see a torn series.
+        """
+        path = self._path(ticker, freq)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existing = np.array(self.read(ticker, freq))
+        combined = np.concatenate([bars.astype(BAR_DTYPE, copy=False), existing])
+        # Stable unique keeps the first occurrence, i.e. the new download.
+        _, first = np.unique(combined["timestamp"], return_index=True)
+        combined = combined[first]
+
+        with open(path + ".npy.tmp", "wb") as fh:
+            np.save(fh, combined)
+        os.replace(path + ".npy.tmp", path + ".npy")
+        intervals = _normalize(self.coverage(ticker, freq) + list(covered))
+        with open(path + ".json.tmp", "w") as fh:
+            json.dump(intervals, fh)
+        os.replace(path + ".json.tmp", path + ".json")
@@ -0,0 +1,274 @@
+"""Consolidated (cross-venue) order book.
+
+``ConsolidatedBook`` merges the L2 books of several venues for one instrument
+into a single book whose levels remember the venue they came from.  Prices are
+fee-adjusted per venue (a bid is worth ``price * (1 - fee)`` to a taker selling
+into it, an ask costs ``price * (1 + fee)``) so levels from different venues
+compare like for like.
+
+Updates are incremental.  ``update`` only overwrites the changed venue's row of
+levels (and, with ``max_age``, drops venues that have not updated for that long); the NBBO (``best_bid``/``best_ask``/``mid``/``microprice``) is read from
+the venues' first levels in O(venues).  The merged depth is brought up to date
+lazily, on first access after a change (see ``_Side``).
+"""
+from typing import Any, Dict, Mapping, Sequence, Tuple
+import time
+
+import numpy as np
+
+from .order_book import OrderBook
+
+# Base-tier taker fees in bps; override per account with ``fees_bps``.
+DEFAULT_TAKER_FEES_BPS = {"binance": 10.0, "coinbase": 60.0, "kraken": 40.0}
+
+# Venue-specific asset codes mapped to the common ones.
+ASSET_ALIASES = {"XBT": "BTC", "XDG": "DOGE", "XETH": "ETH", "XXBT": "BTC", "ZUSD": "USD", "ZEUR": "EUR"}
+_QUOTES = ("USDT", "USDC", "FDUSD", "BUSD", "USD", "EUR", "GBP", "BTC", "ETH")
+
+# Merged sides with at least this many level slots (venues x depth) are patched
+# per changed venue; smaller ones are cheaper to re-sort whole (measured crossover).
+PATCH_MIN_LEVELS = 1024
+
+
+def normalize_symbol(symbol: str, quote_aliases: Mapping[str, str] | None = None) -> str:
+    """Common ``BASE/QUOTE`` form of a venue symbol (``XBT/USD``, ``BTC-USD``, ``BTCUSDT``...).
+
+    ``quote_aliases`` optionally folds quote currencies together, e.g.
+    ``{"USDT": "USD"}`` to consolidate USDT and USD books.
+    """
+    symbol = symbol.upper().split(":")[0]
+    for sep in ("/", "-", "_"):
+        if sep in symbol:
+            base, quote = symbol.split(sep, 1)
+            break
+    else:
+        quote = next((q for q in _QUOTES if symbol.endswith(q) and len(symbol) > len(q)), "")
+        base = symbol[: len(symbol) - len(quote)] if quote else symbol
+    base = ASSET_ALIASES.get(base, base)
+    quote = ASSET_ALIASES.get(quote, quote)
+    if quote_aliases:
+        quote = quote_aliases.get(quote, quote)
+    return f"{base}/{quote}" if quote else base
+
+
+def _levels(book, side: str, depth: int) -> np.ndarray:
+    if isinstance(book, OrderBook):
+        return getattr(book, side)[:depth]
+    rows = book[side][:depth]
+    return np.asarray([lvl[:2] for lvl in rows], dtype=np.float64).reshape(-1, 2)
+
+
+class _Side:
+    """One side as a ``(venues, depth)`` matrix of ascending sort keys (``-price`` for bids).
+
+    Each venue's row is kept sorted and padded with ``inf``.  Large sides are
+    patched: a changed venue's old levels are dropped from the last merge and its
+    new row merged in, one linear pass over two sorted runs that never re-sorts
+    the untouched venues against each other.  Below ``PATCH_MIN_LEVELS`` the fixed
+    cost of those steps exceeds a stable sort of the whole matrix, which timsort
+    already runs as a merge of the presorted rows, so small sides are rebuilt.
+    Equal prices merge in venue order either way.
+    """
+
+    __slots__ = ("sign", "keys", "sizes", "_sorted", "_dirty", "_merged")
+
+    def __init__(self, sign: float, n_venues: int, depth: int):
+        self.sign = sign
+        self.keys = np.full((n_venues, depth), np.inf)
+        self.sizes = np.zeros((n_venues, depth))
+        # Last merge as (keys, sizes, venue indices), and the venues changed since.
+        self._sorted = (np.empty(0), np.empty(0), np.empty(0, dtype=np.intp))
+        self._dirty: set = set()
+        self._merged: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def set(self, v: int, keys: np.ndarray, sizes: np.ndarray):
+        n = len(keys)
+        self.keys[v, :n] = keys
+        self.keys[v, n:] = np.inf
+        self.sizes[v, :n] = sizes
+        self.sizes[v, n:] = 0.0
+        self._dirty.add(v)
+        self._merged = None
+
+    def merged(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._merged is None:
+            if self.keys.size < PATCH_MIN_LEVELS:
+                self._sorted = self._rebuild()
+            else:
+                self._sorted = self._patch()
+            self._dirty.clear()
+            keys, sizes, venues = self._sorted
+            self._merged = (keys * self.sign, sizes, venues)
+        return self._merged
+
+    def _rebuild(self):
+        flat = self.keys.ravel()
+        order = np.argsort(flat, kind="stable")
+        order = order[: np.count_nonzero(flat < np.inf)]
+        return flat[order], self.sizes.ravel()[order], order // self.keys.shape[1]
+
+    def _patch(self):
+        keys, sizes, venues = self._sorted
+        for v in self._dirty:
+            n = int(np.searchsorted(self.keys[v], np.inf))
+            keep = venues != v
+            keys = np.concatenate((keys[keep], self.keys[v, :n]))
+            sizes = np.concatenate((sizes[keep], self.sizes[v, :n]))
+            venues = np.concatenate((venues[keep], np.full(n, v, dtype=np.intp)))
+            order = np.argsort(keys, kind="stable")
+            keys, sizes, venues = keys[order], sizes[order], venues[order]
+        if np.any(keys[1:] == keys[:-1]):
+            # The patched venue went after its equals; put ties back in venue order.
+            order = np.lexsort((venues, keys))
+            keys, sizes, venues = keys[order], sizes[order], venues[order]
+        return keys, sizes, venues
+
+
+class ConsolidatedBook:
+    """Fee-adjusted NBBO and merged depth across ``venues`` for one ``symbol``.
+
+    Quacks like an ``OrderBook`` for readers (``best_bid``, ``mid``, ``microprice``,
+    ``book["bids"]``...), so strategies can take it in place of a venue book.
+
+    A venue's levels stay until it is ``remove``d (e.g. when its feed drops) or, with
+    ``max_age`` seconds, until another venue updates after it has gone that long
+    without an update of its own.
+    """
+
+    def __init__(self, symbol: str, venues: Sequence[str], *, fees_bps: Mapping[str, float] | None = None,
+                 depth: int = 20, quote_aliases: Mapping[str, str] | None = None, max_age: float | None = None):
+        self.symbol = normalize_symbol(symbol, quote_aliases)
+        self.venues = list(venues)
+        self.index = {venue: i for i, venue in enumerate(self.venues)}
+        self.depth = depth
+        self.quote_aliases = quote_aliases
+        self.max_age = max_age
+        self.received = np.full(len(self.venues), np.inf)  # monotonic time of each venue's last update
+        fees = {**DEFAULT_TAKER_FEES_BPS, **(fees_bps or {})}
+        self.fees_bps = np.array([fees.get(venue.lower(), 0.0) for venue in self.venues])
+        self.timestamp: int | None = None
+        self._bids = _Side(-1.0, len(self.venues), depth)
+        self._asks = _Side(1.0, len(self.venues), depth)
+        # Fee-adjusted best level of each venue (views; inf keys when a venue has no quote).
+        self._bid_keys, self._bid_sizes = self._bids.keys[:, 0], self._bids.sizes[:, 0]
+        self._ask_keys, self._ask_sizes = self._asks.keys[:, 0], self._asks.sizes[:, 0]
+        self._known_symbols = {self.symbol}
+
+    # ------------- Updates ------------- #
+    def update(self, venue: str, book) -> None:
+        """Replace ``venue``'s levels with the top ``depth`` of ``book`` (``OrderBook`` or ccxt dict)."""
+        book_symbol = book.get("symbol")
+        if book_symbol and book_symbol not in self._known_symbols:
+            if normalize_symbol(book_symbol, self.quote_aliases) != self.symbol:
+                raise ValueError(f"{venue} book for {book_symbol} does not belong to {self.symbol}")
+            self._known_symbols.add(book_symbol)
+        v = self.index[venue]
+        fee = self.fees_bps[v] / 10_000
+        bids, asks = _levels(book, "bids", self.depth), _levels(book, "asks", self.depth)
+        self._bids.set(v, bids[:, 0] * (fee - 1), bids[:, 1])
+        self._asks.set(v, asks[:, 0] * (1 + fee), asks[:, 1])
+        timestamp = book.get("timestamp")
+        if timestamp is not None and (self.timestamp is None or timestamp > self.timestamp):
+            self.timestamp = timestamp
+        now = time.monotonic()
+        self.received[v] = now
+        if self.max_age is not None:
+            self.expire(now)
+
+    def remove(self, venue: str) -> None:
+        """Drop ``venue`` (e.g. on disconnect) until its next ``update``."""
+        self._clear(self.index[venue])
+
+    def expire(self, now: float | None = None) -> None:
+        """Drop venues whose last update is more than ``max_age`` seconds old."""
+        now = time.monotonic() if now is None else now
+        for v in np.flatnonzero(now - self.received > self.max_age).tolist():
+            self._clear(v)
+
+    def _clear(self, v: int):
+        empty = np.empty(0)
+        self._bids.set(v, empty, empty)
+        self._asks.set(v, empty, empty)
+        self.received[v] = np.inf
+
+    # ------------- NBBO ------------- #
+    @property
+    def best_bid(self) -> float:
+        best = self._bid_keys.min()
+        return float(-best) if best < np.inf else float("nan")
+
+    @property
+    def best_ask(self) -> float:
+        best = self._ask_keys.min()
+        return float(best) if best < np.inf else float("nan")
+
+    @property
+    def best_bid_venue(self) -> str | None:
+        v = int(self._bid_keys.argmin())
+        return self.venues[v] if self._bid_keys[v] < np.inf else None
+
+    @property
+    def best_ask_venue(self) -> str | None:
+        v = int(self._ask_keys.argmin())
+        return self.venues[v] if self._ask_keys[v] < np.inf else None
+
+    @property
+    def mid(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self) -> float:
+        return self.best_ask - self.best_bid
+
+    @property
+    def microprice(self) -> float:
+        """Size-weighted NBBO mid, with size summed over every venue at the best price."""
+        bid_key, ask = self._bid_keys.min(), self._ask_keys.min()
+        if bid_key == np.inf or ask == np.inf:
+            return self.mid
+        bid_sz = self._bid_sizes[self._bid_keys == bid_key].sum()
+        ask_sz = self._ask_sizes[self._ask_keys == ask].sum()
+        total = bid_sz + ask_sz
+        if total == 0.0:
+            return self.mid
+        return float((-bid_key * ask_sz + ask * bid_sz) / total)
+
+    def is_crossed(self) -> bool:
+        """True when one venue's bid is above another's ask after fees (an arbitrage)."""
+        return bool(-self._bid_keys.min() >= self._ask_keys.min())
+
+    # ------------- Depth ------------- #
+    def levels(self, side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(prices, sizes, venue indices)`` of the merged ``side``, best first."""
+        return (self._bids if side == "bids" else self._asks).merged()
+
+    @property
+    def bids(self) -> np.ndarray:
+        prices, sizes, _ = self.levels("bids")
+        return np.column_stack((prices, sizes))
+
+    @property
+    def asks(self) -> np.ndarray:
+        prices, sizes, _ = self.levels("asks")
+        return np.column_stack((prices, sizes))
+
+    def depth_by_venue(self, side: str) -> Dict[str, float]:
+        """Total merged size on ``side`` contributed by each venue."""
+        _, sizes, venues = self.levels(side)
+        totals = np.bincount(venues, weights=sizes, minlength=len(self.venues))
+        return dict(zip(self.venues, totals.tolist()))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("bids", "asks", "symbol", "timestamp"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return (f"ConsolidatedBook({self.symbol!r}, bid={self.best_bid} @ {self.best_bid_venue}, "
+                f"ask={self.best_ask} @ {self.best_ask_venue})")
@@ -1,3 +1,28 @@
-from .binance import BinanceConnector  # noqa
-from .coinbase import CoinbaseConnector  # noqa
-from .kraken import KrakenConnector  # noqa
\ No newline at end of file
+"""Exchange connectors.
+
+Connector modules pull in ccxt, which takes a few hundred milliseconds to import,
+so they are loaded on first attribute access (PEP 562) rather than with the package.
+"""
+import importlib
+
+_CONNECTORS = {
+    "BinanceConnector": ".binance",
+    "CoinbaseConnector": ".coinbase",
+    "KrakenConnector": ".kraken",
+    "SimulatedConnector": ".simulated",
+}
+
+__all__ = list(_CONNECTORS)
+
+
+def __getattr__(name: str):
+    module = _CONNECTORS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+import ccxt.async_support as ccxt_async
+
+from ..order_book import OrderBook
+from .market_cache import MarketCache
+
+_SESSION: aiohttp.ClientSession | None = None
+_BUCKETS: Dict[str, "TokenBucket"] = {}
+
+
+def shared_session() -> aiohttp.ClientSession:
+    """One pooled aiohttp session shared by every async connector (create inside the event loop)."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            trust_env=True,
+        )
+    return _SESSION
+
+
+async def close_shared_session():
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+class TokenBucket:
+    """Async token bucket: refills ``rate`` tokens per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1.0):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class AsyncMixin:
+    """Adds ``*_async`` variants of the connector methods on ``ccxt.async_support``.
+
+    The async ccxt instance is created on first use with the connector's config, the
+    process-wide ``shared_session`` and ccxt's own throttling disabled: requests are
+    paced instead by a token bucket shared by all connectors of the same exchange,
+    so concurrent symbols do not queue behind each other's sleeps.
+
+    Markets are primed from ``market_cache`` before the first request instead of
+    being downloaded by ccxt on every start.
+
+    Subclasses set ``self._config`` and ``self._sandbox`` in ``__init__``.
+    """
+
+    _config: Dict[str, Any]
+    _sandbox: bool = False
+    _async_exchange = None
+    # Requests per second; None derives it from ccxt's ``rateLimit``.
+    requests_per_second: float | None = None
+    market_cache = MarketCache()
+    _markets_refresh = None
+
+    @property
+    def async_exchange(self):
+        if self._async_exchange is None:
+            cls = getattr(ccxt_async, self.exchange.id)
+            self._async_exchange = cls({**self._config, "enableRateLimit": False, "session": shared_session()})
+            if self._sandbox:
+                self._async_exchange.set_sandbox_mode(True)
+        return self._async_exchange
+
+    # ------------- Markets ------------- #
+    @property
+    def _markets_key(self) -> str:
+        return f"{self.exchange.id}-sandbox" if self._sandbox else self.exchange.id
+
+    def _save_markets(self, exchange):
+        self.market_cache.save(self._markets_key, exchange.markets, exchange.currencies)
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        """Prime the sync instance from the on-disk cache, downloading only when nothing is cached.
+
+        A stale cache entry is used as is and refreshed on a background thread.
+        """
+        if self.exchange.markets and not reload:
+            return self.exchange.markets
+        cached = None if reload else self.market_cache.load(self._markets_key)
+        if cached is None:
+            self.exchange.load_markets(reload)
+            self._save_markets(self.exchange)
+            return self.exchange.markets
+        markets, currencies, stale = cached
+        self.exchange.set_markets(markets, currencies)
+        if stale and self._markets_refresh is None:
+            self._markets_refresh = threading.Thread(target=self._refresh_markets, name="markets-refresh",
+                                                     daemon=True)
+            self._markets_refresh.start()
+        return self.exchange.markets
+
+    def _refresh_markets(self):
+        # A private instance so requests in flight on self.exchange are not disturbed.
+        exchange = type(self.exchange)(self._config)
+        if self._sandbox:
+            exchange.set_sandbox_mode(True)
+        try:
+            exchange.load_markets()
+            self._save_markets(exchange)
+            self.exchange.set_markets(exchange.markets, exchange.currencies)
+        except Exception as exc:
+            print(f"[Markets] {self.exchange.id} refresh failed, keeping cached markets:", exc)
+        finally:
+            self._markets_refresh = None
+
+    async def load_markets_async(self, reload: bool = False) -> Dict[str, Any]:
+        """``load_markets`` for the async instance; a stale entry is refreshed in a background task."""
+        exchange = self.async_exchange
+        if exchange.markets and not reload:
+            return exchange.markets
+        cached = None if reload else self.market_cache.load(self._markets_key)
+        if cached is None:
+            await exchange.load_markets(reload)
+            self._save_markets(exchange)
+            return exchange.markets
+        markets, currencies, stale = cached
+        exchange.set_markets(markets, currencies)
+        if stale and self._markets_refresh is None:
+            self._markets_refresh = asyncio.ensure_future(self._refresh_markets_async())
+        return exchange.markets
+
+    async def _refresh_markets_async(self):
+        try:
+            await self.async_exchange.load_markets(reload=True)
+            await asyncio.to_thread(self._save_markets, self.async_exchange)
+        except Exception as exc:
+            print(f"[Markets] {self.exchange.id} refresh failed, keeping cached markets:", exc)
+        finally:
+            self._markets_refresh = None
+
+    @property
+    def rate_limiter(self) -> TokenBucket:
+        bucket = _BUCKETS.get(self.exchange.id)
+        if bucket is None:
+            rate = self.requests_per_second or 1000 / self.exchange.rateLimit
+            bucket = _BUCKETS[self.exchange.id] = TokenBucket(rate)
+        return bucket
+
+    async def _call_async(self, method: str, *args, **kwargs):
+        if not self.async_exchange.markets:
+            await self.load_markets_async()
+        await self.rate_limiter.acquire()
+        return await getattr(self.async_exchange, method)(*args, **kwargs)
+
+    # ------------- Market Data ------------- #
+    async def get_order_book_async(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
+        return await self._call_async("fetch_order_book", symbol, limit=limit)
+
+    async def get_book_async(self, symbol: str, limit: int = 20) -> OrderBook:
+        return OrderBook.from_ccxt(await self.get_order_book_async(symbol, limit), capacity=limit)
+
+    async def get_ticker_async(self, symbol: str) -> Dict[str, Any]:
+        return await self._call_async("fetch_ticker", symbol)
+
+    # ------------- Trading ------------- #
+    async def place_order_async(self, symbol: str, side: str, amount: float, price: float | None = None,
+                                order_type: str = "limit"):
+        if order_type == "limit":
+            return await self._call_async("create_limit_order", symbol, side, amount, price, {})
+        elif order_type == "market":
+            return await self._call_async("create_market_order", symbol, side, amount, {})
+        else:
+            raise ValueError("Unsupported order_type: " + order_type)
+
+    async def cancel_order_async(self, order_id: str, symbol: str):
+        return await self._call_async("cancel_order", order_id, symbol)
+
+    async def edit_order_async(self, order_id: str, symbol: str, side: str, amount: float, price: float):
+        """Amend a resting limit order in one request (venue permitting, see ``supports``)."""
+        return await self._call_async("edit_order", order_id, symbol, "limit", side, amount, price)
+
+    async def create_orders_async(self, orders: List[Dict[str, Any]]):
+        """Submit several orders in one batch request (``symbol, type, side, amount, price`` dicts)."""
+        return await self._call_async("create_orders", orders)
+
+    async def cancel_orders_async(self, order_ids: List[str], symbol: str):
+        return await self._call_async("cancel_orders", order_ids, symbol)
+
+    async def fetch_open_orders_async(self, symbol: str):
+        return await self._call_async("fetch_open_orders", symbol)
+
+    async def fetch_order_async(self, order_id: str, symbol: str):
+        return await self._call_async("fetch_order", order_id, symbol)
+
+    def supports(self, feature: str) -> bool:
+        """Whether the venue offers a ccxt unified method, e.g. ``editOrder`` or ``createOrders``."""
+        return bool(self.exchange.has.get(feature))
+
+    # ------------- Utility ------------- #
+    async def fetch_balance_async(self):
+        return await self._call_async("fetch_balance")
+
+    async def close_async(self):
+        if self._async_exchange is not None:
+            await self._async_exchange.close()
+            self._async_exchange = None
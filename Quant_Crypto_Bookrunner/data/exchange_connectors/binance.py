@@ -1,18 +1,27 @@
 import ccxt
 from typing import Any, Dict
 
-class BinanceConnector:
+from ..order_book import OrderBook
+from .async_connector import AsyncMixin
+from .streaming import OrderBookGap, StreamingMixin
+
+class BinanceConnector(StreamingMixin, AsyncMixin):
     """Wrapper around ccxt.binance to provide simplified accessors."""
 
+    ws_url = "wss://stream.binance.com:9443/ws"
+
     def __init__(self, api_key: str | None = None, secret: str | None = None, sandbox: bool = False):
-        self.exchange = ccxt.binance({
+        self._config = {
             "apiKey": api_key,
             "secret": secret,
             "enableRateLimit": True,
             "options": {"defaultType": "spot"},
-        })
+        }
+        self._sandbox = sandbox
+        self.exchange = ccxt.binance(self._config)
         if sandbox:
             self.exchange.set_sandbox_mode(True)
+            self.ws_url = "wss://stream.testnet.binance.vision/ws"
 
     # ------------- Market Data ------------- #
     def get_order_book(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
@@ -21,6 +30,27 @@ class BinanceConnector:
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         return self.exchange.fetch_ticker(symbol)
 
+    # ------------- Streaming ------------- #
+    def _ws_endpoint(self, base_url: str, symbol: str, depth: int) -> str:
+        return f"{base_url}/{symbol.replace('/', '').lower()}@depth@100ms"
+
+    async def _ws_apply(self, msg: Dict[str, Any], book: OrderBook) -> bool:
+        # Diff stream: U/u are the first/last update ids covered by the event.
+        if msg.get("e") != "depthUpdate":
+            return False
+        if book.sequence is None:
+            snap = await self._fetch_snapshot(book.symbol, 1000)
+            book.reset(snap["bids"], snap["asks"], snap["nonce"], snap["timestamp"])
+        if msg["u"] <= book.sequence:
+            return False
+        if msg["U"] > book.sequence + 1:
+            raise OrderBookGap(f"expected update {book.sequence + 1}, got {msg['U']}")
+        book.apply_deltas("bids", msg["b"])
+        book.apply_deltas("asks", msg["a"])
+        book.sequence = msg["u"]
+        book.timestamp = msg["E"]
+        return True
+
     # ------------- Trading ------------- #
     def place_order(self, symbol: str, side: str, amount: float, price: float | None = None, order_type: str = "limit"):  # noqa: E501
         """Place an order. side in {"buy", "sell"}."""
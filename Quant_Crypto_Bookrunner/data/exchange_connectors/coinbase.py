@@ -1,16 +1,24 @@
 import ccxt
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-class CoinbaseConnector:
+from ..order_book import OrderBook
+from .async_connector import AsyncMixin
+from .streaming import OrderBookGap, StreamingMixin
+
+class CoinbaseConnector(StreamingMixin, AsyncMixin):
     """Wrapper around ccxt.coinbase (Coinbase Exchange) for simplified access."""
 
+    ws_url = "wss://advanced-trade-ws.coinbase.com"
+
     def __init__(self, api_key: str | None = None, secret: str | None = None, passphrase: str | None = None, sandbox: bool = False):
-        self.exchange = ccxt.coinbase({
+        self._config = {
             "apiKey": api_key,
             "secret": secret,
             "password": passphrase,  # Coinbase Exchange requires passphrase
             "enableRateLimit": True,
-        })
+        }
+        self._sandbox = sandbox
+        self.exchange = ccxt.coinbase(self._config)
         if sandbox:
             self.exchange.set_sandbox_mode(True)
 
@@ -21,6 +29,35 @@ class CoinbaseConnector:
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         return self.exchange.fetch_ticker(symbol)
 
+    # --------- Streaming --------- #
+    def _ws_subscribe(self, symbol: str, depth: int) -> List[Dict[str, Any]]:
+        product = symbol.replace("/", "-")
+        # Heartbeats keep the connection alive on quiet books.
+        return [
+            {"type": "subscribe", "product_ids": [product], "channel": "level2"},
+            {"type": "subscribe", "product_ids": [product], "channel": "heartbeats"},
+        ]
+
+    async def _ws_apply(self, msg: Dict[str, Any], book: OrderBook) -> bool:
+        # sequence_num counts every message on the connection, across channels.
+        seq = msg.get("sequence_num")
+        if seq is not None:
+            if book.sequence is not None and seq != book.sequence + 1:
+                raise OrderBookGap(f"expected sequence {book.sequence + 1}, got {seq}")
+            book.sequence = seq
+        if msg.get("channel") != "l2_data":
+            return False
+        for event in msg.get("events", []):
+            bids = [(u["price_level"], u["new_quantity"]) for u in event["updates"] if u["side"] == "bid"]
+            asks = [(u["price_level"], u["new_quantity"]) for u in event["updates"] if u["side"] == "offer"]
+            if event["type"] == "snapshot":
+                book.reset(bids, asks, book.sequence)
+            else:
+                book.apply_deltas("bids", bids)
+                book.apply_deltas("asks", asks)
+        book.timestamp = self.exchange.parse8601(msg.get("timestamp"))
+        return True
+
     # --------- Trading --------- #
     def place_order(self, symbol: str, side: str, amount: float, price: float | None = None, order_type: str = "limit"):
         params = {}
@@ -1,15 +1,50 @@
 import ccxt
-from typing import Any, Dict
+import json
+import zlib
+from decimal import Decimal
+from typing import Any, Dict, List
 
-class KrakenConnector:
+from ..order_book import OrderBook
+from .async_connector import AsyncMixin
+from .streaming import OrderBookGap, StreamingMixin
+
+KRAKEN_BOOK_DEPTHS = (10, 25, 100, 500, 1000)
+CHECKSUM_LEVELS = 10
+
+
+def _decimals(value) -> int:
+    return -value.as_tuple().exponent if isinstance(value, Decimal) else 0
+
+
+def _checksum_field(value: float, decimals: int) -> str:
+    return f"{value:.{decimals}f}".replace(".", "").lstrip("0")
+
+
+def book_checksum(book: OrderBook, price_decimals: int, qty_decimals: int) -> int:
+    """Kraken's CRC32 over the top ten asks then bids, each formatted at the pair's precision."""
+    parts = []
+    for side in (book.asks, book.bids):
+        for price, qty in side[:CHECKSUM_LEVELS]:
+            parts.append(_checksum_field(price, price_decimals) + _checksum_field(qty, qty_decimals))
+    return zlib.crc32("".join(parts).encode())
+
+
+class KrakenConnector(StreamingMixin, AsyncMixin):
     """Wrapper around ccxt.kraken."""
 
+    ws_url = "wss://ws.kraken.com/v2"
+
     def __init__(self, api_key: str | None = None, secret: str | None = None, sandbox: bool = False):
-        self.exchange = ccxt.kraken({
+        self._config = {
             "apiKey": api_key,
             "secret": secret,
             "enableRateLimit": True,
-        })
+        }
+        self._sandbox = sandbox
+        # Per symbol: subscribed book depth and the (price, qty) decimals the feed uses.
+        self._ws_depths: Dict[str, int] = {}
+        self._ws_decimals: Dict[str, List[int]] = {}
+        self.exchange = ccxt.kraken(self._config)
         if sandbox:
             self.exchange.set_sandbox_mode(True)
 
@@ -20,6 +55,48 @@ class KrakenConnector:
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         return self.exchange.fetch_ticker(symbol)
 
+    # Streaming
+    def _ws_subscribe(self, symbol: str, depth: int) -> List[Dict[str, Any]]:
+        depth = next((d for d in KRAKEN_BOOK_DEPTHS if d >= depth), KRAKEN_BOOK_DEPTHS[-1])
+        self._ws_depths[symbol] = depth
+        return [{"method": "subscribe", "params": {"channel": "book", "symbol": [symbol], "depth": depth}}]
+
+    def _ws_decode(self, raw) -> Dict[str, Any]:
+        # Decimals keep the venue's formatting, which the checksum is computed over.
+        return json.loads(raw, parse_float=Decimal)
+
+    async def _ws_apply(self, msg: Dict[str, Any], book: OrderBook) -> bool:
+        # Kraken v2 books carry no sequence numbers: every update carries a checksum instead.
+        if msg.get("channel") != "book":
+            return False
+        depth = self._ws_depths.get(book.symbol, book.capacity)
+        snapshot = msg.get("type") == "snapshot"
+        if snapshot:
+            self._ws_decimals[book.symbol] = [0, 0]
+        decimals = self._ws_decimals.setdefault(book.symbol, [0, 0])
+        for entry in msg.get("data", []):
+            sides = []
+            for key in ("bids", "asks"):
+                levels = entry.get(key, [])
+                for lvl in levels:
+                    decimals[0] = max(decimals[0], _decimals(lvl["price"]))
+                    decimals[1] = max(decimals[1], _decimals(lvl["qty"]))
+                sides.append([(float(lvl["price"]), float(lvl["qty"])) for lvl in levels])
+            if snapshot:
+                book.reset(*sides)
+            else:
+                book.apply_deltas("bids", sides[0])
+                book.apply_deltas("asks", sides[1])
+            # Levels pushed out of the subscribed depth are dropped without a delete message.
+            book.truncate(depth)
+            book.timestamp = self.exchange.parse8601(entry.get("timestamp"))
+            checksum = entry.get("checksum")
+            if checksum is not None and book_checksum(book, *decimals) != checksum:
+                raise OrderBookGap(f"checksum mismatch ({checksum})")
+        if book.is_crossed():
+            raise OrderBookGap("crossed book")
+        return True
+
     # Trading
     def place_order(self, symbol: str, side: str, amount: float, price: float | None = None, order_type: str = "limit"):
         params = {}
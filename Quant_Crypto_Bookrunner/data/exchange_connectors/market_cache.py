@@ -0,0 +1,47 @@
+"""On-disk cache of ccxt ``load_markets`` results.
+
+``load_markets`` downloads every market an exchange lists (thousands on Binance)
+before the first request can be sent, which dominates restart time.  The cache
+keeps one JSON file per exchange::
+
+    cache/markets/binance.json   {"fetched_at": <unix s>, "markets": {...}, "currencies": {...}}
+
+Entries older than ``ttl`` are still served (markets rarely change) but the
+caller is told to refresh them in the background.
+"""
+from typing import Any, Dict, Tuple
+import json
+import os
+import time
+
+MARKETS_TTL = 24 * 3600
+
+
+class MarketCache:
+    def __init__(self, root: str = os.path.join("cache", "markets"), ttl: float = MARKETS_TTL):
+        self.root = root
+        self.ttl = ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def load(self, key: str) -> Tuple[Dict[str, Any], Dict[str, Any], bool] | None:
+        """``(markets, currencies, stale)`` for ``key`` or None if nothing usable is cached."""
+        try:
+            with open(self._path(key)) as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not entry.get("markets"):
+            return None
+        stale = time.time() - entry.get("fetched_at", 0) > self.ttl
+        return entry["markets"], entry.get("currencies") or {}, stale
+
+    def save(self, key: str, markets: Dict[str, Any], currencies: Dict[str, Any] | None):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"fetched_at": time.time(), "markets": markets, "currencies": currencies or {}}, fh,
+                      separators=(",", ":"), default=str)
+        os.replace(tmp, path)
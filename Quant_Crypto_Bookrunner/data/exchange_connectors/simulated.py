@@ -0,0 +1,462 @@
+"""In-process simulated exchange for offline end-to-end and load testing.
+
+``SimulatedConnector`` exposes the same surface as ``BinanceConnector`` (sync and
+``*_async`` market data and trading, ``stream_order_book``, ``supports``) so it
+can stand in for a venue in ``main.py`` (``--exchange simulated``), the dashboard
+or the benchmarks.  Each symbol is a ``MatchingEngine`` (price-time priority)
+driven by seeded background order flow: limit orders around a random-walk mid,
+cancels and marketable orders that trade through the book, including our quotes.
+
+Flow is generated lazily from the wall clock: whoever touches a market (a REST
+call or a stream) first catches it up to ``rate`` events per second, so no
+background task is needed and rates of tens of thousands of events per second
+are reachable from one event loop.  Every event's L2 changes are fanned out to
+the streams as one message.
+"""
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+import asyncio
+import bisect
+import itertools
+import math
+import random
+import time
+from time import perf_counter_ns
+
+import ccxt
+
+from ..order_book import OrderBook
+from .streaming import BOOK_HEADROOM, BookCallback
+
+Delta = Tuple[str, float, float]
+
+# Sizes at or below this are treated as zero (float residue of partial fills).
+EPSILON = 1e-9
+
+
+def _reduce(remaining: float, qty: float) -> float:
+    remaining -= qty
+    return remaining if remaining > EPSILON else 0.0
+
+
+class SimOrder:
+    __slots__ = ("id", "symbol", "side", "price", "amount", "remaining", "owner", "timestamp")
+
+    def __init__(self, order_id: str, symbol: str, side: str, price: float, amount: float, owner: str,
+                 timestamp: int):
+        self.id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.remaining = amount
+        self.owner = owner
+        self.timestamp = timestamp
+
+    def to_ccxt(self) -> Dict[str, Any]:
+        filled = self.amount - self.remaining
+        status = "closed" if self.remaining <= 0 else "open" if self.price is not None else "canceled"
+        return {
+            "id": self.id, "symbol": self.symbol, "type": "limit", "side": self.side, "price": self.price,
+            "amount": self.amount, "filled": filled, "remaining": self.remaining, "status": status,
+            "timestamp": self.timestamp,
+        }
+
+
+class MatchingEngine:
+    """Limit order book with price-time priority matching for one symbol.
+
+    Each price level is a FIFO queue of order ids plus its total size; cancelled
+    orders are removed from the level total at once and skipped lazily when the
+    queue is matched.  Every change to a level total is appended to ``deltas`` as
+    ``(side, price, new_total)`` (0 removes the level), L2-feed style.
+    """
+
+    def __init__(self, symbol: str, on_fill: Callable[[SimOrder, float, float], Any] | None = None):
+        self.symbol = symbol
+        self.on_fill = on_fill
+        self.orders: Dict[str, SimOrder] = {}
+        # price -> [queue of order ids, total size]; prices kept sorted ascending per side.
+        self._levels: Dict[str, Dict[float, list]] = {"buy": {}, "sell": {}}
+        self._prices: Dict[str, List[float]] = {"buy": [], "sell": []}
+        self._ids = itertools.count(1)
+        self.deltas: List[Delta] = []
+
+    # ------------- Queries ------------- #
+    @property
+    def best_bid(self) -> float:
+        prices = self._prices["buy"]
+        return prices[-1] if prices else math.nan
+
+    @property
+    def best_ask(self) -> float:
+        prices = self._prices["sell"]
+        return prices[0] if prices else math.nan
+
+    def levels(self, depth: int) -> Tuple[List[List[float]], List[List[float]]]:
+        """Top ``depth`` ``[price, size]`` levels per side, best first."""
+        bids = [[p, self._levels["buy"][p][1]] for p in reversed(self._prices["buy"][-depth:])]
+        asks = [[p, self._levels["sell"][p][1]] for p in self._prices["sell"][:depth]]
+        return bids, asks
+
+    # ------------- Orders ------------- #
+    def submit(self, side: str, price: float | None, amount: float, owner: str = "sim") -> SimOrder:
+        """Match a limit (or, with ``price=None``, market) order and rest any remainder."""
+        if not amount > EPSILON or (price is not None and not price > 0):
+            raise ccxt.InvalidOrder(f"{self.symbol} {side} {amount} @ {price}: invalid amount or price")
+        order = SimOrder(str(next(self._ids)), self.symbol, side, price, amount, owner, int(time.time() * 1000))
+        self._match(order)
+        if order.remaining > 0 and price is not None:
+            self._rest(order)
+        return order
+
+    def cancel(self, order_id: str) -> SimOrder:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            raise ccxt.OrderNotFound(f"{self.symbol} order {order_id} not found")
+        self._change(order.side, order.price, -order.remaining)
+        return order
+
+    def _rest(self, order: SimOrder):
+        levels = self._levels[order.side]
+        level = levels.get(order.price)
+        if level is None:
+            level = levels[order.price] = [deque(), 0.0]
+            bisect.insort(self._prices[order.side], order.price)
+        level[0].append(order.id)
+        self.orders[order.id] = order
+        self._change(order.side, order.price, order.remaining)
+
+    def _change(self, side: str, price: float, delta: float):
+        level = self._levels[side][price]
+        level[1] += delta
+        if level[1] <= EPSILON:
+            self._drop(side, price)
+        else:
+            self.deltas.append(("bids" if side == "buy" else "asks", price, level[1]))
+
+    def _drop(self, side: str, price: float):
+        del self._levels[side][price]
+        prices = self._prices[side]
+        del prices[bisect.bisect_left(prices, price)]
+        self.deltas.append(("bids" if side == "buy" else "asks", price, 0.0))
+
+    def _match(self, taker: SimOrder):
+        maker_side = "sell" if taker.side == "buy" else "buy"
+        prices, levels = self._prices[maker_side], self._levels[maker_side]
+        while taker.remaining > 0 and prices:
+            best = prices[0] if maker_side == "sell" else prices[-1]
+            if taker.price is not None and (best > taker.price if taker.side == "buy" else best < taker.price):
+                break
+            queue = levels[best][0]
+            while taker.remaining > 0 and queue:
+                maker = self.orders.get(queue[0])
+                if maker is None:  # cancelled
+                    queue.popleft()
+                    continue
+                qty = min(taker.remaining, maker.remaining)
+                taker.remaining = _reduce(taker.remaining, qty)
+                maker.remaining = _reduce(maker.remaining, qty)
+                if maker.remaining == 0.0:
+                    queue.popleft()
+                    del self.orders[maker.id]
+                self._change(maker_side, best, -qty)
+                if self.on_fill is not None:
+                    self.on_fill(maker, qty, best)
+                    self.on_fill(taker, qty, best)
+                if best not in levels:
+                    break
+            if not queue and best in levels:
+                # Every order here is gone but float residue is left in the total.
+                self._drop(maker_side, best)
+
+
+class SimulatedMarket:
+    """One symbol of the simulated venue: engine, background flow and stream fan-out."""
+
+    def __init__(self, symbol: str, price: float, *, rate: float, tick_size: float, depth: int, seed: int,
+                 on_fill: Callable[[SimOrder, float, float], Any] | None = None):
+        self.symbol = symbol
+        self.rate = rate
+        self.tick_size = tick_size
+        self.depth = depth
+        self.mid = price
+        self.engine = MatchingEngine(symbol, on_fill)
+        self.subscribers: List[deque] = []
+        self.sequence = 0
+        self._rng = random.Random(seed)
+        self._background: List[str] = []
+        self._last = time.monotonic()
+        self._carry = 0.0
+        # Seed the book with ``depth`` levels per side.
+        for i in range(1, depth + 1):
+            self._place("buy", i)
+            self._place("sell", i)
+        self.engine.deltas.clear()
+
+    def _place(self, side: str, ticks: int):
+        sign = -1 if side == "buy" else 1
+        price = round(round(self.mid / self.tick_size + sign * ticks) * self.tick_size, 10)
+        order = self.engine.submit(side, price, round(self._rng.lognormvariate(-0.5, 0.8), 4) + 0.0001)
+        if order.remaining > 0:
+            self._background.append(order.id)
+
+    def _event(self):
+        rng, engine = self._rng, self.engine
+        self.mid *= math.exp(rng.gauss(0.0, 0.2e-4))
+        # A side thinner than ``depth`` levels is replenished first, so takers never empty the book.
+        for side in ("buy", "sell"):
+            if len(engine._prices[side]) < self.depth:
+                self._place(side, int(rng.expovariate(0.25)) + 1)
+                return
+        u = rng.random()
+        if u < 0.15:
+            side = "buy" if rng.random() < 0.5 else "sell"
+            engine.submit(side, None, round(rng.lognormvariate(-1.0, 1.0), 4) + 0.0001)
+        elif u < 0.5 or len(engine.orders) > 4 * self.depth:
+            background = self._background
+            while background:
+                i = rng.randrange(len(background))
+                background[i], background[-1] = background[-1], background[i]
+                order_id = background.pop()
+                if order_id in engine.orders:  # else already filled
+                    engine.cancel(order_id)
+                    break
+        else:
+            self._place("buy" if rng.random() < 0.5 else "sell", int(rng.expovariate(0.25)) + 1)
+
+    def advance(self):
+        """Generate the events due since the last call (at most one second's worth)."""
+        now = time.monotonic()
+        due = min((now - self._last) * self.rate, self.rate) + self._carry
+        self._last = now
+        n = int(due)
+        self._carry = due - n
+        for _ in range(n):
+            self._event()
+            self.publish()
+
+    def publish(self):
+        """Send the engine's pending level changes to every stream as one message."""
+        deltas = self.engine.deltas
+        if not deltas:
+            return
+        self.sequence += 1
+        for queue in self.subscribers:
+            queue.append(deltas)
+        self.engine.deltas = []
+
+
+class _SimulatedExchange:
+    """The bits of a ccxt exchange the rest of the code reads (``id``, ``has``, ``markets``)."""
+
+    id = "simulated"
+    rateLimit = 0
+    has = {"editOrder": True, "createOrders": True, "cancelOrders": True}
+
+    def __init__(self):
+        self.markets: Dict[str, Any] = {}
+        self.currencies: Dict[str, Any] = {}
+
+
+class SimulatedConnector:
+    """Drop-in connector backed by simulated markets.
+
+    Parameters
+    ----------
+    rate : float
+        Background events (book updates) per second per symbol.
+    prices : dict
+        Starting mid per symbol (default ``DEFAULT_PRICE``).
+    latency_ms : float
+        Simulated round trip added to every async request.
+    balances : dict
+        Starting balances per currency; fills move them.
+    on_fill : callable
+        Called with a ccxt-style order dict (``filled`` = fill quantity) for every
+        fill of one of our orders.
+    """
+
+    DEFAULT_PRICE = 30_000.0
+
+    def __init__(self, api_key: str | None = None, secret: str | None = None, sandbox: bool = False, *,
+                 rate: float = 1000.0, prices: Dict[str, float] | None = None, tick_size: float = 0.01,
+                 depth: int = 50, latency_ms: float = 0.0, seed: int = 0, balances: Dict[str, float] | None = None,
+                 on_fill: Callable[[Dict[str, Any]], Any] | None = None):
+        self.exchange = _SimulatedExchange()
+        self.rate = rate
+        self.prices = prices or {}
+        self.tick_size = tick_size
+        self.depth = depth
+        self.latency = latency_ms / 1000
+        self.seed = seed
+        self.balances: Dict[str, float] = dict(balances or {"USDT": 1_000_000.0, "BTC": 10.0})
+        self.on_fill = on_fill
+        self.fills: List[Dict[str, Any]] = []
+        self.orders: Dict[str, SimOrder] = {}  # every order we placed, by id
+        self.markets: Dict[str, SimulatedMarket] = {}
+
+    def market(self, symbol: str) -> SimulatedMarket:
+        market = self.markets.get(symbol)
+        if market is None:
+            market = self.markets[symbol] = SimulatedMarket(
+                symbol, self.prices.get(symbol, self.DEFAULT_PRICE), rate=self.rate, tick_size=self.tick_size,
+                depth=self.depth, seed=self.seed + len(self.markets), on_fill=self._on_engine_fill,
+            )
+        market.advance()
+        return market
+
+    def _on_engine_fill(self, order: SimOrder, qty: float, price: float):
+        if order.owner != "user":
+            return
+        base, quote = order.symbol.split("/")
+        sign = 1 if order.side == "buy" else -1
+        self.balances[base] = self.balances.get(base, 0.0) + sign * qty
+        self.balances[quote] = self.balances.get(quote, 0.0) - sign * qty * price
+        fill = {**order.to_ccxt(), "price": price, "filled": qty}
+        self.fills.append(fill)
+        if self.on_fill is not None:
+            self.on_fill(fill)
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        return self.exchange.markets
+
+    async def load_markets_async(self, reload: bool = False) -> Dict[str, Any]:
+        return self.exchange.markets
+
+    def supports(self, feature: str) -> bool:
+        return bool(self.exchange.has.get(feature))
+
+    # ------------- Market Data ------------- #
+    def get_order_book(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
+        market = self.market(symbol)
+        bids, asks = market.engine.levels(limit)
+        return {"symbol": symbol, "bids": bids, "asks": asks, "timestamp": int(time.time() * 1000),
+                "nonce": market.sequence}
+
+    def get_book(self, symbol: str, limit: int = 20) -> OrderBook:
+        return OrderBook.from_ccxt(self.get_order_book(symbol, limit), capacity=limit)
+
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        engine = self.market(symbol).engine
+        return {"symbol": symbol, "bid": engine.best_bid, "ask": engine.best_ask,
+                "last": (engine.best_bid + engine.best_ask) / 2, "timestamp": int(time.time() * 1000)}
+
+    # ------------- Trading ------------- #
+    def place_order(self, symbol: str, side: str, amount: float, price: float | None = None,
+                    order_type: str = "limit"):
+        if order_type not in ("limit", "market"):
+            raise ValueError("Unsupported order_type: " + order_type)
+        market = self.market(symbol)
+        order = market.engine.submit(side, price if order_type == "limit" else None, amount, owner="user")
+        self.orders[order.id] = order
+        market.publish()
+        return order.to_ccxt()
+
+    def cancel_order(self, order_id: str, symbol: str):
+        market = self.market(symbol)
+        order = market.engine.cancel(order_id)
+        market.publish()
+        return {**order.to_ccxt(), "status": "canceled"}
+
+    def fetch_open_orders(self, symbol: str):
+        engine = self.market(symbol).engine
+        return [order.to_ccxt() for order in engine.orders.values() if order.owner == "user"]
+
+    def fetch_order(self, order_id: str, symbol: str):
+        order = self.orders.get(order_id)
+        if order is None or order.symbol != symbol:
+            raise ccxt.OrderNotFound(f"{symbol} order {order_id} not found")
+        info = order.to_ccxt()
+        if info["status"] == "open" and order_id not in self.market(symbol).engine.orders:
+            info["status"] = "canceled"
+        return info
+
+    def fetch_balance(self):
+        return {"free": dict(self.balances), "used": {}, "total": dict(self.balances)}
+
+    # ------------- Async ------------- #
+    async def _roundtrip(self):
+        await asyncio.sleep(self.latency)
+
+    async def get_order_book_async(self, symbol: str, limit: int = 20) -> Dict[str, Any]:
+        await self._roundtrip()
+        return self.get_order_book(symbol, limit)
+
+    async def get_book_async(self, symbol: str, limit: int = 20) -> OrderBook:
+        return OrderBook.from_ccxt(await self.get_order_book_async(symbol, limit), capacity=limit)
+
+    async def get_ticker_async(self, symbol: str) -> Dict[str, Any]:
+        await self._roundtrip()
+        return self.get_ticker(symbol)
+
+    async def place_order_async(self, symbol: str, side: str, amount: float, price: float | None = None,
+                                order_type: str = "limit"):
+        await self._roundtrip()
+        return self.place_order(symbol, side, amount, price, order_type)
+
+    async def cancel_order_async(self, order_id: str, symbol: str):
+        await self._roundtrip()
+        return self.cancel_order(order_id, symbol)
+
+    async def edit_order_async(self, order_id: str, symbol: str, side: str, amount: float, price: float):
+        await self._roundtrip()
+        self.cancel_order(order_id, symbol)
+        return self.place_order(symbol, side, amount, price)
+
+    async def create_orders_async(self, orders: List[Dict[str, Any]]):
+        await self._roundtrip()
+        return [self.place_order(o["symbol"], o["side"], o["amount"], o.get("price"), o.get("type", "limit"))
+                for o in orders]
+
+    async def cancel_orders_async(self, order_ids: List[str], symbol: str):
+        """Cancel what is still resting; ids that already filled are skipped, as venues do."""
+        await self._roundtrip()
+        engine = self.market(symbol).engine
+        return [self.cancel_order(order_id, symbol) for order_id in order_ids if order_id in engine.orders]
+
+    async def fetch_open_orders_async(self, symbol: str):
+        await self._roundtrip()
+        return self.fetch_open_orders(symbol)
+
+    async def fetch_order_async(self, order_id: str, symbol: str):
+        await self._roundtrip()
+        return self.fetch_order(order_id, symbol)
+
+    async def fetch_balance_async(self):
+        await self._roundtrip()
+        return self.fetch_balance()
+
+    async def close_async(self):
+        pass
+
+    # ------------- Streaming ------------- #
+    async def stream_order_book(self, symbol: str, on_book: BookCallback, *, depth: int = 20,
+                                poll_interval: float = 0.001, decode_latency=None, **_):
+        """Call ``on_book`` after every simulated event, like a venue diff stream.
+
+        The market is caught up every ``poll_interval`` seconds; the book passed
+        to ``on_book`` is updated in place.
+        """
+        market = self.market(symbol)
+        book = OrderBook(symbol, capacity=depth * BOOK_HEADROOM)
+        bids, asks = market.engine.levels(depth * BOOK_HEADROOM)
+        book.reset(bids, asks, market.sequence)
+        queue: deque = deque()
+        market.subscribers.append(queue)
+        try:
+            on_book(book)
+            while True:
+                market.advance()
+                while queue:
+                    deltas = queue.popleft()
+                    start = perf_counter_ns()
+                    for side, price, size in deltas:
+                        book.apply_delta(side, price, size)
+                    book.sequence = (book.sequence or 0) + 1
+                    if decode_latency is not None:
+                        decode_latency.record(perf_counter_ns() - start)
+                    on_book(book)
+                await asyncio.sleep(poll_interval)
+        finally:
+            market.subscribers.remove(queue)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import time
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List
+
+import ccxt
+import websockets
+
+from ..order_book import OrderBook
+
+BookCallback = Callable[[OrderBook], Any]
+
+# Local book capacity as a multiple of the requested depth: the extra levels keep
+# deletions near the top from exposing a truncated book before the venue refills it.
+BOOK_HEADROOM = 5
+
+
+class OrderBookGap(Exception):
+    """Raised when a diff cannot be applied to the local book and a resync is required."""
+
+
+class StreamingMixin:
+    """Adds ``get_book`` and ``stream_order_book`` to a connector wrapping ``self.exchange``.
+
+    Subclasses provide the venue protocol through ``_ws_endpoint``, ``_ws_subscribe``
+    and ``_ws_apply``.  ``ws_url`` may be overridden (e.g. to a local fake feed).
+    """
+
+    ws_url: str = ""
+    # Reconnect backoff: reconnect_delay * 2**attempt, capped; reset after a stable connection.
+    reconnect_delay = 0.5
+    max_reconnect_delay = 30.0
+    STABLE_SECONDS = 30.0
+
+    def get_book(self, symbol: str, limit: int = 20) -> OrderBook:
+        """Like ``get_order_book`` but returns an array-backed ``OrderBook``."""
+        return OrderBook.from_ccxt(self.exchange.fetch_order_book(symbol, limit=limit), capacity=limit)
+
+    async def stream_order_book(
+        self,
+        symbol: str,
+        on_book: BookCallback,
+        *,
+        depth: int = 20,
+        ws_url: str | None = None,
+        max_retries: int = 3,
+        poll_interval: float = 1.0,
+        ws_retry_interval: float = 60.0,
+        decode_latency=None,
+        on_reset: Callable[[], Any] | None = None,
+    ):
+        """Stream ``symbol`` over WebSocket and call ``on_book`` on every book change.
+
+        ``on_book`` receives the live ``OrderBook`` (updated in place); copy it if it
+        must outlive the callback.  Sequence gaps and malformed messages trigger a
+        snapshot resync.  Every reconnect (resync, server close, connection error or
+        ccxt error such as a failed snapshot request) waits an exponential backoff
+        that only resets once a connection has stayed up for ``STABLE_SECONDS``.
+        After ``max_retries`` consecutive connection failures the
+        stream falls back to REST polling and retries the WebSocket every
+        ``ws_retry_interval`` seconds.  ``on_reset`` is called whenever the stream
+        drops, before the book is rebuilt, so consumers can discard what they derived
+        from it.
+        """
+        book = OrderBook(symbol, capacity=depth * BOOK_HEADROOM)
+        failures = 0
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                await self._run_ws(symbol, depth, book, on_book, ws_url or self.ws_url, decode_latency)
+                print(f"[Stream] {symbol} connection closed by server")
+                failures = 0
+            except OrderBookGap as exc:
+                print(f"[Stream] {symbol} resync: {exc}")
+                failures = 0
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException, ccxt.BaseError) as exc:
+                failures += 1
+                if failures >= max_retries:
+                    if on_reset is not None:
+                        on_reset()
+                    print(f"[Stream] {symbol} websocket unavailable ({exc}), polling REST for {ws_retry_interval:g}s")
+                    try:
+                        await asyncio.wait_for(
+                            self.poll_order_book(symbol, on_book, depth=depth, interval=poll_interval),
+                            timeout=ws_retry_interval,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    # One more failure sends us straight back to polling.
+                    failures = max_retries - 1
+                    continue
+            if on_reset is not None:
+                on_reset()
+            if time.monotonic() - started >= self.STABLE_SECONDS:
+                attempt = 0
+            await asyncio.sleep(min(self.reconnect_delay * 2 ** attempt, self.max_reconnect_delay))
+            attempt += 1
+
+    async def poll_order_book(self, symbol: str, on_book: BookCallback, *, depth: int = 20, interval: float = 1.0):
+        """REST fallback: poll snapshots and call ``on_book`` only when the book changed."""
+        last = None
+        while True:
+            try:
+                book = await asyncio.to_thread(self.get_book, symbol, depth)
+            except Exception as exc:
+                print(f"[Stream] {symbol} poll failed:", exc)
+            else:
+                top = (book.bids.tobytes(), book.asks.tobytes())
+                if top != last:
+                    last = top
+                    on_book(book)
+            await asyncio.sleep(interval)
+
+    async def _run_ws(self, symbol: str, depth: int, book: OrderBook, on_book: BookCallback, base_url: str,
+                      decode_latency=None):
+        book.sequence = None
+        async with websockets.connect(self._ws_endpoint(base_url, symbol, depth), max_size=None) as ws:
+            for msg in self._ws_subscribe(symbol, depth):
+                await ws.send(json.dumps(msg))
+            async for raw in ws:
+                start = perf_counter_ns()
+                try:
+                    changed = await self._ws_apply(self._ws_decode(raw), book)
+                except (ValueError, KeyError, TypeError, IndexError) as exc:
+                    # A half-applied message may have left the book wrong: start over from a snapshot.
+                    raise OrderBookGap(f"malformed message ({type(exc).__name__}: {exc})") from exc
+                if decode_latency is not None:
+                    decode_latency.record(perf_counter_ns() - start)
+                if changed:
+                    on_book(book)
+
+    async def _fetch_snapshot(self, symbol: str, limit: int) -> Dict[str, Any]:
+        def fetch():
+            self.load_markets()
+            return self.exchange.fetch_order_book(symbol, limit)
+
+        return await asyncio.to_thread(fetch)
+
+    # ------------- Venue protocol hooks ------------- #
+    def _ws_endpoint(self, base_url: str, symbol: str, depth: int) -> str:
+        return base_url
+
+    def _ws_subscribe(self, symbol: str, depth: int) -> List[Dict[str, Any]]:
+        return []
+
+    def _ws_decode(self, raw) -> Dict[str, Any]:
+        return json.loads(raw)
+
+    async def _ws_apply(self, msg: Dict[str, Any], book: OrderBook) -> bool:
+        """Apply one decoded message; return True if the book changed."""
+        raise NotImplementedError
@@ -0,0 +1,67 @@
+import asyncio
+import zlib
+
+import pytest
+
+from ..order_book import OrderBook
+from .kraken import KrakenConnector
+from .streaming import OrderBookGap
+
+SYMBOL = "BTC/USD"
+
+
+def level(price, qty):
+    return f'{{"price": {price}, "qty": {qty}}}'
+
+
+def venue_checksum(bids, asks):
+    """The checksum as the venue computes it, from its own decimal strings (levels best-first)."""
+    def field(text):
+        return text.replace(".", "").lstrip("0")
+
+    return zlib.crc32("".join(field(p) + field(q) for p, q in asks[:10] + bids[:10]).encode())
+
+
+def message(kind, bids, asks, checksum=None):
+    checksum = venue_checksum(bids, asks) if checksum is None else checksum
+    return (f'{{"channel": "book", "type": "{kind}", "data": [{{"symbol": "{SYMBOL}", '
+            f'"bids": [{", ".join(level(*lvl) for lvl in bids)}], '
+            f'"asks": [{", ".join(level(*lvl) for lvl in asks)}], '
+            f'"checksum": {checksum}, "timestamp": "2024-01-01T00:00:00.000000Z"}}]}}')
+
+
+def side(start, step):
+    return [(f"{start + i * step:.1f}", "0.50000000") for i in range(10)]
+
+
+def apply(conn, book, raw):
+    return asyncio.run(conn._ws_apply(conn._ws_decode(raw), book))
+
+
+def test_updates_keep_subscribed_depth_and_verify_checksum():
+    conn = KrakenConnector()
+    conn._ws_subscribe(SYMBOL, 10)
+    book = OrderBook(SYMBOL, capacity=50)
+    bids, asks = side(99.9, -0.1), side(100.0, 0.1)
+    apply(conn, book, message("snapshot", bids, asks))
+
+    # A better bid pushes the tenth one out of scope; the venue sends no delete for it.
+    # The best ask is taken and the venue refills the tenth ask level.
+    bids = [("100.0", "1.25000000")] + bids[:9]
+    asks = [("100.1", "2.00000000")] + asks[2:] + [("101.0", "0.50000000")]
+    update = message("update", [("100.0", "1.25000000")],
+                     [("100.0", "0.00000000"), ("100.1", "2.00000000"), ("101.0", "0.50000000")],
+                     checksum=venue_checksum(bids, asks))
+    apply(conn, book, update)
+    assert len(book.bids) == 10
+    assert book.bids[:, 0].tolist() == [float(p) for p, _ in bids]
+    assert book.asks[:, 0].tolist() == [float(p) for p, _ in asks]
+
+
+def test_checksum_mismatch_forces_resync():
+    conn = KrakenConnector()
+    conn._ws_subscribe(SYMBOL, 10)
+    book = OrderBook(SYMBOL, capacity=50)
+    apply(conn, book, message("snapshot", side(99.9, -0.1), side(100.0, 0.1)))
+    with pytest.raises(OrderBookGap):
+        apply(conn, book, message("update", [("99.9", "0.75000000")], [], checksum=12345))
@@ -0,0 +1,23 @@
+import ccxt
+import pytest
+
+from .simulated import MatchingEngine, SimulatedConnector
+
+
+def test_dust_orders_are_rejected():
+    conn = SimulatedConnector(rate=0.0)
+    with pytest.raises(ccxt.InvalidOrder):
+        conn.place_order("BTC/USDT", "buy", 5e-10, 29_000.0)
+    order = conn.place_order("BTC/USDT", "buy", 0.01, 29_000.0)
+    assert conn.cancel_order(order["id"], "BTC/USDT")["status"] == "canceled"
+
+
+def test_level_with_residual_total_but_empty_queue_is_dropped():
+    engine = MatchingEngine("BTC/USDT")
+    engine.submit("sell", 100.0, 0.1)
+    engine.submit("sell", 101.0, 1.0)
+    engine._levels["sell"][100.0][1] += 1e-6  # total drifted above the queue's orders
+    taker = engine.submit("buy", 101.0, 0.5)
+    assert taker.remaining == 0.0
+    assert engine.best_ask == 101.0
+    assert engine.levels(5)[1] == [[101.0, pytest.approx(0.6)]]
@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import ccxt
+import websockets
+
+from ..order_book import OrderBook
+from .streaming import StreamingMixin
+
+
+class FakeConnector(StreamingMixin):
+    """Minimal venue: every message is a full ``{"b": [...], "a": [...]}`` snapshot."""
+
+    reconnect_delay = 0.01
+    max_reconnect_delay = 0.05
+
+    def __init__(self, rest_book=None):
+        self.rest_book = rest_book
+        self.polls = 0
+
+    def get_book(self, symbol, limit=20):
+        self.polls += 1
+        return OrderBook.from_ccxt(self.rest_book, capacity=limit)
+
+    async def _ws_apply(self, msg, book):
+        book.reset(msg["b"], msg["a"])
+        return True
+
+
+def snapshot(bid, ask):
+    return json.dumps({"b": [[bid, 1.0]], "a": [[ask, 1.0]]})
+
+
+async def serve(connections, port=0):
+    """Local feed sending ``connections[i]`` on the i-th connection, then closing it."""
+    count = [0]
+
+    async def handler(ws):
+        script = connections[min(count[0], len(connections) - 1)]
+        count[0] += 1
+        for raw in script:
+            await ws.send(raw)
+        await asyncio.sleep(0.01)
+
+    server = await websockets.serve(handler, "127.0.0.1", port)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}", count
+
+
+async def collect(conn, url, n, timeout=5.0, **kwargs):
+    mids, resets = [], []
+
+    def on_book(book):
+        mids.append(book.mid)
+
+    task = asyncio.create_task(conn.stream_order_book(
+        "BTC/USDT", on_book, ws_url=url, on_reset=lambda: resets.append(len(mids)), **kwargs))
+    try:
+        async with asyncio.timeout(timeout):
+            while len(mids) < n:
+                await asyncio.sleep(0.005)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    return mids, resets
+
+
+def test_reconnects_with_backoff_after_server_close():
+    async def run():
+        server, url, count = await serve([[snapshot(99, 101)], [snapshot(100, 102)]])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        mids, resets = await collect(FakeConnector(), url, 2)
+        server.close()
+        return mids, resets, count[0], loop.time() - start
+
+    mids, resets, connections, elapsed = asyncio.run(run())
+    assert mids[:2] == [100.0, 101.0]
+    assert resets and connections >= 2
+    assert elapsed >= FakeConnector.reconnect_delay
+
+
+def test_malformed_message_resyncs_instead_of_escaping():
+    async def run():
+        server, url, count = await serve([
+            ["not json", snapshot(98, 100)],
+            [json.dumps({"b": []}), snapshot(98, 100)],
+            [snapshot(100, 102)],
+        ])
+        mids, resets = await collect(FakeConnector(), url, 1)
+        server.close()
+        return mids, resets, count[0]
+
+    mids, resets, connections = asyncio.run(run())
+    # Each bad message dropped its connection before the good one behind it was applied.
+    assert mids[0] == 101.0
+    assert resets[:2] == [0, 0]
+    assert connections >= 3
+
+
+def test_falls_back_to_polling_and_retries_websocket():
+    async def run():
+        server, url, _ = await serve([[snapshot(100, 102)] * 50])
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        conn = FakeConnector({"bids": [[49.0, 1.0]], "asks": [[51.0, 1.0]]})
+        mids = []
+        task = asyncio.create_task(conn.stream_order_book(
+            "BTC/USDT", lambda book: mids.append(book.mid), ws_url=url,
+            max_retries=2, poll_interval=0.01, ws_retry_interval=0.1))
+        async with asyncio.timeout(5.0):
+            while not mids:
+                await asyncio.sleep(0.005)
+            # The feed comes back on the same address: the stream must leave REST polling for it.
+            server, _, _ = await serve([[snapshot(100, 102)] * 50], port)
+            while mids[-1] != 101.0:
+                await asyncio.sleep(0.005)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        server.close()
+        return mids, conn.polls
+
+    mids, polls = asyncio.run(run())
+    assert mids[0] == 50.0
+    assert mids[-1] == 101.0
+    assert polls >= 1
+
+
+class SnapshotFailsOnce(FakeConnector):
+    """Fetches a REST snapshot on the first message, which fails once like a venue timeout."""
+
+    def __init__(self):
+        super().__init__()
+        self.snapshot_failures = 1
+
+    async def _ws_apply(self, msg, book):
+        if self.snapshot_failures:
+            self.snapshot_failures -= 1
+            raise ccxt.RequestTimeout("snapshot timed out")
+        return await super()._ws_apply(msg, book)
+
+
+def test_ccxt_error_reconnects_instead_of_ending_the_stream():
+    async def run():
+        server, url, count = await serve([[snapshot(99, 101)], [snapshot(100, 102)]])
+        mids, resets = await collect(SnapshotFailsOnce(), url, 1)
+        server.close()
+        return mids, resets, count[0]
+
+    mids, resets, connections = asyncio.run(run())
+    assert mids[0] == 101.0
+    assert resets and connections >= 2
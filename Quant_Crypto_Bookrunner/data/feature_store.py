@@ -0,0 +1,251 @@
+"""Precomputed microstructure features, cached per dataset as columnar ``.npy`` arrays.
+
+Features are vectorized functions of a ``BookColumns`` series registered with
+``@feature``.  ``FeatureStore.features`` returns a lazy ``Features`` view of one
+dataset: each feature is computed on first access, saved and afterwards read
+back memory-mapped, so every back-test, sweep point or parameter generator over
+the same data shares one computation::
+
+    cache/features/<dataset key>/mid.3f9a1c2e.npy
+
+A file's name carries the feature's fingerprint: its ``version``, a hash of its
+code and the fingerprints of the features it depends on.  Changing a definition
+(or bumping ``version`` when only a constant it reads changed) gives a new
+fingerprint, so stale arrays are never read and are deleted when replaced.
+
+The dataset key is a content hash of the columns by default; pass ``key`` (e.g.
+``TickStore.dataset_key``) to skip hashing for recorded data.
+"""
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+import hashlib
+import os
+
+import numpy as np
+
+from .order_book import BookColumns
+
+FEATURES_ROOT = os.path.join("cache", "features")
+IMBALANCE_LEVELS = 5
+VOL_WINDOW = 100
+
+
+class Feature:
+    __slots__ = ("name", "fn", "version", "deps")
+
+    def __init__(self, name: str, fn: Callable, version: int, deps: Tuple[str, ...]):
+        self.name = name
+        self.fn = fn
+        self.version = version
+        self.deps = deps
+
+    def fingerprint(self) -> str:
+        h = hashlib.blake2b(digest_size=4)
+        h.update(str(self.version).encode())
+        _hash_code(h, self.fn.__code__)
+        for dep in self.deps:
+            h.update(FEATURES[dep].fingerprint().encode())
+        return h.hexdigest()
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):  # nested function / comprehension
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+
+FEATURES: Dict[str, Feature] = {}
+
+
+def feature(name: str, *, version: int = 1, deps: Iterable[str] = ()):
+    """Register ``fn(columns, features) -> np.ndarray`` (one value per tick) as ``name``.
+
+    ``features`` gives access to the features listed in ``deps``.
+    """
+    def register(fn):
+        FEATURES[name] = Feature(name, fn, version, tuple(deps))
+        return fn
+    return register
+
+
+# ------------- Definitions ------------- #
+@feature("mid")
+def _mid(c: BookColumns, f) -> np.ndarray:
+    return (c.bid + c.ask) / 2
+
+
+@feature("spread")
+def _spread(c: BookColumns, f) -> np.ndarray:
+    return c.ask - c.bid
+
+
+@feature("spread_bps", deps=("mid", "spread"))
+def _spread_bps(c: BookColumns, f) -> np.ndarray:
+    return f["spread"] / f["mid"] * 10_000
+
+
+@feature("microprice", deps=("mid",))
+def _microprice(c: BookColumns, f) -> np.ndarray:
+    # Same expression as BookrunnerStrategy.on_ticks_batch, so quotes stay bit-identical.
+    total = c.bid_size + c.ask_size
+    with np.errstate(invalid="ignore", divide="ignore"):
+        micro = (c.bid * c.ask_size + c.ask * c.bid_size) / total
+    return np.where(total == 0.0, f["mid"], micro)
+
+
+@feature("imbalance")
+def _imbalance(c: BookColumns, f) -> np.ndarray:
+    """``OrderBook.imbalance`` over the top ``IMBALANCE_LEVELS`` (top of book without depth)."""
+    if c.bids is not None:
+        bid_sz = c.bids[:, :IMBALANCE_LEVELS, 1].sum(axis=1)
+        ask_sz = c.asks[:, :IMBALANCE_LEVELS, 1].sum(axis=1)
+    else:
+        bid_sz, ask_sz = c.bid_size, c.ask_size
+    total = bid_sz + ask_sz
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, (bid_sz - ask_sz) / total, 0.0)
+
+
+@feature("log_return", deps=("mid",))
+def _log_return(c: BookColumns, f) -> np.ndarray:
+    out = np.zeros(len(c))
+    out[1:] = np.diff(np.log(f["mid"]))
+    return out
+
+
+@feature("realized_vol", deps=("log_return",))
+def _realized_vol(c: BookColumns, f) -> np.ndarray:
+    """Rolling std of ``log_return`` over the last ``VOL_WINDOW`` ticks (NaN until full)."""
+    r = f["log_return"]
+    out = np.full(len(r), np.nan)
+    if len(r) >= VOL_WINDOW:
+        windows = np.lib.stride_tricks.sliding_window_view(r, VOL_WINDOW)
+        out[VOL_WINDOW - 1:] = windows.std(axis=1)
+    return out
+
+
+@feature("ofi")
+def _ofi(c: BookColumns, f) -> np.ndarray:
+    """Top-of-book order-flow imbalance (Cont, Kukanov & Stoikov), the L2 proxy for trade flow.
+
+    Positive when bid size is added / ask size removed at the touch, i.e. buy pressure.
+    """
+    out = np.zeros(len(c))
+    if len(c) < 2:
+        return out
+    bid, ask, bsz, asz = c.bid, c.ask, c.bid_size, c.ask_size
+    out[1:] = (
+        np.where(bid[1:] >= bid[:-1], bsz[1:], 0.0) - np.where(bid[1:] <= bid[:-1], bsz[:-1], 0.0)
+        - np.where(ask[1:] <= ask[:-1], asz[1:], 0.0) + np.where(ask[1:] >= ask[:-1], asz[:-1], 0.0)
+    )
+    return out
+
+
+# ------------- Store ------------- #
+def dataset_key(columns: BookColumns) -> str:
+    """Content hash of every array in ``columns``."""
+    h = hashlib.blake2b(digest_size=10)
+    for name, arr in columns.arrays().items():
+        h.update(name.encode())
+        h.update(np.ascontiguousarray(arr).data)
+    return h.hexdigest()
+
+
+class FeatureStore:
+    def __init__(self, root: str = FEATURES_ROOT):
+        self.root = root
+
+    def features(self, columns: BookColumns, key: str | None = None) -> "Features":
+        """Lazy features of ``columns``; ``key`` names the dataset (default: a content hash)."""
+        return Features(self, columns, key or dataset_key(columns))
+
+    def _path(self, key: str, name: str) -> str:
+        return os.path.join(self.root, key, f"{name}.{FEATURES[name].fingerprint()}.npy")
+
+    def load(self, key: str, name: str) -> np.ndarray | None:
+        try:
+            return np.load(self._path(key, name), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, name: str, values: np.ndarray):
+        path = self._path(key, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, values)
+        os.replace(tmp, path)
+        # Drop arrays written by older definitions of this feature.
+        current = os.path.basename(path)
+        for entry in os.scandir(os.path.dirname(path)):
+            if entry.name.startswith(f"{name}.") and entry.name.endswith(".npy") and entry.name != current:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class Features:
+    """Dict-like, lazily computed features of one dataset (``features["mid"]``).
+
+    Arrays are read-only (memory-mapped once cached); ``between`` gives a view
+    of a tick range, e.g. one back-test batch.
+    """
+
+    def __init__(self, store: FeatureStore, columns: BookColumns, key: str):
+        self.store = store
+        self.columns = columns
+        self.key = key
+        self._loaded: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        values = self._loaded.get(name)
+        if values is None:
+            if name not in FEATURES:
+                raise KeyError(name)
+            values = self.store.load(self.key, name)
+            if values is None or len(values) != len(self.columns):
+                values = np.asarray(FEATURES[name].fn(self.columns, self), dtype=np.float64)
+                self.store.save(self.key, name, values)
+                values.flags.writeable = False
+            self._loaded[name] = values
+        return values
+
+    def __contains__(self, name: str) -> bool:
+        return name in FEATURES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FEATURES)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def compute(self, names: Iterable[str] | None = None) -> "Features":
+        """Make sure ``names`` (default: every registered feature) are cached."""
+        for name in names or FEATURES:
+            self[name]
+        return self
+
+    def between(self, start: int, stop: int) -> "FeatureSlice":
+        return FeatureSlice(self, start, stop)
+
+
+class FeatureSlice:
+    """Features of ticks ``[start, stop)`` of a ``Features`` dataset."""
+
+    def __init__(self, features: Features, start: int, stop: int):
+        self.features = features
+        self.start = start
+        self.stop = stop
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.features[name][self.start: self.stop]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.features
+
+    def __len__(self) -> int:
+        return self.stop - self.start
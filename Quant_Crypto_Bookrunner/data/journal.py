@@ -0,0 +1,252 @@
+"""Append-only binary journal of orders and fills with snapshot-based recovery.
+
+One journal per exchange lives in its own directory::
+
+    journal/binance/00000001.log
+    journal/binance/00000002.log
+    journal/binance/snapshot.json
+
+Every record is ``crc32, length`` followed by a fixed ``kind, symbol, asset,
+timestamp, price, qty`` body and a variable-length order id (order records keep
+the side in the asset slot).  Names are interned per segment by ``NAME`` records.  The hot path only packs
+bytes onto a queue; a writer thread group-commits the queue every
+``commit_interval`` seconds with a single write and fsync.
+
+Every ``snapshot_every`` records (and on open/close) the journal rotates to a new
+segment and writes ``snapshot.json`` with the state of every symbol, so recovery
+reads the snapshot plus at most one short tail regardless of journal history.
+Segments older than the snapshot are deleted once it is durable.
+A torn record left by a crash fails its CRC and ends replay of that segment.
+"""
+from collections import deque
+from typing import Any, Dict, List
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+HEAD = struct.Struct("<IH")  # crc32 of body, body length
+BODY = struct.Struct("<BHHqdd")  # kind, symbol id, asset id, timestamp ms, price, qty
+NAME, ORDER_NEW, ORDER_CANCEL, FILL, ORDER_FILLED = 0, 1, 2, 3, 4
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {"inventory": {}, "tick_count": 0, "orders": {}}
+
+
+class Journal:
+    """Order/fill journal for one exchange; call from a single (event-loop) thread."""
+
+    def __init__(self, root: str, *, commit_interval: float = 0.005, snapshot_every: int = 100_000,
+                 fsync: bool = True):
+        self.root = root
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        os.makedirs(root, exist_ok=True)
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.strategies: Dict[str, Any] = {}
+        self.segment = self._recover()
+        self._names: Dict[str, int] = {}
+        self._since_snapshot = 0
+        self._queue: deque = deque()
+        self._closed = False
+        self._file = None
+        # Start from a fresh segment and snapshot, so a torn tail is never appended to.
+        self.segment += 1
+        self._open_segment(self.segment)
+        self._write_snapshot(self.segment, self._snapshot_state())
+        self._thread = threading.Thread(target=self._writer, name=f"journal-{os.path.basename(root)}", daemon=True)
+        self._thread.start()
+
+    # ------------- Strategy state ------------- #
+    def state_for(self, symbol: str) -> Dict[str, Any]:
+        return self.state.setdefault(symbol, _empty_state())
+
+    def register(self, symbol: str, strategy):
+        """Snapshots take ``symbol``'s inventory and tick count from ``strategy`` from now on."""
+        self.strategies[symbol] = strategy
+
+    def open_orders(self, symbol: str) -> List[Dict[str, Any]]:
+        """Orders last seen resting for ``symbol`` (one per side at most)."""
+        return list(self.state_for(symbol)["orders"].values())
+
+    # ------------- Hot path ------------- #
+    def order_new(self, symbol: str, order_id: str, side: str, price: float, amount: float):
+        self.state_for(symbol)["orders"][side] = {"id": order_id, "side": side, "price": price, "amount": amount}
+        self._append(ORDER_NEW, symbol, side, price, amount if side == "buy" else -amount, order_id)
+
+    def order_cancel(self, symbol: str, order_id: str):
+        self._close_order(symbol, order_id)
+        self._append(ORDER_CANCEL, symbol, "", 0.0, 0.0, order_id)
+
+    def order_filled(self, symbol: str, order_id: str):
+        """Log that ``order_id`` left the book fully filled (its fills are logged by ``fill``)."""
+        self._close_order(symbol, order_id)
+        self._append(ORDER_FILLED, symbol, "", 0.0, 0.0, order_id)
+
+    def _close_order(self, symbol: str, order_id: str):
+        orders = self.state_for(symbol)["orders"]
+        for side, order in list(orders.items()):
+            if order["id"] == order_id:
+                del orders[side]
+
+    def fill(self, symbol: str, asset: str, delta: float, price: float = 0.0, order_id: str = "",
+             timestamp: int | None = None):
+        """Log an inventory change of ``delta`` units of ``asset`` (apply it to the strategy first)."""
+        self._append(FILL, symbol, asset, price, delta, order_id, timestamp)
+
+    def _append(self, kind: int, symbol: str, asset: str, price: float, qty: float, order_id: str = "",
+                timestamp: int | None = None):
+        ts = int(timestamp if timestamp is not None else time.time() * 1000)
+        body = BODY.pack(kind, self._name(symbol), self._name(asset), ts, price or 0.0, qty) + order_id.encode()
+        self._queue.append(HEAD.pack(zlib.crc32(body), len(body)) + body)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _name(self, name: str) -> int:
+        ident = self._names.get(name)
+        if ident is None:
+            ident = self._names[name] = len(self._names)
+            body = BODY.pack(NAME, ident, 0, 0, 0.0, 0.0) + name.encode()
+            self._queue.append(HEAD.pack(zlib.crc32(body), len(body)) + body)
+        return ident
+
+    # ------------- Snapshots & lifecycle ------------- #
+    def snapshot(self):
+        """Rotate to a new segment and persist the current state once queued records are durable."""
+        self.segment += 1
+        self._names = {}
+        self._since_snapshot = 0
+        self._queue.append((self.segment, self._snapshot_state()))
+
+    def flush(self):
+        """Block until everything logged so far is written (and fsynced)."""
+        done = threading.Event()
+        self._queue.append(done)
+        while not done.wait(1.0):
+            if not self._thread.is_alive():
+                raise RuntimeError(f"journal writer for {self.root} has stopped")
+
+    def close(self):
+        if self._closed:
+            return
+        self.snapshot()
+        self.flush()
+        self._closed = True
+        self._thread.join()
+        self._file.close()
+
+    def _snapshot_state(self) -> Dict[str, Dict[str, Any]]:
+        state = {}
+        for symbol, entry in self.state.items():
+            strategy = self.strategies.get(symbol)
+            state[symbol] = {
+                "inventory": dict(strategy.inventory) if strategy is not None else entry["inventory"],
+                "tick_count": strategy.tick_count if strategy is not None else entry["tick_count"],
+                "orders": dict(entry["orders"]),
+            }
+        return state
+
+    # ------------- Writer thread ------------- #
+    def _writer(self):
+        queue = self._queue
+        while not self._closed or queue:
+            time.sleep(self.commit_interval)
+            chunks: List[bytes] = []
+            while queue:
+                item = queue.popleft()
+                if isinstance(item, bytes):
+                    chunks.append(item)
+                    continue
+                self._commit(chunks)
+                chunks = []
+                if isinstance(item, threading.Event):
+                    item.set()
+                else:
+                    segment, state = item
+                    self._open_segment(segment)
+                    self._write_snapshot(segment, state)
+            self._commit(chunks)
+
+    def _commit(self, chunks: List[bytes]):
+        if not chunks:
+            return
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"{segment:08d}.log")
+
+    def _open_segment(self, segment: int):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(segment), "ab")
+
+    def _write_snapshot(self, segment: int, state: Dict[str, Dict[str, Any]]):
+        path = os.path.join(self.root, "snapshot.json")
+        with open(path + ".tmp", "w") as fh:
+            json.dump({"segment": segment, "state": state}, fh)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        os.replace(path + ".tmp", path)
+        # The snapshot now covers every earlier segment.
+        for old in self._segments():
+            if old < segment:
+                try:
+                    os.remove(self._segment_path(old))
+                except OSError:
+                    pass
+
+    # ------------- Recovery ------------- #
+    def _segments(self) -> List[int]:
+        return sorted(int(f[:-4]) for f in os.listdir(self.root) if f.endswith(".log") and f[:-4].isdigit())
+
+    def _recover(self) -> int:
+        """Load the last snapshot and replay later segments; return the last segment number."""
+        segments = self._segments()
+        start = 0
+        path = os.path.join(self.root, "snapshot.json")
+        if os.path.exists(path):
+            with open(path) as fh:
+                snap = json.load(fh)
+            start = snap["segment"]
+            self.state = snap["state"]
+        for segment in segments:
+            if segment >= start:
+                self._replay(segment)
+        return max(segments + [start])
+
+    def _replay(self, segment: int):
+        with open(self._segment_path(segment), "rb") as fh:
+            data = fh.read()
+        names: Dict[int, str] = {}
+        pos, end = 0, len(data)
+        while pos + HEAD.size <= end:
+            crc, length = HEAD.unpack_from(data, pos)
+            body = data[pos + HEAD.size: pos + HEAD.size + length]
+            if len(body) < BODY.size or zlib.crc32(body) != crc:
+                break  # torn write at the crash point
+            pos += HEAD.size + length
+            kind, sym_id, asset_id, ts, price, qty = BODY.unpack_from(body)
+            tail = body[BODY.size:].decode()
+            if kind == NAME:
+                names[sym_id] = tail
+                continue
+            state = self.state_for(names[sym_id])
+            if kind == FILL:
+                asset = names[asset_id]
+                state["inventory"][asset] = state["inventory"].get(asset, 0.0) + qty
+            elif kind == ORDER_NEW:
+                side = names[asset_id]
+                state["orders"][side] = {"id": tail, "side": side, "price": price, "amount": abs(qty)}
+            elif kind in (ORDER_CANCEL, ORDER_FILLED):
+                for side, order in list(state["orders"].items()):
+                    if order["id"] == tail:
+                        del state["orders"][side]
@@ -0,0 +1,335 @@
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+
+class OrderBook:
+    """Fixed-capacity L2 book backed by preallocated NumPy arrays.
+
+    Each side is a ``(capacity, 2)`` array of ``[price, size]`` rows kept best-first
+    (bids descending, asks ascending).  ``book["bids"]`` returns a read-only,
+    zero-copy view of the populated rows, so code written against ccxt dicts
+    (``book["bids"][0][0]``) keeps working.  Views alias the live book: copy them
+    if they must survive the next update.
+
+    When a side is full, inserting a better level drops the worst one.
+    """
+
+    __slots__ = ("symbol", "capacity", "timestamp", "sequence", "_bids", "_asks", "_n_bids", "_n_asks")
+
+    def __init__(self, symbol: str = "", capacity: int = 50):
+        self.symbol = symbol
+        self.capacity = capacity
+        self.timestamp: int | None = None
+        self.sequence: int | None = None
+        self._bids = np.zeros((capacity, 2), dtype=np.float64)
+        self._asks = np.zeros((capacity, 2), dtype=np.float64)
+        self._n_bids = 0
+        self._n_asks = 0
+
+    @classmethod
+    def from_ccxt(cls, book: Dict[str, Any], capacity: int | None = None) -> "OrderBook":
+        """Build from a ccxt ``fetch_order_book`` result."""
+        capacity = capacity or max(len(book["bids"]), len(book["asks"]), 1)
+        ob = cls(book.get("symbol") or "", capacity)
+        ob.reset(book["bids"], book["asks"], book.get("nonce"), book.get("timestamp"))
+        return ob
+
+    @classmethod
+    def wrap(cls, symbol: str, bids: np.ndarray, asks: np.ndarray, n_bids: int, n_asks: int,
+             timestamp: int | None = None, sequence: int | None = None) -> "OrderBook":
+        """Book over existing ``(capacity, 2)`` arrays without copying (e.g. shared memory)."""
+        ob = cls.__new__(cls)
+        ob.symbol = symbol
+        ob.capacity = len(bids)
+        ob._bids, ob._asks = bids, asks
+        ob._n_bids, ob._n_asks = n_bids, n_asks
+        ob.timestamp, ob.sequence = timestamp, sequence
+        return ob
+
+    # ------------- Updates ------------- #
+    def reset(self, bids, asks, sequence: int | None = None, timestamp: int | None = None):
+        """Replace both sides from ``[[price, size], ...]`` level lists."""
+        self._n_bids = self._load(self._bids, bids, reverse=True)
+        self._n_asks = self._load(self._asks, asks, reverse=False)
+        self.sequence = sequence
+        self.timestamp = timestamp
+
+    def _load(self, arr: np.ndarray, levels, reverse: bool) -> int:
+        rows = np.asarray([lvl[:2] for lvl in levels], dtype=np.float64).reshape(-1, 2)
+        rows = rows[rows[:, 1] > 0]
+        order = np.argsort(rows[:, 0], kind="stable")
+        rows = rows[order[::-1] if reverse else order][: self.capacity]
+        arr[: len(rows)] = rows
+        return len(rows)
+
+    def apply_delta(self, side: str, price: float, size: float) -> None:
+        """Set the size at ``price`` on ``side`` ("bids"/"asks") in place; zero removes the level."""
+        price, size = float(price), float(size)
+        if side == "bids":
+            arr, n = self._bids, self._n_bids
+            # Bids are descending: search the reversed (ascending) price column.
+            i = n - int(np.searchsorted(arr[:n, 0][::-1], price, side="right"))
+        else:
+            arr, n = self._asks, self._n_asks
+            i = int(np.searchsorted(arr[:n, 0], price, side="left"))
+
+        if i < n and arr[i, 0] == price:
+            if size > 0.0:
+                arr[i, 1] = size
+                return
+            arr[i : n - 1] = arr[i + 1 : n]
+            n -= 1
+        elif size > 0.0 and i < self.capacity:
+            last = min(n, self.capacity - 1)
+            arr[i + 1 : last + 1] = arr[i:last]
+            arr[i, 0] = price
+            arr[i, 1] = size
+            n = last + 1
+        else:
+            return
+
+        if side == "bids":
+            self._n_bids = n
+        else:
+            self._n_asks = n
+
+    def apply_deltas(self, side: str, levels: Iterable) -> None:
+        """Apply ``[(price, size), ...]`` to one side."""
+        for price, size, *_ in levels:
+            self.apply_delta(side, price, size)
+
+    def truncate(self, depth: int) -> None:
+        """Keep at most the best ``depth`` levels of each side."""
+        self._n_bids = min(self._n_bids, depth)
+        self._n_asks = min(self._n_asks, depth)
+
+    # ------------- Views ------------- #
+    @property
+    def bids(self) -> np.ndarray:
+        view = self._bids[: self._n_bids]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def asks(self) -> np.ndarray:
+        view = self._asks[: self._n_asks]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, key: str):
+        if key == "bids":
+            return self.bids
+        if key == "asks":
+            return self.asks
+        if key == "nonce":
+            return self.sequence
+        if key in ("symbol", "timestamp"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_ccxt(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "bids": self.bids.tolist(),
+            "asks": self.asks.tolist(),
+            "timestamp": self.timestamp,
+            "nonce": self.sequence,
+        }
+
+    def copy(self) -> "OrderBook":
+        ob = OrderBook(self.symbol, self.capacity)
+        ob._bids[:] = self._bids
+        ob._asks[:] = self._asks
+        ob._n_bids, ob._n_asks = self._n_bids, self._n_asks
+        ob.timestamp, ob.sequence = self.timestamp, self.sequence
+        return ob
+
+    # ------------- Queries ------------- #
+    @property
+    def best_bid(self) -> float:
+        return float(self._bids[0, 0]) if self._n_bids else float("nan")
+
+    @property
+    def best_ask(self) -> float:
+        return float(self._asks[0, 0]) if self._n_asks else float("nan")
+
+    @property
+    def mid(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self) -> float:
+        return self.best_ask - self.best_bid
+
+    @property
+    def microprice(self) -> float:
+        """Size-weighted mid: leans toward the side with less resting size."""
+        bid, bid_sz = self._bids[0] if self._n_bids else (np.nan, 0.0)
+        ask, ask_sz = self._asks[0] if self._n_asks else (np.nan, 0.0)
+        total = bid_sz + ask_sz
+        if total == 0.0:
+            return self.mid
+        return float((bid * ask_sz + ask * bid_sz) / total)
+
+    def is_crossed(self) -> bool:
+        return bool(self._n_bids and self._n_asks) and self._bids[0, 0] >= self._asks[0, 0]
+
+    def depth_within_bps(self, bps: float) -> Tuple[float, float]:
+        """Total (bid, ask) size resting within ``bps`` basis points of mid."""
+        mid = self.mid
+        bids, asks = self._bids[: self._n_bids], self._asks[: self._n_asks]
+        bid_depth = bids[:, 1][bids[:, 0] >= mid * (1 - bps / 10_000)].sum()
+        ask_depth = asks[:, 1][asks[:, 0] <= mid * (1 + bps / 10_000)].sum()
+        return float(bid_depth), float(ask_depth)
+
+    def imbalance(self, levels: int = 5) -> float:
+        """(bid size - ask size) / total over the top ``levels`` levels, in [-1, 1]."""
+        bid_sz = self._bids[: min(levels, self._n_bids), 1].sum()
+        ask_sz = self._asks[: min(levels, self._n_asks), 1].sum()
+        total = bid_sz + ask_sz
+        return float((bid_sz - ask_sz) / total) if total else 0.0
+
+    def vwap(self, side: str, size: float) -> float:
+        """Average price to fill ``size`` by a ``side`` ("buy"/"sell") market order.
+
+        Returns NaN if the book does not hold enough size.
+        """
+        levels = self._asks[: self._n_asks] if side == "buy" else self._bids[: self._n_bids]
+        cum = np.cumsum(levels[:, 1])
+        k = int(np.searchsorted(cum, size, side="left"))
+        if k >= len(levels):
+            return float("nan")
+        filled_before = cum[k - 1] if k else 0.0
+        notional = (levels[:k, 0] * levels[:k, 1]).sum() + levels[k, 0] * (size - filled_before)
+        return float(notional / size)
+
+    def __len__(self) -> int:
+        return max(self._n_bids, self._n_asks)
+
+    def __repr__(self) -> str:
+        return f"OrderBook({self.symbol!r}, bid={self.best_bid}, ask={self.best_ask}, levels={len(self)})"
+
+
+def top_of_book(book) -> Tuple[float, float]:
+    """Return (best bid, best ask) from an ``OrderBook`` (or ``ConsolidatedBook``) or a ccxt-style dict."""
+    if isinstance(book, OrderBook) or hasattr(book, "best_bid"):
+        return book.best_bid, book.best_ask
+    return book["bids"][0][0], book["asks"][0][0]
+
+
+def microprice(book) -> float:
+    """``OrderBook.microprice`` for any book ``top_of_book`` accepts."""
+    if isinstance(book, OrderBook) or hasattr(book, "microprice"):
+        return book.microprice
+    (bid, bid_sz), (ask, ask_sz) = book["bids"][0][:2], book["asks"][0][:2]
+    total = bid_sz + ask_sz
+    if total == 0.0:
+        return (bid + ask) / 2
+    return float((bid * ask_sz + ask * bid_sz) / total)
+
+
+class BookColumns:
+    """Columnar order-book series: one NumPy array per field, aligned by tick.
+
+    ``bids``/``asks`` optionally carry full depth as ``(n, levels, 2)`` arrays of
+    ``[price, size]`` (missing levels are NaN/0); the top-of-book fields are then
+    views into them.
+    """
+
+    FIELDS = ("timestamp", "bid", "ask", "bid_size", "ask_size")
+    __slots__ = FIELDS + ("bids", "asks")
+
+    def __init__(self, timestamp, bid, ask, bid_size, ask_size, bids=None, asks=None):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.bid = np.asarray(bid, dtype=np.float64)
+        self.ask = np.asarray(ask, dtype=np.float64)
+        self.bid_size = np.asarray(bid_size, dtype=np.float64)
+        self.ask_size = np.asarray(ask_size, dtype=np.float64)
+        self.bids = bids
+        self.asks = asks
+
+    @classmethod
+    def from_depth(cls, timestamp, bids: np.ndarray, asks: np.ndarray) -> "BookColumns":
+        return cls(timestamp, bids[:, 0, 0], asks[:, 0, 0], bids[:, 0, 1], asks[:, 0, 1], bids, asks)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable, depth: int = 0) -> "BookColumns":
+        """Load ccxt-style dicts and/or ``OrderBook`` objects in a single pass.
+
+        With ``depth > 0`` the top ``depth`` levels of each side are kept as well.
+        """
+        if depth:
+            ts, bids, asks = [], [], []
+            for s in snapshots:
+                ts.append(s.get("timestamp") or 0)
+                bids.append(_pad_levels(s["bids"], depth))
+                asks.append(_pad_levels(s["asks"], depth))
+            empty = np.empty((0, depth, 2))
+            return cls.from_depth(ts, np.asarray(bids) if bids else empty, np.asarray(asks) if asks else empty)
+
+        rows = [
+            (s.get("timestamp") or 0, *s["bids"][0][:2], *s["asks"][0][:2])
+            for s in snapshots
+        ]
+        if not rows:
+            return cls([], [], [], [], [])
+        arr = np.asarray(rows, dtype=np.float64)
+        return cls(arr[:, 0].astype(np.int64), arr[:, 1], arr[:, 3], arr[:, 2], arr[:, 4])
+
+    @classmethod
+    def concat(cls, parts: Iterable["BookColumns"]) -> "BookColumns":
+        parts = list(parts)
+        if parts and all(p.bids is not None for p in parts):
+            return cls.from_depth(
+                np.concatenate([p.timestamp for p in parts]),
+                np.concatenate([p.bids for p in parts]),
+                np.concatenate([p.asks for p in parts]),
+            )
+        return cls(*(np.concatenate([getattr(p, f) for p in parts]) for f in cls.FIELDS))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """All populated arrays by field name."""
+        return {f: getattr(self, f) for f in self.__slots__ if getattr(self, f) is not None}
+
+    def iter_snapshots(self, symbol: str = "") -> Iterator:
+        """Yield one snapshot per row: an ``OrderBook`` when depth is stored, else a top-of-book dict."""
+        if self.bids is not None:
+            for i in range(len(self)):
+                book = OrderBook(symbol, self.bids.shape[1])
+                book.reset(self.bids[i], self.asks[i], timestamp=int(self.timestamp[i]))
+                yield book
+            return
+        rows = zip(
+            self.timestamp.tolist(), self.bid.tolist(), self.ask.tolist(),
+            self.bid_size.tolist(), self.ask_size.tolist(),
+        )
+        for ts, bid, ask, bid_size, ask_size in rows:
+            yield {"symbol": symbol, "timestamp": ts, "bids": [[bid, bid_size]], "asks": [[ask, ask_size]]}
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.bid + self.ask) / 2
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, idx) -> "BookColumns":
+        if self.bids is not None:
+            return BookColumns.from_depth(self.timestamp[idx], self.bids[idx], self.asks[idx])
+        return BookColumns(*(getattr(self, f)[idx] for f in self.FIELDS))
+
+
+def _pad_levels(levels, depth: int) -> np.ndarray:
+    out = np.zeros((depth, 2))
+    out[:, 0] = np.nan
+    # Levels may carry extra fields (ccxt's ``[price, amount, timestamp]``): keep price and amount.
+    rows = np.asarray([lvl[:2] for lvl in levels[:depth]], dtype=np.float64).reshape(-1, 2)
+    out[: len(rows)] = rows
+    return out
@@ -0,0 +1,88 @@
+"""SQLite store of research-paper metadata, deduplicated by DOI / URL per query.
+
+Each (query, source) pair also records when it was last synced, so callers can
+serve papers straight from disk while fresh and fetch only newer results once
+the entry is older than the TTL.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List
+import os
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    query TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    url TEXT,
+    doi TEXT,
+    published TEXT,
+    source TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (query, key)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    query TEXT NOT NULL,
+    source TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (query, source)
+);
+"""
+
+FIELDS = ("title", "summary", "url", "doi", "published", "source")
+
+
+def paper_key(paper: Dict) -> str:
+    """Dedup key: lower-cased DOI, else URL without scheme/trailing slash, else title."""
+    doi = (paper.get("doi") or "").strip().lower()
+    if doi:
+        return "doi:" + doi.removeprefix("https://doi.org/")
+    url = (paper.get("url") or "").strip().lower()
+    if url:
+        return "url:" + url.split("://", 1)[-1].rstrip("/")
+    return "title:" + " ".join((paper.get("title") or "").lower().split())
+
+
+class PaperStore:
+    def __init__(self, path: str = os.path.join("cache", "research.sqlite")):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def papers(self, query: str, limit: int | None = None) -> List[Dict]:
+        """Stored papers for ``query``, newest publication first."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(FIELDS)} FROM papers WHERE query = ? "
+            "ORDER BY published IS NULL, published DESC, fetched_at DESC LIMIT ?",
+            (query, -1 if limit is None else limit),
+        )
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def count(self, query: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM papers WHERE query = ?", (query,)).fetchone()[0]
+
+    def last_sync(self, query: str, source: str) -> datetime | None:
+        row = self.conn.execute(
+            "SELECT synced_at FROM syncs WHERE query = ? AND source = ?", (query, source)
+        ).fetchone()
+        return datetime.fromtimestamp(row[0], tz=timezone.utc) if row else None
+
+    def add(self, query: str, source: str, papers: Iterable[Dict], synced_at: datetime):
+        """Upsert ``papers`` (titled ones only) and record the sync in one transaction."""
+        now = datetime.now(timezone.utc).timestamp()
+        rows = [(query, paper_key(p), *(p.get(f) for f in FIELDS), now) for p in papers if p.get("title")]
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO papers (query, key, {', '.join(FIELDS)}, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO syncs (query, source, synced_at) VALUES (?, ?, ?)",
+                (query, source, synced_at.timestamp()),
+            )
+
+    def close(self):
+        self.conn.close()
@@ -1,67 +1,134 @@
-from typing import List, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
 import concurrent.futures
-import requests
+import threading
+
+from .paper_store import PaperStore
 from .research_scraper import fetch_arxiv_papers
 
 SEMANTIC_SCHOLAR_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
 CROSSREF_URL = "https://api.crossref.org/works"
 
+# Seconds before a slow source is abandoned.
+SOURCE_TIMEOUTS = {"arXiv": 20.0, "SemanticScholar": 10.0, "CrossRef": 10.0}
+RESEARCH_TTL = timedelta(hours=24)
+
+_local = threading.local()
+
+
+def _session():
+    """Pooled HTTP session, one per worker thread (requests is imported lazily)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        session = _local.session = requests.Session()
+    return session
+
 
-def _fetch_semantic_scholar(query: str, limit: int = 50) -> List[Dict]:
-    params = {"query": query, "limit": limit, "fields": "title,abstract,url,year"}
-    r = requests.get(SEMANTIC_SCHOLAR_URL, params=params, timeout=15)
+def _fetch_semantic_scholar(query: str, limit: int = 50, since: datetime | None = None) -> List[Dict]:
+    params = {"query": query, "limit": limit, "fields": "title,abstract,url,year,externalIds,publicationDate"}
+    if since is not None:
+        params["publicationDateOrYear"] = f"{since:%Y-%m-%d}:"
+    r = _session().get(SEMANTIC_SCHOLAR_URL, params=params, timeout=SOURCE_TIMEOUTS["SemanticScholar"])
     r.raise_for_status()
     data = r.json().get("data", [])
     return [
         {
-            "title": p.get("title"),
+            "title": p.get("title") or "",
             "summary": p.get("abstract"),
             "url": p.get("url"),
+            "doi": (p.get("externalIds") or {}).get("DOI"),
+            "published": p.get("publicationDate") or (str(p["year"]) if p.get("year") else None),
             "source": "SemanticScholar",
         }
         for p in data
     ]
 
 
-def _fetch_crossref(query: str, limit: int = 50) -> List[Dict]:
+def _fetch_crossref(query: str, limit: int = 50, since: datetime | None = None) -> List[Dict]:
     params = {"query": query, "rows": limit}
-    r = requests.get(CROSSREF_URL, params=params, timeout=15)
+    if since is not None:
+        params["filter"] = f"from-index-date:{since:%Y-%m-%d}"
+    r = _session().get(CROSSREF_URL, params=params, timeout=SOURCE_TIMEOUTS["CrossRef"])
     r.raise_for_status()
     items = r.json().get("message", {}).get("items", [])
     res = []
     for it in items:
+        date_parts = (it.get("published") or {}).get("date-parts") or [[]]
         res.append(
             {
-                "title": it.get("title", [""])[0],
+                "title": (it.get("title") or [""])[0],
                 "summary": it.get("abstract", ""),
                 "url": it.get("URL"),
+                "doi": it.get("DOI"),
+                "published": "-".join(f"{part:02d}" for part in date_parts[0] if part) or None,
                 "source": "CrossRef",
             }
         )
     return res
 
 
-def gather_research(query: str, min_results: int = 120) -> List[Dict]:
-    """Fetch research paper metadata from multiple sources until threshold reached."""
-    results: List[Dict] = []
+def _sources(query: str) -> Dict[str, tuple[Callable[..., List[Dict]], Dict]]:
+    return {
+        "arXiv": (fetch_arxiv_papers, {"query": query, "max_results": 50}),
+        "SemanticScholar": (_fetch_semantic_scholar, {"query": query, "limit": 70}),
+        "CrossRef": (_fetch_crossref, {"query": query, "limit": 70}),
+    }
 
-    # Prepare tasks
-    tasks = [
-        (fetch_arxiv_papers, {"query": query, "max_results": 50}),
-        (_fetch_semantic_scholar, {"query": query, "limit": 70}),
-        (_fetch_crossref, {"query": query, "limit": 70}),
-    ]
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as pool:
-        futures = [pool.submit(func, **kwargs) for func, kwargs in tasks]
-        for fut in concurrent.futures.as_completed(futures):
-            results.extend(fut.result())
-            if len(results) >= min_results:
+
+def gather_research(query: str, min_results: int = 120, *, store: PaperStore | None = None,
+                    ttl: timedelta = RESEARCH_TTL, refresh: bool = False) -> List[Dict]:
+    """Return up to ``min_results`` papers for ``query`` from the local store, syncing stale sources.
+
+    Papers are kept in a ``PaperStore`` deduplicated by DOI/URL.  Sources synced within
+    ``ttl`` are not contacted; stale ones are queried concurrently for results newer
+    than their last sync.  When the store was short of papers, the remaining fetches
+    are cancelled as soon as it holds ``min_results``; any source still running is
+    abandoned after its ``SOURCE_TIMEOUTS`` entry.
+    """
+    own_store = store is None
+    store = store or PaperStore()
+    try:
+        now = datetime.now(timezone.utc)
+        last = {name: None if refresh else store.last_sync(query, name) for name in _sources(query)}
+        stale = [name for name, synced in last.items() if synced is None or now - synced > ttl]
+        if stale:
+            # Only a store that is short of papers cuts the sync short; otherwise let
+            # every stale source catch up on what is new.
+            short = store.count(query) < min_results
+            _sync(query, store, stale, last, now, min_results if short else None)
+        return store.papers(query, min_results)
+    finally:
+        if own_store:
+            store.close()
+
+
+def _sync(query: str, store: PaperStore, names: List[str], last: Dict, now: datetime, stop_at: int | None):
+    sources = _sources(query)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(names))
+    futures = {}
+    for name in names:
+        func, kwargs = sources[name]
+        futures[pool.submit(func, since=last[name], **kwargs)] = name
+    try:
+        for fut in concurrent.futures.as_completed(futures, timeout=max(SOURCE_TIMEOUTS[n] for n in names)):
+            name = futures[fut]
+            try:
+                store.add(query, name, fut.result(), synced_at=now)
+            except Exception as exc:
+                print(f"[Research] {name} failed:", exc)
+                continue
+            if stop_at is not None and store.count(query) >= stop_at:
                 break
-    return results[:min_results]
+    except concurrent.futures.TimeoutError:
+        print("[Research] gave up on:", ", ".join(futures[f] for f in futures if not f.done()))
+    finally:
+        # Don't wait for sources we no longer need; they stay stale and sync next time.
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
     papers = gather_research("crypto market making", min_results=120)
     print(f"Fetched {len(papers)} papers")
     for p in papers[:5]:
-        print(f"{p['title']} ({p['source']}) -> {p['url']}")
\ No newline at end of file
+        print(f"{p['title']} ({p['source']}) -> {p['url']}")
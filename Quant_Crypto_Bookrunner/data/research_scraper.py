@@ -1,17 +1,42 @@
-from typing import List, Tuple
-import arxiv
+from datetime import datetime
+from typing import Dict, List
 
 ARXIV_QUERY = "cryptocurrency market making OR order book dynamics"
 
+_CLIENT = None
+
+
+def _client():
+    # arxiv is imported on first use so cached research runs never pay for it.
+    global _CLIENT
+    if _CLIENT is None:
+        import arxiv
+        _CLIENT = arxiv.Client(page_size=100, delay_seconds=3.0, num_retries=2)
+    return _CLIENT
+
+
+def fetch_arxiv_papers(query: str = ARXIV_QUERY, max_results: int = 20, since: datetime | None = None) -> List[Dict]:
+    """Return recent arXiv papers matching ``query`` as ``title/summary/url/doi/published/source`` dicts.
+
+    Results come newest first; with ``since`` only papers submitted after it are returned.
+    """
+    import arxiv
 
-def fetch_arxiv_papers(query: str = ARXIV_QUERY, max_results: int = 20) -> List[Tuple[str, str, str]]:
-    """Return list of (title, summary, url) for recent arXiv papers matching query."""
     search = arxiv.Search(query=query, max_results=max_results, sort_by=arxiv.SortCriterion.SubmittedDate)
     papers = []
-    for result in search.results():
-        papers.append((result.title, result.summary, result.entry_id))
+    for result in _client().results(search):
+        if since is not None and result.published <= since:
+            break
+        papers.append({
+            "title": result.title,
+            "summary": result.summary,
+            "url": result.entry_id,
+            "doi": result.doi,
+            "published": result.published.strftime("%Y-%m-%d"),
+            "source": "arXiv",
+        })
     return papers
 
 if __name__ == "__main__":
-    for title, _, url in fetch_arxiv_papers(max_results=5):
-        print(f"{title} -> {url}")
\ No newline at end of file
+    for paper in fetch_arxiv_papers(max_results=5):
+        print(f"{paper['title']} -> {paper['url']}")
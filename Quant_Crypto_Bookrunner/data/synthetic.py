@@ -0,0 +1,130 @@
+"""Seeded synthetic market data for benchmarks, demos and offline runs.
+
+Everything here is reproducible from ``seed``: the same arguments always give
+bit-identical output, so benchmark results are comparable across commits.
+
+* ``random_walk_mid``   - log-normal random-walk mid prices.
+* ``book_columns``      - ``BookColumns`` series with tick-rounded prices, a
+  variable spread, log-normal sizes and optionally full depth.
+* ``book_diffs``        - an initial snapshot plus an L2 diff stream
+  (``(side, price, size)`` updates, size 0 deletes) like a venue WebSocket feed.
+* ``correlated_closes`` - daily close series for several assets with a common
+  correlation, for ``RiskEngine.from_bars``.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .order_book import BookColumns
+
+START_MS = 1_700_000_000_000
+
+
+def random_walk_mid(n: int, *, start: float = 30_000.0, vol_bps: float = 1.0, seed: int = 0) -> np.ndarray:
+    """``n`` mids following a driftless log random walk with ``vol_bps`` per step."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, vol_bps / 10_000, n)
+    steps[0] = 0.0
+    return start * np.exp(np.cumsum(steps))
+
+
+def _sizes(rng: np.random.Generator, shape) -> np.ndarray:
+    return np.round(rng.lognormal(-0.5, 0.8, shape), 4) + 0.0001
+
+
+def _level_offsets(rng: np.random.Generator, n: int, depth: int) -> np.ndarray:
+    gaps = rng.integers(1, 4, (n, depth))
+    gaps[:, 0] = 0
+    return np.cumsum(gaps, axis=1)
+
+
+def book_columns(n: int, *, depth: int = 0, start: float = 30_000.0, vol_bps: float = 1.0,
+                 tick_size: float = 0.01, interval_ms: int = 100, seed: int = 0) -> BookColumns:
+    """``n`` book snapshots ``interval_ms`` apart; ``depth > 0`` adds that many levels per side."""
+    rng = np.random.default_rng(seed)
+    mid = random_walk_mid(n, start=start, vol_bps=vol_bps, seed=seed)
+    # Spread of 1 tick most of the time, occasionally a few more.
+    half_ticks = rng.geometric(0.6, n)
+    bid = np.floor(mid / tick_size - half_ticks / 2) * tick_size
+    ask = bid + half_ticks * tick_size
+    timestamp = START_MS + np.arange(n, dtype=np.int64) * interval_ms
+    if not depth:
+        return BookColumns(timestamp, bid, ask, _sizes(rng, n), _sizes(rng, n))
+    # Levels further out are spaced 1-3 ticks apart and hold more size.
+    bids = np.empty((n, depth, 2))
+    asks = np.empty((n, depth, 2))
+    bids[:, :, 0] = bid[:, None] - _level_offsets(rng, n, depth) * tick_size
+    asks[:, :, 0] = ask[:, None] + _level_offsets(rng, n, depth) * tick_size
+    growth = 1 + np.arange(depth) / 4
+    bids[:, :, 1] = _sizes(rng, (n, depth)) * growth
+    asks[:, :, 1] = _sizes(rng, (n, depth)) * growth
+    return BookColumns.from_depth(timestamp, bids, asks)
+
+
+def book_diffs(n: int, *, depth: int = 20, start: float = 30_000.0, vol_bps: float = 0.01,
+               tick_size: float = 0.01, seed: int = 0) -> Tuple[Dict, List[Tuple[str, float, float]]]:
+    """Initial snapshot (ccxt-style dict) and ``n`` L2 updates that keep ~``depth`` levels per side.
+
+    Most updates change the size of an existing level; the rest add a level near
+    the (random-walking) mid or delete the touch or the back of the book, keeping
+    each side close to ``depth`` levels.  Levels the other side crosses are
+    deleted first, so the book never crosses.
+    """
+    rng = np.random.default_rng(seed)
+    tick = lambda price: round(round(price / tick_size) * tick_size, 10)  # noqa: E731
+    mid = start
+    bids = {tick(mid - tick_size * (i + 1)): float(s) for i, s in enumerate(_sizes(rng, depth))}
+    asks = {tick(mid + tick_size * (i + 1)): float(s) for i, s in enumerate(_sizes(rng, depth))}
+    snapshot = {
+        "bids": sorted(([p, s] for p, s in bids.items()), reverse=True),
+        "asks": sorted([p, s] for p, s in asks.items()),
+        "timestamp": START_MS,
+        "nonce": 0,
+    }
+    walk = rng.normal(0.0, vol_bps / 10_000, n)
+    kind = rng.random(n)
+    offset = rng.integers(0, depth, n)
+    sizes = _sizes(rng, n)
+    updates: List[Tuple[str, float, float]] = []
+    for i in range(n):
+        mid *= np.exp(walk[i])
+        side, book = ("bids", bids) if i % 2 == 0 else ("asks", asks)
+        sign = -1 if side == "bids" else 1
+        ordered = sorted(book, reverse=side == "bids")
+        if len(book) < depth or (kind[i] < 0.2 and len(book) <= depth):
+            # New level ``offset`` ticks from the mid.
+            price = tick(mid + sign * tick_size * (offset[i] + 1))
+            size = float(sizes[i])
+        elif len(book) > depth or kind[i] >= 0.8:
+            # Delete the touch (it traded away) or the back of the book.
+            price = ordered[0] if kind[i] < 0.9 and len(book) <= depth else ordered[-1]
+            size = 0.0
+        else:
+            price = ordered[offset[i] % len(ordered)]
+            size = float(sizes[i])
+        # Crossing levels on the other side are consumed first.
+        other, other_side = (asks, "asks") if side == "bids" else (bids, "bids")
+        for crossed in [p for p in other if (p <= price if side == "bids" else p >= price)] if size else []:
+            del other[crossed]
+            updates.append((other_side, crossed, 0.0))
+        if size:
+            book[price] = size
+        else:
+            book.pop(price, None)
+        updates.append((side, price, size))
+    return snapshot, updates
+
+
+def correlated_closes(assets: Sequence[str], n_days: int, *, vol: float = 0.03, corr: float = 0.6,
+                      start: float = 100.0, seed: int = 0):
+    """Daily closes (``{asset: pd.Series}``) whose log returns share correlation ``corr``."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    k = len(assets)
+    cov = np.full((k, k), corr * vol * vol)
+    np.fill_diagonal(cov, vol * vol)
+    returns = rng.multivariate_normal(np.zeros(k), cov, n_days)
+    closes = start * np.exp(np.cumsum(returns, axis=0))
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D", tz="UTC")
+    return {asset: pd.Series(closes[:, j], index=index, name="close") for j, asset in enumerate(assets)}
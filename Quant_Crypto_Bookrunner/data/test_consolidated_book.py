@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from . import consolidated_book
+from .consolidated_book import ConsolidatedBook
+from .order_book import OrderBook
+
+VENUES = ("binance", "coinbase", "kraken")
+
+
+def _book(rng, symbol, depth):
+    mid = 30_000 + rng.normal(0.0, 5.0)
+    bids = [(mid - 0.5 - i * rng.uniform(0.5, 2.0), rng.uniform(0.01, 2.0)) for i in range(depth)]
+    asks = [(mid + 0.5 + i * rng.uniform(0.5, 2.0), rng.uniform(0.01, 2.0)) for i in range(depth)]
+    book = OrderBook(symbol, depth)
+    book.reset(sorted(bids, reverse=True), sorted(asks))
+    return book
+
+
+def _full_sort(books, fees_bps, side):
+    rows = []
+    for venue, book in books.items():
+        fee = fees_bps[venue] / 10_000
+        for price, size in getattr(book, side).tolist():
+            rows.append((price * (1 - fee) if side == "bids" else price * (1 + fee), size))
+    rows.sort(key=lambda r: -r[0] if side == "bids" else r[0])
+    return rows
+
+
+@pytest.fixture(params=["rebuild", "patch"])
+def merge_path(request, monkeypatch):
+    if request.param == "patch":
+        monkeypatch.setattr(consolidated_book, "PATCH_MIN_LEVELS", 0)
+    return request.param
+
+
+def test_merged_depth_matches_full_sort(merge_path):
+    rng = np.random.default_rng(2)
+    fees = {"binance": 10.0, "coinbase": 60.0, "kraken": 40.0}
+    cb = ConsolidatedBook("BTC/USDT", VENUES, fees_bps=fees, depth=20)
+    books = {}
+    for step in range(200):
+        venue = VENUES[step % len(VENUES)]
+        books[venue] = _book(rng, "BTC/USDT", int(rng.integers(1, 21)))
+        cb.update(venue, books[venue])
+        for side in ("bids", "asks"):
+            expected = _full_sort(books, fees, side)
+            merged = getattr(cb, side)
+            np.testing.assert_allclose(merged, np.array(expected), rtol=0, atol=1e-9)
+        best_bid = max(r[0] for r in _full_sort(books, fees, "bids"))
+        assert abs(cb.best_bid - best_bid) < 1e-9
+
+
+def test_removed_and_stale_venues_leave_the_nbbo():
+    rng = np.random.default_rng(5)
+    cb = ConsolidatedBook("BTC/USDT", VENUES, fees_bps={v: 0.0 for v in VENUES}, max_age=5.0)
+    books = {venue: _book(rng, "BTC/USDT", 5) for venue in VENUES}
+    for venue, book in books.items():
+        cb.update(venue, book)
+    best = max(VENUES, key=lambda v: books[v].best_bid)
+    assert cb.best_bid_venue == best
+
+    cb.remove(best)
+    assert cb.best_bid_venue != best
+    assert best not in [VENUES[v] for v in cb.levels("bids")[2]]
+
+    cb.update(best, books[best])
+    cb.received[cb.index[best]] -= 10.0  # silent for longer than max_age
+    other = next(v for v in VENUES if v != best)
+    cb.update(other, books[other])
+    assert cb.best_bid_venue != best
+    assert cb.depth_by_venue("bids")[best] == 0.0
+
+
+def test_equal_prices_merge_in_venue_order(merge_path):
+    cb = ConsolidatedBook("BTC/USDT", VENUES, fees_bps={v: 0.0 for v in VENUES})
+    for venue in ("kraken", "binance", "coinbase", "kraken"):
+        book = OrderBook("BTC/USDT", 5)
+        book.reset([(100.0, 1.0), (99.0, 2.0)], [(101.0, 1.0)])
+        cb.update(venue, book)
+        cb.levels("bids")
+    prices, _, venues = cb.levels("bids")
+    assert prices.tolist() == [100.0] * 3 + [99.0] * 3
+    assert venues.tolist() == [0, 1, 2, 0, 1, 2]
@@ -0,0 +1,37 @@
+import os
+
+from .journal import Journal
+
+
+class Holder:
+    def __init__(self):
+        self.inventory = {}
+        self.tick_count = 0
+
+
+def _logs(root):
+    return sorted(f for f in os.listdir(root) if f.endswith(".log"))
+
+
+def test_snapshot_prunes_covered_segments(tmp_path):
+    root = str(tmp_path)
+    for run in range(3):
+        journal = Journal(root, commit_interval=0.0, snapshot_every=10, fsync=False)
+        holder = Holder()
+        holder.inventory.update(journal.state_for("BTC/USDT")["inventory"])
+        journal.register("BTC/USDT", holder)
+        journal.order_new("BTC/USDT", f"o{run}", "buy", 100.0, 1.0)
+        for _ in range(25):
+            holder.inventory["BTC"] = holder.inventory.get("BTC", 0.0) + 0.1
+            journal.fill("BTC/USDT", "BTC", 0.1, 100.0)
+        journal.flush()
+        assert len(_logs(root)) <= 2  # the snapshot's segment, plus one being written
+        journal.close()
+        assert len(_logs(root)) == 1
+
+    journal = Journal(root, commit_interval=0.0, fsync=False)
+    state = journal.state_for("BTC/USDT")
+    assert abs(state["inventory"]["BTC"] - 7.5) < 1e-9
+    assert [o["id"] for o in journal.open_orders("BTC/USDT")] == ["o2"]
+    journal.close()
+    assert len(_logs(root)) == 1
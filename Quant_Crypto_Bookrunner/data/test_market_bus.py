@@ -0,0 +1,140 @@
+import asyncio
+import os
+
+import pytest
+
+from .market_bus import MarketBusReader, MarketBusWriter
+from .order_book import OrderBook
+
+SYMBOLS = [f"S{i}/USDT" for i in range(20)]
+
+
+def _book(symbol, mid):
+    book = OrderBook(symbol, 5)
+    book.reset([(mid - 0.5, 1.0)], [(mid + 0.5, 1.0)])
+    return book
+
+
+@pytest.fixture
+def bus():
+    name = f"qcb-bus-test-{os.getpid()}"
+    writer = MarketBusWriter(name, SYMBOLS, depth=5, slots=4)
+    reader = MarketBusReader(name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def test_subscribers_wake_only_on_their_symbol(bus):
+    writer, reader = bus
+
+    async def run():
+        got = {sym: [] for sym in SYMBOLS[:3]}
+
+        async def follow(sym):
+            async for book in reader.subscribe(sym):
+                got[sym].append(book.mid)
+
+        tasks = [asyncio.create_task(follow(sym)) for sym in got]
+        for mid in (100.0, 101.0, 102.0):
+            writer.publish(SYMBOLS[1], _book(SYMBOLS[1], mid))
+            await asyncio.sleep(0.02)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return got
+
+    got = asyncio.run(run())
+    assert got[SYMBOLS[1]] == [100.0, 101.0, 102.0]
+    assert not got[SYMBOLS[0]] and not got[SYMBOLS[2]]
+    assert reader._poller is None and not reader._events
+
+
+def test_read_gives_up_on_slot_left_mid_write(bus):
+    writer, reader = bus
+    writer.publish(SYMBOLS[0], _book(SYMBOLS[0], 100.0))
+    assert reader.read(SYMBOLS[0]).mid == 100.0
+    writer.seq[0, 0] += 1  # a writer that died inside publish
+    with pytest.raises(TimeoutError):
+        reader.read(SYMBOLS[0], timeout=0.05)
+
+
+def test_subscriber_stops_when_writer_stops_beating(bus):
+    writer, _ = bus
+    reader = MarketBusReader(writer.shm.name.lstrip("/"), max_age=0.05)
+
+    async def run():
+        got = []
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(2.0):
+                async for book in reader.subscribe(SYMBOLS[0]):
+                    got.append(book.mid)
+        return got
+
+    writer.publish(SYMBOLS[0], _book(SYMBOLS[0], 100.0))
+    try:
+        assert asyncio.run(run()) == [100.0]
+    finally:
+        reader.close()
+
+
+def test_subscriber_reattaches_to_restarted_writer():
+    name = f"qcb-bus-test-restart-{os.getpid()}"
+    first = MarketBusWriter(name, SYMBOLS, depth=5, slots=4)
+    reader = MarketBusReader(name, max_age=0.05)
+
+    async def run():
+        first.publish(SYMBOLS[0], _book(SYMBOLS[0], 100.0))
+        got = []
+
+        async def follow():
+            async for book in reader.subscribe(SYMBOLS[0]):
+                got.append(book.mid)
+
+        task = asyncio.create_task(follow())
+        await asyncio.sleep(0.02)
+        first.close()  # the feed handler exits and a new one recreates the bus
+        second = MarketBusWriter(name, SYMBOLS, depth=5, slots=4)
+        beat = asyncio.create_task(second.heartbeat(0.01))
+        second.publish(SYMBOLS[0], _book(SYMBOLS[0], 200.0))
+        async with asyncio.timeout(2.0):
+            while got[-1] != 200.0:
+                await asyncio.sleep(0.01)
+        for t in (task, beat):
+            t.cancel()
+        await asyncio.gather(task, beat, return_exceptions=True)
+        return got, second
+
+    got, second = asyncio.run(run())
+    reader.close()
+    second.close()
+    assert got == [100.0, 200.0]
+
+
+def test_subscribe_does_not_block_on_a_torn_slot(bus):
+    writer, reader = bus
+
+    async def run():
+        got = []
+
+        async def follow():
+            async for book in reader.subscribe(SYMBOLS[0]):
+                got.append(book.mid)
+
+        writer.publish(SYMBOLS[0], _book(SYMBOLS[0], 100.0))
+        writer.seq[0, 0] += 1  # caught mid-publish
+        task = asyncio.create_task(follow())
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.sleep(0.02)
+        stalled = loop.time() - start
+        writer.seq[0, 0] += 1
+        writer.publish(SYMBOLS[0], _book(SYMBOLS[0], 101.0))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return got, stalled
+
+    got, stalled = asyncio.run(run())
+    assert stalled < 0.5
+    assert got == [101.0]
@@ -0,0 +1,20 @@
+import numpy as np
+
+from .order_book import BookColumns, OrderBook
+
+
+def test_from_snapshots_keeps_price_and_amount_of_three_field_levels():
+    snapshot = {
+        "timestamp": 1_000,
+        "bids": [[100.0, 1.5, 1_000], [99.5, 2.0, 999]],
+        "asks": [[100.5, 0.5, 1_000], [101.0, 3.0, 998], [101.5, 1.0, 997]],
+    }
+    book = OrderBook("BTC/USDT", 3)
+    book.reset([(100.0, 1.5)], [(100.5, 0.5)], timestamp=2_000)
+    cols = BookColumns.from_snapshots([snapshot, book], depth=3)
+
+    np.testing.assert_array_equal(cols.bids[0], [[100.0, 1.5], [99.5, 2.0], [np.nan, 0.0]])
+    np.testing.assert_array_equal(cols.asks[0], [[100.5, 0.5], [101.0, 3.0], [101.5, 1.0]])
+    np.testing.assert_array_equal(cols.bids[1], [[100.0, 1.5], [np.nan, 0.0], [np.nan, 0.0]])
+    assert cols.timestamp.tolist() == [1_000, 2_000]
+    assert cols.bid.tolist() == [100.0, 100.0] and cols.ask_size.tolist() == [0.5, 0.5]
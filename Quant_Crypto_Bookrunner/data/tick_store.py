@@ -0,0 +1,229 @@
+"""Append-only columnar order-book store, partitioned by exchange / symbol / UTC day.
+
+Each partition is a ``<day>.ticks`` data file plus a ``<day>.idx`` block index::
+
+    root/binance/BTC-USDT/2024-05-01.ticks
+    root/binance/BTC-USDT/2024-05-01.idx
+
+The data file is a header followed by blocks of up to ``block_rows`` snapshots.
+Inside a block the columns are stored contiguously (timestamps, then bid levels,
+then ask levels), optionally zlib-compressed.  The index holds one fixed-size
+record per block (first/last timestamp, offset, length, rows) and is written only
+after its block, so a crash can at worst lose the block being written.
+"""
+from typing import Any, Dict, Iterator, List
+from datetime import datetime, timezone
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .order_book import BookColumns, OrderBook
+
+MAGIC = b"QCBTICK1"
+HEADER = struct.Struct("<8sHHI")  # magic, codec, reserved, depth
+INDEX_DTYPE = np.dtype([
+    ("first_ts", "<i8"), ("last_ts", "<i8"), ("offset", "<i8"), ("nbytes", "<i8"), ("rows", "<i8"),
+])
+CODEC_RAW, CODEC_ZLIB = 0, 1
+
+
+def _day(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _symbol_dir(symbol: str) -> str:
+    return symbol.replace("/", "-")
+
+
+class TickWriter:
+    """Buffers snapshots for one exchange/symbol and appends them block by block."""
+
+    def __init__(self, root: str, exchange: str, symbol: str, *, depth: int = 10,
+                 block_rows: int = 4096, compress: bool = False):
+        self.dir = os.path.join(root, exchange, _symbol_dir(symbol))
+        self.depth = depth
+        self.block_rows = block_rows
+        self.codec = CODEC_ZLIB if compress else CODEC_RAW
+        self._ts = np.zeros(block_rows, dtype=np.int64)
+        self._bids = np.zeros((block_rows, depth, 2))
+        self._asks = np.zeros((block_rows, depth, 2))
+        self._n = 0
+        self._day: str | None = None
+        self._data = None
+        self._index = None
+        os.makedirs(self.dir, exist_ok=True)
+
+    def append(self, book, timestamp: int | None = None):
+        """Append one ``OrderBook`` or ccxt-style snapshot."""
+        ts = int(timestamp or book.get("timestamp") or time.time() * 1000)
+        day = _day(ts)
+        if day != self._day:
+            self.flush()
+            self._open(day)
+        i = self._n
+        self._ts[i] = ts
+        self._fill(self._bids[i], book["bids"])
+        self._fill(self._asks[i], book["asks"])
+        self._n += 1
+        if self._n == self.block_rows:
+            self.flush()
+
+    def _fill(self, out: np.ndarray, levels):
+        k = min(len(levels), self.depth)
+        if k:
+            out[:k] = np.asarray(levels[:k], dtype=np.float64)[:, :2]
+        out[k:, 0] = np.nan
+        out[k:, 1] = 0.0
+
+    def _open(self, day: str):
+        self.close()
+        path = os.path.join(self.dir, day)
+        index = np.fromfile(path + ".idx", dtype=INDEX_DTYPE) if os.path.exists(path + ".idx") else None
+        end = HEADER.size
+        if index is not None and len(index):
+            end = int(index["offset"][-1] + index["nbytes"][-1])
+        if os.path.exists(path + ".ticks"):
+            with open(path + ".ticks", "rb") as fh:
+                magic, _, _, depth = HEADER.unpack(fh.read(HEADER.size))
+            if magic != MAGIC or depth != self.depth:
+                raise ValueError(f"{path}.ticks has depth {depth}, writer uses {self.depth}")
+            self._data = open(path + ".ticks", "r+b")
+            self._data.truncate(end)  # drop any partial block left by a crash
+            self._data.seek(end)
+        else:
+            self._data = open(path + ".ticks", "wb")
+            self._data.write(HEADER.pack(MAGIC, self.codec, 0, self.depth))
+        self._index = open(path + ".idx", "ab")
+        self._index.truncate((len(index) if index is not None else 0) * INDEX_DTYPE.itemsize)
+        self._day = day
+
+    def flush(self):
+        n = self._n
+        if not n or self._data is None:
+            return
+        payload = self._ts[:n].tobytes() + self._bids[:n].tobytes() + self._asks[:n].tobytes()
+        if self.codec == CODEC_ZLIB:
+            payload = zlib.compress(payload, 1)
+        offset = self._data.tell()
+        self._data.write(struct.pack("<B", self.codec) + payload)
+        self._data.flush()
+        record = np.array([(self._ts[0], self._ts[n - 1], offset, len(payload) + 1, n)], dtype=INDEX_DTYPE)
+        self._index.write(record.tobytes())
+        self._index.flush()
+        self._n = 0
+
+    def close(self):
+        self.flush()
+        for fh in (self._data, self._index):
+            if fh is not None:
+                fh.close()
+        self._data = self._index = None
+        self._day = None
+
+
+class TickStore:
+    """Reader for a ``TickWriter`` tree; streams memory-mapped blocks within a time range."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def writer(self, exchange: str, symbol: str, **kwargs) -> TickWriter:
+        return TickWriter(self.root, exchange, symbol, **kwargs)
+
+    def days(self, exchange: str, symbol: str) -> List[str]:
+        path = os.path.join(self.root, exchange, _symbol_dir(symbol))
+        if not os.path.isdir(path):
+            return []
+        return sorted(f[: -len(".ticks")] for f in os.listdir(path) if f.endswith(".ticks"))
+
+    def iter_batches(self, exchange: str, symbol: str, start: int | None = None,
+                     end: int | None = None) -> Iterator[BookColumns]:
+        """Yield one ``BookColumns`` (with depth) per stored block within ``[start, end)`` ms.
+
+        Uncompressed blocks are zero-copy views of the memory-mapped file, so
+        only the pages being read are resident regardless of file size.
+        """
+        start_day = _day(start) if start is not None else ""
+        end_day = _day(end) if end is not None else "9999"
+        for day in self.days(exchange, symbol):
+            if start_day <= day <= end_day:
+                path = os.path.join(self.root, exchange, _symbol_dir(symbol), day)
+                yield from self._iter_file(path, start, end)
+
+    def iter_books(self, exchange: str, symbol: str, start: int | None = None,
+                   end: int | None = None) -> Iterator[OrderBook]:
+        """Lazily yield one ``OrderBook`` per stored snapshot."""
+        for batch in self.iter_batches(exchange, symbol, start, end):
+            yield from batch.iter_snapshots(symbol)
+
+    def dataset_key(self, exchange: str, symbol: str, start: int | None = None, end: int | None = None) -> str:
+        """Cheap identity of a range for ``FeatureStore``: changes whenever a file in it is appended to."""
+        h = hashlib.blake2b(digest_size=10)
+        h.update(f"{exchange}/{symbol}/{start}/{end}".encode())
+        for day in self.days(exchange, symbol):
+            stat = os.stat(os.path.join(self.root, exchange, _symbol_dir(symbol), day + ".idx"))
+            h.update(f"{day}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return h.hexdigest()
+
+    def load(self, exchange: str, symbol: str, start: int | None = None, end: int | None = None) -> BookColumns:
+        """Materialize a range into one ``BookColumns`` (use ``iter_batches`` for large ranges)."""
+        return BookColumns.concat(self.iter_batches(exchange, symbol, start, end))
+
+    def _iter_file(self, path: str, start: int | None, end: int | None) -> Iterator[BookColumns]:
+        index = np.fromfile(path + ".idx", dtype=INDEX_DTYPE)
+        if not len(index):
+            return
+        # The per-file index lets us seek straight to the first block in range.
+        first = int(np.searchsorted(index["last_ts"], start, side="left")) if start is not None else 0
+        with open(path + ".ticks", "rb") as fh:
+            _, _, _, depth = HEADER.unpack(fh.read(HEADER.size))
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        for first_ts, _, offset, nbytes, rows in index[first:].tolist():
+            if end is not None and first_ts >= end:
+                break
+            batch = self._decode(mm, offset, nbytes, rows, depth)
+            lo = int(np.searchsorted(batch.timestamp, start)) if start is not None else 0
+            hi = int(np.searchsorted(batch.timestamp, end)) if end is not None else rows
+            if lo or hi < rows:
+                batch = batch[lo:hi]
+            if len(batch):
+                yield batch
+
+    @staticmethod
+    def _decode(mm: mmap.mmap, offset: int, nbytes: int, rows: int, depth: int) -> BookColumns:
+        codec = mm[offset]
+        if codec == CODEC_ZLIB:
+            buf, base = zlib.decompress(mm[offset + 1: offset + nbytes]), 0
+        else:
+            buf, base = mm, offset + 1
+        side = rows * depth * 2
+        ts = np.frombuffer(buf, dtype=np.int64, count=rows, offset=base)
+        bids = np.frombuffer(buf, dtype=np.float64, count=side, offset=base + rows * 8).reshape(rows, depth, 2)
+        asks = np.frombuffer(buf, dtype=np.float64, count=side, offset=base + rows * 8 + side * 8)
+        return BookColumns.from_depth(ts, bids, asks.reshape(rows, depth, 2))
+
+
+class TickRecorder:
+    """Routes snapshots for many symbols of one exchange to per-symbol writers."""
+
+    def __init__(self, root: str, exchange: str, **writer_kwargs: Any):
+        self.store = TickStore(root)
+        self.exchange = exchange
+        self.writer_kwargs = writer_kwargs
+        self.writers: Dict[str, TickWriter] = {}
+
+    def record(self, symbol: str, book):
+        writer = self.writers.get(symbol)
+        if writer is None:
+            writer = self.writers[symbol] = self.store.writer(self.exchange, symbol, **self.writer_kwargs)
+        writer.append(book)
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
@@ -1,23 +1,46 @@
 import os
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from .bar_cache import BAR_DTYPE, BarCache, freq_ms
+
 TIINGO_BASE_URL = "https://api.tiingo.com/tiingo"
+DAY_MS = 86_400_000
+# Roughly how many bars to ask for per historical request.
+CHUNK_BARS = 5000
+
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
 
 class TiingoConnector:
-    """Lightweight Tiingo REST wrapper for crypto endpoints."""
+    """Lightweight Tiingo REST wrapper for crypto endpoints.
+
+    Requests share one pooled ``requests.Session``.  Historical bars are cached under
+    ``cache_dir`` (``None`` disables the cache) so only missing date ranges hit the API.
+    """
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, *, cache_dir: str | None = "cache",
+                 max_workers: int = 4):
         self.api_key = api_key or os.getenv("TIINGO_API_KEY")
         if not self.api_key:
             raise ValueError("Tiingo API key not provided.")
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.cache = BarCache(cache_dir, "tiingo") if cache_dir else None
 
     def _get(self, endpoint: str, params: Dict[str, Any] | None = None):
         url = f"{TIINGO_BASE_URL}/{endpoint}"
-        headers = {"Content-Type": "application/json"}
         params = params or {}
         params["token"] = self.api_key
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = self.session.get(url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -26,7 +49,77 @@ class TiingoConnector:
         """Return the latest price data for a given crypto ticker (e.g. 'btcusd')."""
         return self._get("crypto/prices", {"tickers": ticker})
 
-    def get_historical_prices(self, ticker: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Fetch historical OHLCV data between two dates (YYYY-MM-DD)."""
-        endpoint = f"crypto/prices/{ticker}/historical"
-        return self._get(endpoint, {"startDate": start_date, "endDate": end_date})
\ No newline at end of file
+    def get_historical_prices(self, ticker: str, start_date: str, end_date: str, resample_freq: str = "1day", *,
+                              refresh: bool = False, as_array: bool = False) -> pd.DataFrame | np.ndarray:
+        """OHLCV bars between two dates (YYYY-MM-DD, both inclusive).
+
+        Returns a DataFrame indexed by UTC bar start with ``timestamp`` (ms), ``open``,
+        ``high``, ``low``, ``close``, ``volume``, ``volume_notional`` and ``trades_done``
+        columns, or the underlying ``BAR_DTYPE`` array with ``as_array``.  Only date
+        ranges not yet in the cache are downloaded, in parallel chunks of about
+        ``CHUNK_BARS`` bars; the still-forming current bar is always re-fetched.
+        """
+        start = _date_ms(start_date)
+        end = _date_ms(end_date) + DAY_MS
+        if self.cache is None:
+            _, bars = self._download(ticker, resample_freq, [(start, end)])
+            bars = bars[(bars["timestamp"] >= start) & (bars["timestamp"] < end)]
+        else:
+            gaps = [(start, end)] if refresh else self.cache.missing(ticker, resample_freq, start, end)
+            if gaps:
+                chunks, fetched = self._download(ticker, resample_freq, gaps)
+                # Never mark the bar that is still forming as covered.
+                step = freq_ms(resample_freq)
+                current = int(time.time() * 1000) // step * step
+                covered = [(lo, min(hi, current)) for lo, hi in chunks if lo < current]
+                self.cache.merge(ticker, resample_freq, fetched, covered)
+            bars = self.cache.read(ticker, resample_freq, start, end)
+        return bars if as_array else _to_frame(bars)
+
+    # ------------- Historical download ------------- #
+    def _chunks(self, gaps: List[tuple], freq: str) -> List[tuple]:
+        """Split gaps into whole-day ``[lo, hi)`` chunks of at most ~``CHUNK_BARS`` bars."""
+        span = max(1, CHUNK_BARS * freq_ms(freq) // DAY_MS) * DAY_MS
+        chunks = []
+        for lo, hi in gaps:
+            lo, hi = lo // DAY_MS * DAY_MS, -(-hi // DAY_MS) * DAY_MS
+            chunks.extend((t, min(t + span, hi)) for t in range(lo, hi, span))
+        return chunks
+
+    def _download(self, ticker: str, freq: str, gaps: List[tuple]):
+        """Fetch ``gaps`` chunk by chunk over the pooled session; return ``(chunks, bars)``."""
+        chunks = self._chunks(gaps, freq)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks)))) as pool:
+            parts = list(pool.map(lambda chunk: self._fetch_bars(ticker, freq, *chunk), chunks))
+        return chunks, np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+
+    def _fetch_bars(self, ticker: str, freq: str, lo: int, hi: int) -> np.ndarray:
+        data = self._get("crypto/prices", {
+            "tickers": ticker,
+            "startDate": _ms_date(lo),
+            "endDate": _ms_date(hi - DAY_MS),
+            "resampleFreq": freq,
+        })
+        rows = data[0].get("priceData", []) if data else []
+        bars = np.zeros(len(rows), dtype=BAR_DTYPE)
+        if rows:
+            bars["timestamp"] = (pd.to_datetime([r["date"] for r in rows], utc=True) - _EPOCH) // pd.Timedelta(1, "ms")
+            for field, key in (("open", "open"), ("high", "high"), ("low", "low"), ("close", "close"),
+                               ("volume", "volume"), ("volume_notional", "volumeNotional"),
+                               ("trades_done", "tradesDone")):
+                bars[field] = [r.get(key) or 0 for r in rows]
+        return bars[(bars["timestamp"] >= lo) & (bars["timestamp"] < hi)]
+
+
+def _date_ms(date: str) -> int:
+    return (pd.Timestamp(date, tz="UTC") - _EPOCH) // pd.Timedelta(1, "ms")
+
+
+def _ms_date(ts_ms: int) -> str:
+    return (_EPOCH + pd.Timedelta(ts_ms, "ms")).strftime("%Y-%m-%d")
+
+
+def _to_frame(bars: np.ndarray) -> pd.DataFrame:
+    frame = pd.DataFrame({name: bars[name] for name in BAR_DTYPE.names})
+    frame.index = pd.to_datetime(frame["timestamp"], unit="ms", utc=True).rename("date")
+    return frame
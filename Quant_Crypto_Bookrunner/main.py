@@ -1,71 +1,439 @@
+from __future__ import annotations
+
 import os
 import asyncio
 import argparse
-from data.tiingo_connector import TiingoConnector
-from data.exchange_connectors.binance import BinanceConnector
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import TYPE_CHECKING
+
+# Only cheap modules are imported here.  ccxt, pandas, requests and the research
+# stack are imported where they are first needed so a restart (or --help) does
+# not pay for features the run does not use; see benchmarks/startup.py.
+from data import exchange_connectors
+from data.order_book import OrderBook
+from data.consolidated_book import ConsolidatedBook
+from data.journal import Journal
+from data.market_bus import MarketBusReader, bus_name
+from analytics.latency import NULL_RECORDER, LatencyRecorder, now_ns
 from strategies.bookrunner import BookrunnerStrategy
-from data.research_aggregator import gather_research
-from strategies.strategy_generator import generate_from_research
-from data.exchange_connectors.coinbase import CoinbaseConnector
-from data.exchange_connectors.kraken import KrakenConnector
+
+if TYPE_CHECKING:
+    from analytics.risk import RiskEngine
+    from strategies.quote_manager import QuoteManager
+    from strategies.runner import StrategyRunner
 
 # Load API keys from env (fallback to placeholder)
 TIINGO_API_KEY = os.getenv("TIINGO_API_KEY", "5c30f6c2e27d1f902ace1d777b29691a610df388")
 
 EXCH_MAP = {
-    "binance": BinanceConnector,
-    "coinbase": CoinbaseConnector,
-    "kraken": KrakenConnector,
+    "binance": "BinanceConnector",
+    "coinbase": "CoinbaseConnector",
+    "kraken": "KrakenConnector",
+    "simulated": "SimulatedConnector",
 }
 
 
-def build_exchange(name: str):
-    cls = EXCH_MAP.get(name.lower())
-    if not cls:
+def build_exchange(name: str, args=None):
+    cls_name = EXCH_MAP.get(name.lower())
+    if not cls_name:
         raise ValueError(f"Unsupported exchange: {name}")
+    cls = getattr(exchange_connectors, cls_name)
+    if name.lower() == "simulated" and args is not None:
+        return cls(rate=args.sim_rate, latency_ms=args.sim_latency_ms, seed=args.sim_seed)
     return cls()
 
 
+async def close_exchanges(exchanges):
+    from data.exchange_connectors.async_connector import close_shared_session
+
+    for exchange in exchanges:
+        await exchange.close_async()
+    await close_shared_session()
+
+
 def cli():
     parser = argparse.ArgumentParser(description="Quant Crypto Bookrunner")
     parser.add_argument("--exchange", default="binance", choices=list(EXCH_MAP.keys()))
     parser.add_argument("--symbol", default="BTC/USDT")
+    parser.add_argument("--exchanges", nargs="+", choices=list(EXCH_MAP.keys()), help="Quote on several exchanges at once")
     parser.add_argument("--research", action="store_true", help="Generate params from latest papers")
+    parser.add_argument("--stream", action="store_true", help="Quote on every WebSocket book update instead of polling")
+    parser.add_argument("--trade", action="store_true", help="Send quotes to the exchange via the quote manager")
+    parser.add_argument("--order-size", type=float, default=0.001, help="Quote size in base units for --trade")
+    parser.add_argument("--quote-tolerance-bps", type=float, default=1.0, help="Leave resting quotes within this distance")
+    parser.add_argument("--fill-interval", type=float, default=1.0, help="Seconds between --trade checks for fills")
+    parser.add_argument("--max-var", type=float, help="Pull quotes that would lift 1-day 99%% VaR above this (quote ccy)")
+    parser.add_argument("--latency", action="store_true", help="Record per-stage tick-to-quote latency histograms")
+    parser.add_argument("--latency-interval", type=float, default=10.0, help="Seconds between --latency log lines")
+    parser.add_argument("--journal-dir", default="journal", help="Order/fill journal used to restore inventory")
+    parser.add_argument("--no-journal", action="store_true", help="Start flat and do not journal orders/fills")
+    parser.add_argument("--record", action="store_true", help="Record order books to the tick store instead of trading")
+    parser.add_argument("--record-dir", default="ticks", help="Tick store root for --record")
+    parser.add_argument("--symbols", nargs="+", help="Symbols to quote/record concurrently (defaults to --symbol)")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress recorded blocks")
+    parser.add_argument("--consolidate", action="store_true",
+                        help="Quote every venue off the fee-adjusted cross-venue book of --exchanges")
+    parser.add_argument("--max-book-age", type=float, default=5.0,
+                        help="Drop a venue from the --consolidate book after this many seconds without an update")
+    parser.add_argument("--price-source", choices=("mid", "microprice"), default="mid",
+                        help="Fair price the quotes are centred on")
+    parser.add_argument("--shadow", action="store_true",
+                        help="Paper-trade every DEFAULT_PARAM_GRID variant on the same feed and report the leaders")
+    parser.add_argument("--shadow-interval", type=float, default=60.0, help="Seconds between --shadow reports")
+    parser.add_argument("--sim-rate", type=float, default=1000.0,
+                        help="Book updates per second per symbol on --exchange simulated")
+    parser.add_argument("--sim-latency-ms", type=float, default=0.0, help="Request round trip on --exchange simulated")
+    parser.add_argument("--sim-seed", type=int, default=0, help="Order-flow seed for --exchange simulated")
+    parser.add_argument("--publish", action="store_true",
+                        help="Run the feed handler: publish --exchange books to the shared-memory market bus")
+    parser.add_argument("--bus", action="store_true",
+                        help="Read books from the market bus (started with --publish) instead of the exchange")
     return parser.parse_args()
 
 
+async def quote_symbol(exchange, exchange_name: str, symbol: str, strategy: BookrunnerStrategy, stream: bool,
+                       quotes: QuoteManager | None = None, latency: LatencyRecorder = NULL_RECORDER,
+                       risk: RiskEngine | None = None, bus: MarketBusReader | None = None,
+                       consolidated: ConsolidatedBook | None = None, runner: StrategyRunner | None = None):
+    """Quote one symbol on one exchange (run it under ``supervise``, which restarts it on errors).
+
+    With ``consolidated`` every book of this venue is merged into the shared
+    cross-venue book first (the strategy prices off it through ``reference``).
+    With ``runner`` each book goes to every strategy it hosts (``strategy`` and
+    its paper variants) instead of ``strategy`` alone.
+    """
+    base = symbol.split("/")[0]
+    if risk is not None and base not in risk.index:
+        risk = None
+    fetch_span = latency.histogram(exchange_name, symbol, "fetch")
+    decode_span = latency.histogram(exchange_name, symbol, "decode")
+    strategy_span = latency.histogram(exchange_name, symbol, "strategy")
+
+    def on_book(book):
+        start = now_ns()
+        if consolidated is not None:
+            consolidated.update(exchange_name, book)
+        if runner is not None:
+            runner.on_book(book)
+        else:
+            strategy.on_tick(symbol, book)
+        strategy_span.record_since(start)
+        if risk is not None:
+            risk.mark(base, book.mid)
+        if quotes is not None:
+            bid, ask = strategy.bid_quote, strategy.ask_quote
+            if risk is not None:
+                # Pre-trade check: drop a side whose fill would breach the VaR limit.
+                if not risk.check(base, quotes.order_size):
+                    bid = None
+                if not risk.check(base, -quotes.order_size):
+                    ask = None
+            quotes.submit(symbol, bid, ask)
+
+    def on_reset():
+        # This venue's book is gone until it resyncs: keep it out of the cross-venue book.
+        if consolidated is not None:
+            consolidated.remove(exchange_name)
+
+    try:
+        if bus is not None:
+            try:
+                async for book in bus.subscribe(symbol):
+                    on_book(book)
+            except TimeoutError:
+                # The feed handler stopped: do not leave quotes resting on its last book.
+                if quotes is not None:
+                    quotes.submit(symbol, None, None)
+                raise
+        if stream:
+            await exchange.stream_order_book(symbol, on_book, decode_latency=decode_span, on_reset=on_reset)
+            return
+
+        while True:
+            try:
+                start = now_ns()
+                raw = await exchange.get_order_book_async(symbol)
+                start = fetch_span.record_since(start)
+                book = OrderBook.from_ccxt(raw)
+                decode_span.record_since(start)
+                on_book(book)
+                await asyncio.sleep(1)
+            except Exception as exc:
+                print(f"Live error [{exchange_name} {symbol}]:", exc)
+                on_reset()
+                await asyncio.sleep(5)
+    finally:
+        on_reset()
+
+
+async def supervise(label: str, factory, *, backoff: float = 1.0, max_backoff: float = 60.0):
+    """Run ``factory()`` until cancelled, restarting it with exponential backoff when it fails.
+
+    Keeps one pair's failure (a bad book, a risk or order error) from taking down the
+    other pairs gathered with it.  The backoff resets once a run has lasted ``max_backoff``.
+    """
+    loop = asyncio.get_running_loop()
+    delay = backoff
+    while True:
+        started = loop.time()
+        try:
+            await factory()
+            print(f"[Live] {label} stopped, restarting in {delay:g}s")
+        except Exception as exc:
+            print(f"[Live] {label} failed ({type(exc).__name__}: {exc}), restarting in {delay:g}s")
+        if loop.time() - started >= max_backoff:
+            delay = backoff
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_backoff)
+
+
 async def live_loop(args):
-    tiingo = TiingoConnector(TIINGO_API_KEY)
-    exchange = build_exchange(args.exchange)
+    exchanges = {name: build_exchange(name, args) for name in args.exchanges or [args.exchange]}
+    symbols = args.symbols or [args.symbol]
 
     # Optionally generate strategy params from research
     params = {"spread_bps": 10, "inventory_clip": 0.2, "hold_time": 60}
     if args.research:
+        from data.research_aggregator import gather_research
+        from strategies.strategy_generator import generate_from_research
+
         papers = gather_research("crypto market making", min_results=120)
         params.update(generate_from_research(papers))
+        # Recorded ticks of the quoted market, where there are any, refine the paper-based guess.
+        name = next(iter(exchanges))
+        params.update(params_from_recordings(args.record_dir, name, symbols[0]))
         print("[Research] Generated params:", params)
 
-    strategy = BookrunnerStrategy(
-        exchange=exchange,
-        spread_bps=params["spread_bps"],
-        inventory_clip=params["inventory_clip"],
-        hold_time=params["hold_time"],
-    )
+    latency = LatencyRecorder() if args.latency else NULL_RECORDER
+
+    # One journal per exchange restores inventory (and stray orders) from the last run
+    journals = {} if args.no_journal else {
+        name: Journal(os.path.join(args.journal_dir, name)) for name in exchanges
+    }
+
+    # One strategy instance (and inventory) per exchange x symbol, each in its own task
+    tasks = [latency.report_every(args.latency_interval)]
+    if args.trade:
+        from strategies.quote_manager import QuoteManager
+    managers = {}
+    strategies = []
+    # One cross-venue book per symbol, fed by every exchange's quote task
+    consolidated = {
+        symbol: ConsolidatedBook(symbol, list(exchanges), depth=20, max_age=args.max_book_age) for symbol in symbols
+    } if args.consolidate else {}
+    for name, exchange in exchanges.items():
+        journal = journals.get(name)
+        if args.trade:
+            managers[name] = QuoteManager(
+                exchange,
+                order_size=args.order_size,
+                price_tolerance_bps=args.quote_tolerance_bps,
+                hold_time=params["hold_time"],
+                latency=latency,
+                journal=journal,
+            )
+            tasks.append(supervise(f"{name} quote manager", managers[name].run))
+        for symbol in symbols:
+            strategy = BookrunnerStrategy(
+                exchange=exchange,
+                spread_bps=params["spread_bps"],
+                inventory_clip=params["inventory_clip"],
+                hold_time=params["hold_time"],
+                price_source=args.price_source,
+                reference=consolidated.get(symbol),
+            )
+            if journal is not None:
+                strategy.restore(journal, symbol)
+                if strategy.inventory:
+                    print(f"[Journal] {name} {symbol} restored inventory {strategy.inventory}")
+                if args.trade:
+                    await cancel_stray_orders(exchange, journal, symbol)
+            strategies.append((exchange, name, symbol, strategy))
+        by_symbol = {symbol: strategy for _, n, symbol, strategy in strategies if n == name}
+
+        def route_fill(order, by_symbol=by_symbol):
+            by_symbol[order["symbol"]].on_order_fill(order)
+
+        if args.trade:
+            # Fills of our quotes reach the symbol's strategy (inventory, journal, risk) through the manager.
+            managers[name].on_fill = route_fill
+            tasks.append(supervise(f"{name} fill tracker", partial(managers[name].track_fills, args.fill_interval)))
+        if name == "simulated":
+            # The simulator pushes our fills as they happen, like a private orders stream.
+            exchange.on_fill = managers[name].record_fill if args.trade else route_fill
 
-    symbol = args.symbol
+    risk = build_risk_engine(symbols, strategies, args.max_var) if args.max_var else None
+    if risk is not None:
+        # Fills move the engine's positions; daily closes of the live marks extend its history.
+        for _, _, _, strategy in strategies:
+            strategy.risk = risk
+        tasks.append(risk_bar_loop(risk))
+    buses = {name: MarketBusReader(bus_name(name)) for name in exchanges} if args.bus else {}
+    runners = {}
+    if args.shadow:
+        from strategies.runner import StrategyRunner
+        from strategies.strategy_generator import DEFAULT_PARAM_GRID
+
+        # The live strategy plus paper variants, all fed by the pair's one decoded feed
+        for exchange, name, symbol, strategy in strategies:
+            runner = runners[name, symbol] = StrategyRunner(symbol, order_size=args.order_size)
+            runner.add(strategy, "live", paper=False)
+            runner.add_grid(DEFAULT_PARAM_GRID, price_source=args.price_source)
+            tasks.append(runner.report_every(args.shadow_interval))
+    for exchange, name, symbol, strategy in strategies:
+        # Each pair restarts on its own; one failing pair never cancels the others.
+        tasks.append(supervise(f"{name} {symbol}", partial(
+            quote_symbol, exchange, name, symbol, strategy, args.stream, managers.get(name), latency, risk,
+            buses.get(name), consolidated.get(symbol), runners.get((name, symbol)))))
+
+    print(f"[Live] Quoting {len(symbols)} symbol(s) on {', '.join(exchanges)}")
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for manager in managers.values():
+            await manager.cancel_all()
+        for journal in journals.values():
+            journal.close()
+        for bus in buses.values():
+            bus.close()
+        await close_exchanges(exchanges.values())
+
+
+def params_from_recordings(record_dir: str, exchange_name: str, symbol: str) -> dict:
+    """``generate_from_features`` over the recorded ticks of ``symbol`` (features cached per dataset)."""
+    from data.feature_store import FeatureStore
+    from data.tick_store import TickStore
+    from strategies.strategy_generator import generate_from_features
+
+    ticks = TickStore(record_dir)
+    if not ticks.days(exchange_name, symbol):
+        return {}
+    columns = ticks.load(exchange_name, symbol)
+    features = FeatureStore().features(columns, ticks.dataset_key(exchange_name, symbol))
+    try:
+        params = generate_from_features(features)
+    except ValueError as exc:
+        print("[Research] recorded ticks not used:", exc)
+        return {}
+    print(f"[Research] {exchange_name} {symbol} params from {len(columns)} recorded ticks:", params)
+    return params
+
+
+def build_risk_engine(symbols, strategies, var_limit: float) -> RiskEngine | None:
+    """EWMA-covariance VaR engine over the base assets, seeded with a year of daily closes."""
+    from analytics.risk import RiskEngine, closes_from_tiingo
+    from data.tiingo_connector import TiingoConnector
+
+    tiingo = TiingoConnector(TIINGO_API_KEY)
+    assets = sorted({symbol.split("/")[0] for symbol in symbols})
+    end = datetime.now(timezone.utc)
+    try:
+        closes = closes_from_tiingo(tiingo, assets, f"{end - timedelta(days=365):%Y-%m-%d}", f"{end:%Y-%m-%d}")
+    except Exception as exc:
+        print("[Risk] could not load history, VaR limit disabled:", exc)
+        return None
+    risk = RiskEngine.from_bars(closes, var_limit=var_limit)
+    inventory = {}
+    for _, _, _, strategy in strategies:
+        for asset, qty in strategy.inventory.items():
+            inventory[asset] = inventory.get(asset, 0.0) + qty
+    risk.set_positions(inventory)
+    print(f"[Risk] {', '.join(risk.assets)} VaR {risk.report()}")
+    return risk
+
+
+async def risk_bar_loop(risk: RiskEngine):
+    """Feed the engine one bar per UTC day, closing at the last marks (it is seeded with daily bars)."""
     while True:
+        now = datetime.now(timezone.utc)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        await asyncio.sleep((midnight - now).total_seconds())
+        closes = risk.prices.copy()
+        if (closes == closes).any():
+            risk.update_prices(closes)
+            print(f"[Risk] daily bar {', '.join(risk.assets)} VaR {risk.report()}")
+
+
+async def cancel_stray_orders(exchange, journal: Journal, symbol: str):
+    """Cancel orders a previous run left resting (e.g. after a crash)."""
+    for order in journal.open_orders(symbol):
         try:
-            order_book = exchange.get_order_book(symbol)
-            strategy.on_tick(symbol, order_book)
-            await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            print("User interrupted, exiting.")
-            break
+            await exchange.cancel_order_async(order["id"], symbol)
         except Exception as exc:
-            print("Live error:", exc)
-            await asyncio.sleep(5)
+            print(f"[Journal] could not cancel stray {symbol} order {order['id']}:", exc)
+        journal.order_cancel(symbol, order["id"])
+
+
+async def feed_books(exchange, exchange_name: str, symbols, on_book, *, stream: bool, bus: bool):
+    """Call ``on_book(symbol, book)`` for every update from the bus, the WebSocket stream or polling."""
+    if bus:
+        bus = MarketBusReader(bus_name(exchange_name))
+
+        async def follow(sym):
+            async for book in bus.subscribe(sym):
+                on_book(sym, book)
+
+        try:
+            await asyncio.gather(*(follow(sym) for sym in symbols))
+        finally:
+            bus.close()
+    if stream:
+        await asyncio.gather(*(
+            exchange.stream_order_book(sym, lambda book, sym=sym: on_book(sym, book))
+            for sym in symbols
+        ))
+    while True:
+        books = await asyncio.gather(*(exchange.get_book_async(sym) for sym in symbols), return_exceptions=True)
+        for sym, book in zip(symbols, books):
+            if isinstance(book, Exception):
+                print(f"Feed error [{sym}]:", book)
+            else:
+                on_book(sym, book)
+        await asyncio.sleep(1)
+
+
+async def record_loop(args):
+    from data.tick_store import TickRecorder
+
+    exchange = build_exchange(args.exchange, args)
+    symbols = args.symbols or [args.symbol]
+    recorder = TickRecorder(args.record_dir, args.exchange, compress=args.compress)
+    print(f"[Record] {args.exchange} {symbols} -> {args.record_dir}")
+    try:
+        await feed_books(exchange, args.exchange, symbols, recorder.record, stream=args.stream, bus=args.bus)
+    finally:
+        recorder.close()
+        await close_exchanges([exchange])
+
+
+async def publish_loop(args):
+    """Feed handler: the only process polling/streaming this exchange; consumers read the bus."""
+    from data.market_bus import MarketBusWriter
+
+    exchange = build_exchange(args.exchange, args)
+    symbols = args.symbols or [args.symbol]
+    bus = MarketBusWriter(bus_name(args.exchange), symbols)
+    print(f"[Bus] Publishing {args.exchange} {symbols} on {bus_name(args.exchange)}")
+    try:
+        await asyncio.gather(
+            feed_books(exchange, args.exchange, symbols, bus.publish, stream=args.stream, bus=False),
+            bus.heartbeat(),
+        )
+    finally:
+        bus.close()
+        await close_exchanges([exchange])
 
 
 if __name__ == "__main__":
     _args = cli()
-    asyncio.run(live_loop(_args))
\ No newline at end of file
+    if _args.publish:
+        _main = publish_loop(_args)
+    elif _args.record:
+        _main = record_loop(_args)
+    else:
+        _main = live_loop(_args)
+    try:
+        asyncio.run(_main)
+    except KeyboardInterrupt:
+        print("User interrupted, exiting.")
\ No newline at end of file
@@ -1,2 +1,3 @@
 from .base_strategy import BaseStrategy  # noqa
-from .bookrunner import BookrunnerStrategy  # noqa
\ No newline at end of file
+from .bookrunner import BookrunnerStrategy  # noqa
+from .runner import StrategyRunner  # noqa
\ No newline at end of file
@@ -1,15 +1,99 @@
-from typing import Iterable, Dict, Any
+from typing import Iterable, Iterator, Dict, Any
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from data.order_book import BookColumns
 
 from .base_strategy import BaseStrategy
+from .fill_simulator import FillSimulator
 
 class Backtester:
-    """Naive back-tester that feeds pre-loaded order book snapshots to a strategy."""
+    """Back-tester that feeds order book snapshots to a strategy.
+
+    ``snapshots`` may be an iterable of ccxt-style dicts / ``OrderBook`` objects, a
+    ``BookColumns`` series, or an iterable of ``BookColumns`` batches (e.g.
+    ``TickStore.iter_batches``), which is consumed lazily one batch at a time.
+    Strategies implementing ``on_ticks_batch`` are run one vectorized call per
+    batch; others get per-tick ``on_tick``.
 
-    def __init__(self, strategy: BaseStrategy, snapshots: Iterable[Dict[str, Any]], symbol: str):
+    ``features`` (``data.feature_store.Features`` of the same rows) is handed to
+    ``on_ticks_batch`` batch by batch, so many back-tests over one dataset share
+    one feature computation.
+    """
+
+    def __init__(self, strategy: BaseStrategy, snapshots: Iterable[Dict[str, Any]] | BookColumns, symbol: str,
+                 features=None):
         self.strategy = strategy
         self.snapshots = snapshots
         self.symbol = symbol
+        self.features = features
+
+    def run(self, batch: bool = True) -> pd.DataFrame:
+        """Run the back-test and return the quote series (timestamp, bid_quote, ask_quote)."""
+        on_ticks_batch = getattr(self.strategy, "on_ticks_batch", None) if batch else None
+        if on_ticks_batch is None:
+            return self._run_scalar()
+
+        frames, offset = [], 0
+        for columns in self._batches():
+            kwargs = {}
+            if self.features is not None:
+                kwargs["features"] = self.features.between(offset, offset + len(columns))
+                offset += len(columns)
+            quotes = on_ticks_batch(self.symbol, columns, **kwargs)
+            frames.append(pd.DataFrame({"timestamp": columns.timestamp, **quotes}))
+        if not frames:
+            return self._frame([], [], [])
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def simulate(self, **kwargs: Any) -> pd.DataFrame:
+        """Replay through a ``FillSimulator`` so quotes rest, queue and fill.
+
+        Keyword arguments go to ``FillSimulator`` (which also gets ``features``); returns
+        its per-tick PnL frame.
+        """
+        kwargs.setdefault("features", self.features)
+        return FillSimulator(self.strategy, self.symbol, **kwargs).run(self._batches())
+
+    def _batches(self) -> Iterator[BookColumns]:
+        if isinstance(self.snapshots, BookColumns):
+            yield self.snapshots
+            return
+        items = iter(self.snapshots)
+        first = next(items, None)
+        if first is None:
+            return
+        if isinstance(first, BookColumns):
+            yield first
+            yield from items
+        else:
+            yield BookColumns.from_snapshots(itertools.chain([first], items))
+
+    def _snapshots(self) -> Iterator:
+        if isinstance(self.snapshots, BookColumns):
+            yield from self.snapshots.iter_snapshots(self.symbol)
+            return
+        for item in self.snapshots:
+            if isinstance(item, BookColumns):
+                yield from item.iter_snapshots(self.symbol)
+            else:
+                yield item
+
+    def _run_scalar(self) -> pd.DataFrame:
+        timestamps, bids, asks = [], [], []
+        for snapshot in self._snapshots():
+            self.strategy.on_tick(self.symbol, snapshot)
+            timestamps.append(snapshot.get("timestamp") or 0)
+            bids.append(self.strategy.bid_quote)
+            asks.append(self.strategy.ask_quote)
+        return self._frame(timestamps, bids, asks)
 
-    def run(self):
-        for snapshot in self.snapshots:
-            self.strategy.on_tick(self.symbol, snapshot)
\ No newline at end of file
+    @staticmethod
+    def _frame(timestamps, bids, asks) -> pd.DataFrame:
+        return pd.DataFrame({
+            "timestamp": np.asarray(timestamps, dtype=np.int64),
+            "bid_quote": np.asarray(bids, dtype=np.float64),
+            "ask_quote": np.asarray(asks, dtype=np.float64),
+        })
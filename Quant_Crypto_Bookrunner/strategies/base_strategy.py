@@ -2,16 +2,32 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict
 
 class BaseStrategy(ABC):
-    """Abstract base class all strategies must inherit from."""
+    """Abstract base class all strategies must inherit from.
+
+    Strategies may also implement ``on_ticks_batch(symbol, columns)`` taking a
+    ``BookColumns`` series and returning arrays of quotes; the ``Backtester`` uses it
+    when present and falls back to per-tick ``on_tick`` otherwise.
+
+    Live strategies call ``restore`` with a ``data.journal.Journal`` to pick up the
+    inventory of a previous run; inventory changes are journaled from then on.
+    With ``risk`` set to an ``analytics.risk.RiskEngine``, every inventory change is
+    also applied to its positions.
+    """
 
     def __init__(self, exchange):
         self.exchange = exchange
         self.tick_count = 0
         self.inventory: Dict[str, float] = {}
+        # Last quotes decided by on_tick (None until the strategy quotes).
+        self.bid_quote: float | None = None
+        self.ask_quote: float | None = None
+        self.journal = None
+        self._journal_symbol = ""
+        self.risk = None
 
     @abstractmethod
     def on_tick(self, symbol: str, market_data: Dict[str, Any]):
-        """Called on each new market data update."""
+        """Called on each new market data update (a ccxt-style dict or an ``OrderBook``)."""
         ...
 
     @abstractmethod
@@ -19,6 +35,21 @@ class BaseStrategy(ABC):
         """Called when an order is filled (or partially filled)."""
         ...
 
+    def restore(self, journal, symbol: str):
+        """Load ``symbol``'s inventory and tick count from ``journal`` and journal changes to it."""
+        state = journal.state_for(symbol)
+        self.inventory.update(state["inventory"])
+        self.tick_count = state["tick_count"]
+        journal.register(symbol, self)
+        self.journal = journal
+        self._journal_symbol = symbol
+
     # Utility
-    def _update_inventory(self, asset: str, delta: float):
-        self.inventory[asset] = self.inventory.get(asset, 0.0) + delta
\ No newline at end of file
+    def _update_inventory(self, asset: str, delta: float, order: Dict[str, Any] | None = None):
+        self.inventory[asset] = self.inventory.get(asset, 0.0) + delta
+        order = order or {}
+        if self.risk is not None and asset in self.risk.index:
+            self.risk.apply_fill(asset, delta, order.get("price"))
+        if self.journal is not None:
+            self.journal.fill(self._journal_symbol, asset, delta, order.get("price") or 0.0,
+                              str(order.get("id") or ""), order.get("timestamp"))
\ No newline at end of file
@@ -1,10 +1,25 @@
 from typing import Any, Dict
-import statistics
+
+import numpy as np
+
+from data.order_book import BookColumns, microprice, top_of_book
 
 from .base_strategy import BaseStrategy
 
 SPREAD_BPS = 10  # 0.10% quoted spread
 
+
+def _round_cents(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``round(x, 2)`` that matches Python's result bit for bit."""
+    scaled = values * 100
+    out = np.round(scaled) / 100
+    # ``scaled`` is itself rounded, so within an ulp of a half-cent np.round can
+    # disagree with Python's exact decimal rounding; redo those few in Python.
+    suspect = np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(np.abs(scaled))
+    for i in np.flatnonzero(suspect):
+        out[i] = round(float(values[i]), 2)
+    return out
+
 class BookrunnerStrategy(BaseStrategy):
     """Simple passive maker/Bookrunner strategy.
 
@@ -15,22 +30,41 @@ class BookrunnerStrategy(BaseStrategy):
     inventory_clip : float
         Maximum inventory (in base asset units) we allow before skewing quotes.
     hold_time : int
-        Placeholder for how long we keep orders alive (seconds).
+        How long we keep orders alive (seconds) before they expire.
+    verbose : bool
+        Print periodic quote lines and fills (disable for back-tests and sweeps).
+    price_source : str
+        Fair price quoted around: ``"mid"`` or the size-weighted ``"microprice"``.
+    reference : ConsolidatedBook, optional
+        Take the fair price from this book (e.g. the cross-venue NBBO) instead of
+        the ticking venue's own book.  Live only; ``on_ticks_batch`` ignores it.
     """
 
-    def __init__(self, exchange, *, spread_bps: int = 10, inventory_clip: float = 0.2, hold_time: int = 60):
+    def __init__(self, exchange, *, spread_bps: int = 10, inventory_clip: float = 0.2, hold_time: int = 60,
+                 verbose: bool = True, price_source: str = "mid", reference=None):
         super().__init__(exchange)
+        if price_source not in ("mid", "microprice"):
+            raise ValueError("price_source must be 'mid' or 'microprice'")
         self.spread_bps = spread_bps
         self.inventory_clip = inventory_clip
         self.hold_time = hold_time
+        self.verbose = verbose
+        self.price_source = price_source
+        self.reference = reference
 
     # -------- Strategy Core -------- #
     def on_tick(self, symbol: str, market_data: Dict[str, Any]):
-        self.tick_count += 1
+        book = market_data if self.reference is None else self.reference
+        if self.price_source == "microprice":
+            mid = microprice(book)
+        else:
+            bid_price, ask_price = top_of_book(book)
+            mid = (bid_price + ask_price) / 2
+        self.on_fair_price(symbol, mid)
 
-        bid_price = market_data["bids"][0][0]
-        ask_price = market_data["asks"][0][0]
-        mid = statistics.mean([bid_price, ask_price])
+    def on_fair_price(self, symbol: str, mid: float):
+        """``on_tick`` with the fair price already known (e.g. a cached ``price_source`` feature)."""
+        self.tick_count += 1
 
         # Adjust spread for inventory: widen if over clip
         inventory = self.inventory.get(symbol.split("/")[0], 0.0)
@@ -40,14 +74,48 @@ class BookrunnerStrategy(BaseStrategy):
         half_spread = mid * spread_bps_eff / 10_000
         bid_quote = round(mid - half_spread, 2)
         ask_quote = round(mid + half_spread, 2)
+        self.bid_quote, self.ask_quote = bid_quote, ask_quote
 
         # Here we could place/modify orders; for demo just print occasionally
-        if self.tick_count % 10 == 0:
+        if self.verbose and self.tick_count % 10 == 0:
             print(
                 f"[Bookrunner] {symbol} mid={mid:.2f} bid_quote={bid_quote:.2f} "
                 f"ask_quote={ask_quote:.2f} inv={inventory:.4f}"
             )
 
+    def on_ticks_batch(
+        self, symbol: str, columns: BookColumns, inventory: np.ndarray | None = None, features=None
+    ) -> Dict[str, np.ndarray]:
+        """Vectorized ``on_tick`` over a whole series; quotes match the scalar path exactly.
+
+        ``inventory`` optionally gives the base-asset position at each tick (e.g. from
+        a fill simulation); by default the current inventory is held for the batch.
+        ``features`` (``data.feature_store.Features`` for these rows) supplies the
+        precomputed fair price instead of deriving it from ``columns``.
+        """
+        n = len(columns)
+        self.tick_count += n
+        if inventory is None:
+            inventory = self.inventory.get(symbol.split("/")[0], 0.0)
+        inv_factor = np.minimum(np.abs(inventory) / self.inventory_clip, 1.0)
+        spread_bps_eff = self.spread_bps * (1 + inv_factor)
+
+        if features is not None:
+            mid = features[self.price_source]
+        else:
+            mid = (columns.bid + columns.ask) / 2
+            if self.price_source == "microprice":
+                total = columns.bid_size + columns.ask_size
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    micro = (columns.bid * columns.ask_size + columns.ask * columns.bid_size) / total
+                mid = np.where(total == 0.0, mid, micro)
+        half_spread = mid * spread_bps_eff / 10_000
+        bid_quote = _round_cents(mid - half_spread)
+        ask_quote = _round_cents(mid + half_spread)
+        if n:
+            self.bid_quote, self.ask_quote = float(bid_quote[-1]), float(ask_quote[-1])
+        return {"bid_quote": bid_quote, "ask_quote": ask_quote}
+
     def on_order_fill(self, order: Dict[str, Any]):
         side = order["side"].lower()
         filled = float(order["filled"])
@@ -55,5 +123,6 @@ class BookrunnerStrategy(BaseStrategy):
         base_asset = order["symbol"].split("/")[0]
 
         delta = filled if side == "buy" else -filled
-        self._update_inventory(base_asset, delta)
-        print(f"[Fill] {side.upper()} {filled} {base_asset} @ {price}")
\ No newline at end of file
+        self._update_inventory(base_asset, delta, order)
+        if self.verbose:
+            print(f"[Fill] {side.upper()} {filled} {base_asset} @ {price}")
\ No newline at end of file
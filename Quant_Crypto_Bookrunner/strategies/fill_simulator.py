@@ -0,0 +1,271 @@
+from typing import Any, Dict, Iterable, Iterator, List
+import heapq
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+from data.order_book import BookColumns
+
+from .base_strategy import BaseStrategy
+
+BUY, SELL = 0, 1
+_SIDE_NAME = ("buy", "sell")
+
+# Scheduled event kinds.
+_PLACE, _CANCEL, _EXPIRE = 0, 1, 2
+
+
+class SimOrder:
+    """A simulated resting limit order and its estimated queue position."""
+
+    __slots__ = ("id", "side", "price", "amount", "filled", "queue_ahead", "level_size", "live", "cancel_sent")
+
+    def __init__(self, order_id: int, side: int, price: float, amount: float):
+        self.id = order_id
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.queue_ahead: float | None = None  # None until the order's level is visible
+        self.level_size: float | None = None
+        self.live = True
+        self.cancel_sent = False
+
+
+class FillSimulator:
+    """Event-driven back-test core that fills a strategy's quotes against recorded books.
+
+    Book updates are replayed in time order; order entry, cancels and ``hold_time``
+    expiries are scheduled on a heap and delivered ``latency_ms`` after the tick
+    that caused them.  After each tick the strategy's ``bid_quote``/``ask_quote``
+    become resting orders of ``order_size``.  An order joins the back of the queue
+    at its price (the size shown there on arrival) and advances as that level
+    shrinks; size removed beyond our queue position fills us, and a book that
+    trades through our price fills the remainder.  Fills are charged
+    ``maker_fee_bps`` and delivered through ``strategy.on_order_fill``, one update
+    per fill with ``filled`` set to the fill quantity.
+
+    ``features`` (``data.feature_store.Features`` of the replayed rows) supplies the
+    fair price of strategies with ``on_fair_price`` (``BookrunnerStrategy``) from
+    the cached ``price_source`` feature instead of deriving it from each book.
+
+    Queue estimation uses the depth stored in ``BookColumns.bids``/``asks`` when
+    present.  An order whose level is outside the known depth (with top-of-book
+    data, any order behind the best price) cannot fill until the level becomes
+    visible, and then joins behind all of the size shown there.
+    """
+
+    def __init__(self, strategy: BaseStrategy, symbol: str, *, order_size: float = 0.01,
+                 latency_ms: float = 50.0, maker_fee_bps: float = 0.0, hold_time: float | None = None,
+                 features=None):
+        self.strategy = strategy
+        self.symbol = symbol
+        self.base_asset = symbol.split("/")[0]
+        self.order_size = order_size
+        self.latency_ms = latency_ms
+        self.fee_rate = maker_fee_bps / 10_000
+        if hold_time is None:
+            hold_time = getattr(strategy, "hold_time", None)
+        self.hold_ms = hold_time * 1000 if hold_time else None
+        self.features = features if hasattr(strategy, "on_fair_price") else None
+        self.fills: List[Dict[str, Any]] = []
+        self._reset()
+
+    def _reset(self):
+        self._events: list = []
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._working: List[SimOrder | None] = [None, None]
+        self._pending: List[SimOrder | None] = [None, None]
+        self._book = (math.nan, math.nan, 0.0, 0.0, None, None)
+        self.cash = 0.0
+        self.position = 0.0
+        self.fees = 0.0
+        self.fills = []
+        self._last_equity = 0.0
+        self._offset = 0
+
+    # ------------- Driver ------------- #
+    def run(self, data: BookColumns | Iterable[BookColumns]) -> pd.DataFrame:
+        """Replay ``data`` and return per-tick ``timestamp, pnl, inventory, fills``.
+
+        ``pnl`` is the change in mark-to-mid equity net of fees, ready for
+        ``analytics.post_trade.summary``.
+        """
+        self._reset()
+        frames = [self._run_batch(batch) for batch in _batches(data)]
+        if not frames:
+            return pd.DataFrame({"timestamp": [], "pnl": [], "inventory": [], "fills": []})
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def _run_batch(self, cols: BookColumns) -> pd.DataFrame:
+        n = len(cols)
+        ts_list = cols.timestamp.tolist()
+        bid_list, ask_list = cols.bid.tolist(), cols.ask.tolist()
+        bsz_list, asz_list = cols.bid_size.tolist(), cols.ask_size.tolist()
+        depth_bids, depth_asks = cols.bids, cols.asks
+        equity = np.empty(n)
+        inventory = np.empty(n)
+        fill_count = np.zeros(n, dtype=np.int64)
+        strategy, symbol, events, working = self.strategy, self.symbol, self._events, self._working
+        fair = None
+        if self.features is not None:
+            fair = self.features[strategy.price_source][self._offset: self._offset + n].tolist()
+        self._offset += n
+
+        for i in range(n):
+            t = ts_list[i]
+            while events and events[0][0] <= t:
+                self._dispatch(heapq.heappop(events))
+
+            bid, ask = bid_list[i], ask_list[i]
+            self._book = (bid, ask, bsz_list[i], asz_list[i],
+                          depth_bids[i] if depth_bids is not None else None,
+                          depth_asks[i] if depth_asks is not None else None)
+            before = len(self.fills)
+            if working[BUY] is not None:
+                self._advance(working[BUY], t)
+            if working[SELL] is not None:
+                self._advance(working[SELL], t)
+            fill_count[i] = len(self.fills) - before
+
+            if fair is not None:
+                strategy.on_fair_price(symbol, fair[i])
+            else:
+                strategy.on_tick(symbol, {"timestamp": t, "bids": [[bid, bsz_list[i]]], "asks": [[ask, asz_list[i]]]})
+            self._requote(t, BUY, strategy.bid_quote)
+            self._requote(t, SELL, strategy.ask_quote)
+
+            inventory[i] = self.position
+            equity[i] = self.cash + self.position * (bid + ask) / 2
+
+        start = self._last_equity
+        self._last_equity = equity[-1] if n else start
+        return pd.DataFrame({
+            "timestamp": cols.timestamp,
+            "pnl": np.diff(equity, prepend=start),
+            "inventory": inventory,
+            "fills": fill_count,
+        })
+
+    # ------------- Event handling ------------- #
+    def _schedule(self, t: float, kind: int, order: SimOrder):
+        heapq.heappush(self._events, (t, next(self._seq), kind, order))
+
+    def _dispatch(self, event):
+        t, _, kind, order = event
+        side = order.side
+        if kind == _PLACE:
+            if not order.live:
+                return
+            self._pending[side] = None
+            self._working[side] = order
+            size = self._level_size(order)
+            order.level_size = order.queue_ahead = size
+            if self.hold_ms:
+                self._schedule(t + self.hold_ms, _EXPIRE, order)
+        elif self._working[side] is order:  # cancel or expiry reached the venue
+            order.live = False
+            self._working[side] = None
+
+    def _requote(self, t: float, side: int, price: float | None):
+        if price is None or price != price:
+            return
+        current = self._pending[side] or self._working[side]
+        if current is not None and current.price == price:
+            return
+        working = self._working[side]
+        if working is not None and not working.cancel_sent:
+            working.cancel_sent = True
+            self._schedule(t + self.latency_ms, _CANCEL, working)
+        if self._pending[side] is not None:
+            self._pending[side].live = False
+        order = SimOrder(next(self._ids), side, price, self.order_size)
+        self._pending[side] = order
+        self._schedule(t + self.latency_ms, _PLACE, order)
+
+    # ------------- Queue model ------------- #
+    def _level_size(self, order: SimOrder) -> float | None:
+        """Size resting at the order's price, 0 if empty, None if outside the known depth."""
+        bid, ask, bid_size, ask_size, bids, asks = self._book
+        price = order.price
+        if order.side == BUY:
+            if price > bid or bid != bid:
+                return 0.0
+            if price == bid:
+                return bid_size
+            levels = bids
+        else:
+            if price < ask or ask != ask:
+                return 0.0
+            if price == ask:
+                return ask_size
+            levels = asks
+        if levels is None:
+            return None
+        prices = levels[:, 0].tolist()  # list search beats NumPy calls at this size
+        if price in prices:
+            return float(levels[prices.index(price), 1])
+        worst = prices[-1]
+        if worst != worst:
+            return 0.0  # the book is shallower than the recorded depth, so the level is empty
+        inside = price >= worst if order.side == BUY else price <= worst
+        return 0.0 if inside else None
+
+    def _advance(self, order: SimOrder, t: float):
+        bid, ask = self._book[0], self._book[1]
+        if (order.side == BUY and ask <= order.price) or (order.side == SELL and bid >= order.price):
+            self._fill(order, order.amount - order.filled, t)
+            return
+        size = self._level_size(order)
+        if size is None:
+            return
+        if order.level_size is None:
+            # Level just came into view: we can be no further ahead than everything shown there.
+            order.level_size = order.queue_ahead = size
+            return
+        if size < order.level_size:
+            removed = order.level_size - size
+            ahead = min(order.queue_ahead, removed)
+            order.queue_ahead -= ahead
+            if removed > ahead:
+                self._fill(order, min(removed - ahead, order.amount - order.filled), t)
+        order.level_size = size
+
+    def _fill(self, order: SimOrder, qty: float, t: float):
+        if qty <= 0.0:
+            return
+        order.filled += qty
+        notional = qty * order.price
+        fee = notional * self.fee_rate
+        if order.side == BUY:
+            self.position += qty
+            self.cash -= notional + fee
+        else:
+            self.position -= qty
+            self.cash += notional - fee
+        self.fees += fee
+        if order.filled >= order.amount:
+            order.live = False
+            self._working[order.side] = None
+        fill = {
+            "id": str(order.id),
+            "symbol": self.symbol,
+            "side": _SIDE_NAME[order.side],
+            "price": order.price,
+            "amount": order.amount,
+            "filled": qty,
+            "fee": fee,
+            "timestamp": t,
+        }
+        self.fills.append(fill)
+        self.strategy.on_order_fill(fill)
+
+
+def _batches(data: BookColumns | Iterable[BookColumns]) -> Iterator[BookColumns]:
+    if isinstance(data, BookColumns):
+        yield data
+    else:
+        yield from data
@@ -0,0 +1,355 @@
+from typing import Any, Callable, Dict, List, Tuple
+import asyncio
+import time
+
+import ccxt
+
+from analytics.latency import NULL_RECORDER, LatencyRecorder, now_ns
+
+SIDES = ("buy", "sell")
+# Fill quantities at or below this are float residue, not fills.
+FILL_EPSILON = 1e-12
+
+
+class RestingOrder:
+    """An order we believe is resting on the venue.
+
+    ``cancelling`` is set once a cancel has been sent; the order stays tracked until
+    the venue confirms it is gone, so its side is not re-quoted on top of it.
+    """
+
+    __slots__ = ("id", "side", "price", "amount", "placed_at", "cancelling")
+
+    def __init__(self, order_id: str, side: str, price: float, amount: float, placed_at: float):
+        self.id = order_id
+        self.side = side
+        self.price = price
+        self.amount = amount
+        self.placed_at = placed_at
+        self.cancelling = False
+
+
+class QuoteManager:
+    """Order-management layer between strategies and an async connector.
+
+    Tracks one resting order per side per symbol and reconciles it with the
+    strategy's latest desired quotes, sending requests only when needed:
+
+    * quotes within ``price_tolerance_bps`` / ``size_tolerance`` of the resting
+      order are left alone;
+    * a changed quote is amended in one request where the venue supports
+      ``editOrder``, otherwise cancelled and re-created once the cancel is
+      confirmed; an unconfirmed cancel is checked against ``fetch_open_orders``
+      and retried on the next reconcile, never quoted over;
+    * several creates or cancels for a symbol go out as one ``createOrders`` /
+      ``cancelOrders`` batch when supported;
+    * orders older than ``hold_time`` seconds are refreshed;
+    * all requests for a reconcile are pipelined concurrently;
+    * fills are found by ``track_fills`` (``fetch_open_orders`` plus ``fetch_order``
+      for orders that left the book) or pushed by the venue through ``record_fill``,
+      and passed to ``on_fill`` with ``filled`` set to the new quantity; a side the
+      venue emptied (filled or cancelled) is re-quoted at once.
+
+    Strategies call ``submit`` from their tick handler; ``run`` (a background task)
+    coalesces bursts of ticks so each symbol reconciles only against its newest quotes.
+    Round-trip time of each reconcile is recorded as the ``order_send`` stage, and
+    placed, cancelled and filled orders are logged to ``journal`` when one is given
+    (the fills themselves are journaled by the strategy ``on_fill`` reaches).
+    """
+
+    def __init__(self, connector, *, order_size: float, price_tolerance_bps: float = 1.0,
+                 size_tolerance: float = 0.0, hold_time: float | None = None,
+                 latency: LatencyRecorder = NULL_RECORDER, journal=None,
+                 on_fill: Callable[[Dict[str, Any]], Any] | None = None):
+        self.connector = connector
+        self.order_size = order_size
+        self.price_tolerance_bps = price_tolerance_bps
+        self.size_tolerance = size_tolerance
+        self.hold_time = hold_time
+        self.latency = latency
+        self.journal = journal
+        self.on_fill = on_fill
+        self.orders: Dict[str, Dict[str, RestingOrder]] = {}
+        self.requests = 0
+        self.skipped = 0
+        self._desired: Dict[str, Tuple[float | None, float | None, float]] = {}
+        self._last: Dict[str, Tuple[float | None, float | None, float]] = {}
+        self._filled: Dict[str, float] = {}  # quantity reported per order id
+        self._dirty = asyncio.Event()
+
+    # ------------- Strategy-facing ------------- #
+    def submit(self, symbol: str, bid: float | None, ask: float | None, amount: float | None = None):
+        """Record the desired quotes for ``symbol``; ``run`` reconciles them."""
+        self._desired[symbol] = (bid, ask, amount or self.order_size)
+        self._dirty.set()
+
+    async def run(self):
+        """Reconcile submitted quotes forever; also wakes up to expire stale orders."""
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=self.hold_time)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+            desired, self._desired = self._desired, {}
+            self._last.update(desired)
+            todo = desired if desired else self._last  # on timeout, re-check expiry
+            await asyncio.gather(*(self.update(sym, *quote) for sym, quote in todo.items()))
+
+    # ------------- Reconciliation ------------- #
+    async def update(self, symbol: str, bid: float | None, ask: float | None, amount: float | None = None) -> int:
+        """Bring resting orders for ``symbol`` in line with ``bid``/``ask``; return requests sent."""
+        amount = amount or self.order_size
+        resting = self.orders.setdefault(symbol, {})
+        now = time.monotonic()
+        cancels: List[RestingOrder] = []
+        creates: List[Tuple[str, float]] = []
+        replaces: List[Tuple[str, float]] = []  # created only once the side's cancel is confirmed
+        edits: List[Tuple[RestingOrder, float]] = []
+        can_edit = self.connector.supports("editOrder")
+
+        for side, price in zip(SIDES, (bid, ask)):
+            order = resting.get(side)
+            if order is not None and (order.cancelling or self.hold_time and now - order.placed_at >= self.hold_time):
+                order.cancelling = True
+                cancels.append(order)
+                if price is not None:
+                    replaces.append((side, price))
+            elif price is None:
+                if order is not None:
+                    order.cancelling = True
+                    cancels.append(order)
+            elif order is None:
+                creates.append((side, price))
+            elif self._unchanged(order, price, amount):
+                self.skipped += 1
+            elif can_edit:
+                edits.append((order, price))
+            else:
+                order.cancelling = True
+                cancels.append(order)
+                replaces.append((side, price))
+
+        calls = []
+        if len(cancels) > 1 and self.connector.supports("cancelOrders"):
+            calls.append(self._cancel_batch(symbol, cancels))
+        else:
+            calls.extend(self._cancel(symbol, order) for order in cancels)
+        calls.extend(self._edit(symbol, order, price, amount) for order, price in edits)
+        calls.extend(self._creates(symbol, creates, amount))
+
+        if not calls:
+            return 0
+        start = now_ns()
+        await asyncio.gather(*calls)
+        sent = len(calls)
+        if replaces:
+            # Sides whose cancel was not confirmed keep their order and are retried next time.
+            replaces = [(side, price) for side, price in replaces if side not in resting]
+            later = self._creates(symbol, replaces, amount)
+            await asyncio.gather(*later)
+            sent += len(later)
+        self.requests += sent
+        self.latency.histogram(self.connector.exchange.id, symbol, "order_send").record_since(start)
+        return sent
+
+    async def cancel_all(self, attempts: int = 3):
+        """Cancel every tracked order (e.g. on shutdown), retrying those the venue has not confirmed.
+
+        Orders still unconfirmed after ``attempts`` stay open in the journal, so the
+        next run cancels them as strays.
+        """
+        for attempt in range(attempts):
+            pending = [(symbol, order) for symbol, resting in self.orders.items() for order in resting.values()]
+            if not pending:
+                return
+            if attempt:
+                await asyncio.sleep(0.5 * attempt)
+            for _, order in pending:
+                order.cancelling = True
+            await asyncio.gather(*(self._cancel(symbol, order) for symbol, order in pending))
+        for symbol, resting in self.orders.items():
+            for order in resting.values():
+                print(f"[Quotes] {symbol} {order.side} order {order.id} may still be live: cancel not confirmed")
+
+    # ------------- Fills ------------- #
+    async def track_fills(self, interval: float = 1.0):
+        """Check tracked orders for fills every ``interval`` seconds, forever."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.gather(*(self.reconcile_fills(symbol) for symbol, resting in list(self.orders.items())
+                                   if resting))
+
+    async def reconcile_fills(self, symbol: str):
+        """Report new fills of ``symbol``'s tracked orders and untrack those no longer open."""
+        tracked = list(self.orders.get(symbol, {}).values())
+        if not tracked:
+            return
+        try:
+            open_orders = await self.connector.fetch_open_orders_async(symbol)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} fill check failed:", exc)
+            return
+        by_id = {str(o["id"]): o for o in open_orders}
+        gone = []
+        for order in tracked:
+            info = by_id.get(str(order.id))
+            if info is None:
+                gone.append(order)
+            else:
+                self._apply(symbol, order, info)
+        await asyncio.gather(*(self._settle(symbol, order) for order in gone))
+
+    def record_fill(self, fill: Dict[str, Any]):
+        """Take one fill pushed by the venue (``filled`` is the fill's own quantity)."""
+        symbol, order_id = fill["symbol"], str(fill["id"])
+        self._report(symbol, order_id, fill["side"], float(fill["filled"]), fill["price"], fill.get("timestamp"))
+        order = self.orders.get(symbol, {}).get(fill["side"])
+        if fill.get("status") == "closed" and order is not None and str(order.id) == order_id:
+            self._untrack(symbol, order, filled=True)
+
+    def _apply(self, symbol: str, order: RestingOrder, info: Dict[str, Any]):
+        """Report what ``info`` (a ccxt order) shows filled beyond what was reported; untrack it once closed."""
+        order_id = str(order.id)
+        new = float(info.get("filled") or 0.0) - self._filled.get(order_id, 0.0)
+        if new > FILL_EPSILON:
+            price = info.get("average") or info.get("price") or order.price
+            self._report(symbol, order_id, order.side, new, price, info.get("lastTradeTimestamp"))
+        if info.get("status") == "closed":
+            self._untrack(symbol, order, filled=True)
+
+    def _report(self, symbol: str, order_id: str, side: str, qty: float, price: float, timestamp: int | None):
+        self._filled[order_id] = self._filled.get(order_id, 0.0) + qty
+        if self.on_fill is not None:
+            self.on_fill({"id": order_id, "symbol": symbol, "side": side, "price": price, "filled": qty,
+                          "timestamp": timestamp})
+
+    async def _settle(self, symbol: str, order: RestingOrder):
+        """``order`` left the book: report any fill not seen yet, then untrack it."""
+        if self.orders.get(symbol, {}).get(order.side) is not order:
+            return  # already settled
+        try:
+            info = await self.connector.fetch_order_async(order.id, symbol)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} {order.side} order {order.id} status unknown:", exc)
+        else:
+            self._apply(symbol, order, info)
+            if info.get("status") == "open":
+                return  # still resting after all: look again next time
+        self._untrack(symbol, order)
+
+    def _requote(self, symbol: str):
+        """Reconcile ``symbol``'s last quotes again now (one of its sides emptied on the venue)."""
+        if symbol in self._last and symbol not in self._desired:
+            self._desired[symbol] = self._last[symbol]
+        self._dirty.set()
+
+    def _unchanged(self, order: RestingOrder, price: float, amount: float) -> bool:
+        moved_bps = abs(price - order.price) / order.price * 10_000
+        return moved_bps <= self.price_tolerance_bps and abs(amount - order.amount) <= self.size_tolerance
+
+    # ------------- Requests ------------- #
+    def _track(self, symbol: str, response: Dict[str, Any], side: str, price: float, amount: float):
+        order = RestingOrder(response["id"], side, price, amount, time.monotonic())
+        self.orders.setdefault(symbol, {})[side] = order
+        if self.journal is not None:
+            self.journal.order_new(symbol, str(response["id"]), side, price, amount)
+        # Marketable quotes may have (partly) filled on arrival.
+        self._apply(symbol, order, response)
+
+    def _untrack(self, symbol: str, order: RestingOrder, filled: bool = False):
+        resting = self.orders.get(symbol, {})
+        if resting.get(order.side) is not order:
+            return  # already settled
+        del resting[order.side]
+        self._filled.pop(str(order.id), None)
+        if self.journal is not None:
+            if filled:
+                self.journal.order_filled(symbol, str(order.id))
+            else:
+                self.journal.order_cancel(symbol, str(order.id))
+        if not order.cancelling:
+            self._requote(symbol)
+
+    def _creates(self, symbol: str, creates: List[Tuple[str, float]], amount: float) -> list:
+        if len(creates) > 1 and self.connector.supports("createOrders"):
+            return [self._create_batch(symbol, creates, amount)]
+        return [self._create(symbol, side, price, amount) for side, price in creates]
+
+    async def _create(self, symbol: str, side: str, price: float, amount: float):
+        try:
+            response = await self.connector.place_order_async(symbol, side, amount, price)
+            self._track(symbol, response, side, price, amount)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} {side} create failed:", exc)
+
+    async def _create_batch(self, symbol: str, creates: List[Tuple[str, float]], amount: float):
+        batch = [{"symbol": symbol, "type": "limit", "side": side, "amount": amount, "price": price}
+                 for side, price in creates]
+        try:
+            responses = await self.connector.create_orders_async(batch)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} batch create failed:", exc)
+            return
+        for (side, price), response in zip(creates, responses):
+            if response.get("id"):
+                self._track(symbol, response, side, price, amount)
+
+    async def _edit(self, symbol: str, order: RestingOrder, price: float, amount: float):
+        try:
+            response = await self.connector.edit_order_async(order.id, symbol, order.side, amount, price)
+            if str(response["id"]) != str(order.id):
+                # The venue amended by cancel-replace: the old id is gone.
+                order.cancelling = True
+                self._untrack(symbol, order)
+            self._track(symbol, response, order.side, price, amount)
+        except ccxt.OrderNotFound:
+            # Filled or expired on the venue since we last looked: settle it and quote afresh.
+            order.cancelling = True
+            await self._settle(symbol, order)
+            await self._create(symbol, order.side, price, amount)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} {order.side} amend failed:", exc)
+
+    async def _cancel(self, symbol: str, order: RestingOrder):
+        try:
+            response = await self.connector.cancel_order_async(order.id, symbol)
+        except ccxt.OrderNotFound:
+            await self._settle(symbol, order)  # filled (or cancelled) before the cancel arrived
+            return
+        except Exception as exc:
+            print(f"[Quotes] {symbol} cancel {order.id} failed:", exc)
+            for gone in await self._gone(symbol, [order]):
+                await self._settle(symbol, gone)
+            return
+        if isinstance(response, dict):
+            self._apply(symbol, order, response)  # fills since the last check
+        self._untrack(symbol, order)
+
+    async def _cancel_batch(self, symbol: str, orders: List[RestingOrder]):
+        try:
+            responses = await self.connector.cancel_orders_async([o.id for o in orders], symbol)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} batch cancel failed:", exc)
+            await asyncio.gather(*(self._settle(symbol, order) for order in await self._gone(symbol, orders)))
+            return
+        by_id = {str(r["id"]): r for r in responses or () if isinstance(r, dict) and r.get("id")}
+        unconfirmed = []
+        for order in orders:
+            info = by_id.get(str(order.id))
+            if info is None:
+                unconfirmed.append(order)  # venues skip ids that already filled
+                continue
+            self._apply(symbol, order, info)
+            self._untrack(symbol, order)
+        await asyncio.gather(*(self._settle(symbol, order) for order in unconfirmed))
+
+    async def _gone(self, symbol: str, orders: List[RestingOrder]) -> List[RestingOrder]:
+        """Those of ``orders`` the venue no longer lists as open (none if it cannot be asked)."""
+        try:
+            open_orders = await self.connector.fetch_open_orders_async(symbol)
+        except Exception as exc:
+            print(f"[Quotes] {symbol} open-order check failed:", exc)
+            return []
+        open_ids = {str(o["id"]) for o in open_orders}
+        return [order for order in orders if str(order.id) not in open_ids]
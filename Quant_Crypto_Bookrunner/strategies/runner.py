@@ -0,0 +1,237 @@
+from typing import Any, Dict, Iterable, List
+import asyncio
+import time
+
+import numpy as np
+
+from data.order_book import microprice, top_of_book
+
+from .base_strategy import BaseStrategy
+from .bookrunner import BookrunnerStrategy, _round_cents
+
+# Per-slot state, one entry per hosted strategy.
+_ARRAYS = ("inventory", "position", "cash", "fees", "fills", "bid_quote", "ask_quote")
+
+
+class StrategyRunner:
+    """Many strategy instances for one symbol, driven by one feed.
+
+    ``on_book`` (the feed callback) reads the book's top of book once and
+    dispatches it to every hosted strategy:
+
+    * plain, non-verbose ``BookrunnerStrategy`` paper variants are evaluated together as one
+      NumPy pass over arrays of their parameters and inventories, so hundreds of
+      variants cost about as much as one; their quotes match ``on_tick`` exactly.
+      Their objects are only brought up to date by ``sync`` (``report`` calls it);
+    * any other strategy (live ones, subclasses, ones with a ``reference`` book)
+      gets ``on_tick`` as usual.
+
+    Paper strategies' quotes rest as ``order_size`` orders, filled by any later
+    update that trades through them (best ask at or below our bid, best bid at or
+    above our ask) at the quote price, less ``maker_fee_bps``.  A resting quote is
+    only replaced by the strategy's current one once it has filled, been pulled or
+    rested ``hold_time`` seconds (by book timestamps), as the quote manager does
+    live; strategies without a ``hold_time`` requote on every update.  Live
+    strategies (``paper=False``) are only dispatched; their fills come from the
+    venue through ``on_order_fill``.
+    """
+
+    def __init__(self, symbol: str, *, order_size: float = 0.01, maker_fee_bps: float = 0.0):
+        self.symbol = symbol
+        self.base_asset = symbol.split("/")[0]
+        self.order_size = order_size
+        self.fee_rate = maker_fee_bps / 10_000
+        self.names: List[str] = []
+        self.strategies: List[BaseStrategy] = []
+        self.ticks = 0
+        self.mark = float("nan")
+        self.inventory = np.empty(0)
+        self.position = np.empty(0)
+        self.cash = np.empty(0)
+        self.fees = np.empty(0)
+        self.fills = np.empty(0, dtype=np.int64)
+        self.bid_quote = np.empty(0)
+        self.ask_quote = np.empty(0)
+        self._hold = np.empty(0)  # ms a paper quote rests before it is replaced
+        self._bid_placed = np.empty(0)
+        self._ask_placed = np.empty(0)
+        self._paper: List[bool] = []
+        self._batched: List[bool] = []
+        self._added_at: List[int] = []
+        self._scalar: List[int] = []
+        self._bank = np.empty(0, dtype=np.int64)
+        self._spread = np.empty(0)
+        self._clip = np.empty(0)
+        self._micro = np.empty(0, dtype=bool)
+        # The bank's quotes are only recomputed once one can change: after a fill,
+        # a new slot or an empty book (``_vacant``), or once the first expires.
+        self._vacant = True
+        self._bank_due = float("-inf")
+        self._top_bid = self._top_ask = float("nan")
+
+    # ------------- Set-up ------------- #
+    def add(self, strategy: BaseStrategy, name: str | None = None, *, paper: bool = True) -> int:
+        """Host ``strategy``; returns its slot.  ``paper=False`` marks the one trading live."""
+        slot = len(self.strategies)
+        self.names.append(name or f"strategy-{slot}")
+        self.strategies.append(strategy)
+        self._paper.append(paper)
+        self._added_at.append(self.ticks)
+        for field, value in zip(_ARRAYS, (strategy.inventory.get(self.base_asset, 0.0), 0.0, 0.0, 0.0, 0,
+                                          np.nan, np.nan)):
+            setattr(self, field, np.append(getattr(self, field), value))
+        self._hold = np.append(self._hold, 1000.0 * (getattr(strategy, "hold_time", 0) or 0))
+        self._bid_placed = np.append(self._bid_placed, np.nan)
+        self._ask_placed = np.append(self._ask_placed, np.nan)
+        batched = (paper and type(strategy) is BookrunnerStrategy and strategy.reference is None
+                   and strategy.journal is None and not strategy.verbose)
+        self._batched.append(batched)
+        self._vacant = True
+        if batched:
+            self._bank = np.append(self._bank, slot)
+            self._spread = np.append(self._spread, float(strategy.spread_bps))
+            self._clip = np.append(self._clip, float(strategy.inventory_clip))
+            self._micro = np.append(self._micro, strategy.price_source == "microprice")
+        else:
+            self._scalar.append(slot)
+        return slot
+
+    def add_grid(self, grid: Dict[str, Iterable[Any]], **kwargs: Any) -> List[int]:
+        """Add a paper ``BookrunnerStrategy`` for every point of ``grid`` (see ``sweep.expand_grid``)."""
+        from .sweep import expand_grid
+
+        slots = []
+        for params in expand_grid(grid):
+            strategy = BookrunnerStrategy(exchange=None, verbose=False, **kwargs, **params)
+            name = " ".join(f"{k}={v}" for k, v in params.items())
+            slots.append(self.add(strategy, name))
+        return slots
+
+    # ------------- Feed ------------- #
+    def on_book(self, book) -> None:
+        """Paper-fill resting quotes against ``book``, then requote every strategy."""
+        self.ticks += 1
+        bid, ask = top_of_book(book)
+        mid = (bid + ask) / 2
+        self.mark = mid
+        timestamp = book.get("timestamp")
+        now = timestamp if timestamp is not None else time.time() * 1000
+        self._paper_fills(bid, ask, timestamp)
+
+        if len(self._bank) and (self._vacant or now >= self._bank_due):
+            bank = self._bank
+            fair = np.where(self._micro, microprice(book), mid) if self._micro.any() else mid
+            inv_factor = np.minimum(np.abs(self.inventory[bank]) / self._clip, 1.0)
+            half_spread = fair * (self._spread * (1 + inv_factor)) / 10_000
+            quotes = _round_cents(np.concatenate((fair - half_spread, fair + half_spread)))
+            self._rest(bank, quotes[: len(bank)], quotes[len(bank):], now)
+            self._vacant = mid != mid  # an empty book pulled the quotes: requote once it is back
+            placed = np.minimum(self._bid_placed[bank], self._ask_placed[bank])
+            self._bank_due = float(np.fmin.reduce(placed + self._hold[bank]))
+
+        paper, bids, asks = [], [], []
+        for slot in self._scalar:
+            strategy = self.strategies[slot]
+            strategy.on_tick(self.symbol, book)
+            if self._paper[slot]:
+                paper.append(slot)
+                bids.append(np.nan if strategy.bid_quote is None else strategy.bid_quote)
+                asks.append(np.nan if strategy.ask_quote is None else strategy.ask_quote)
+        if paper:
+            self._rest(np.array(paper), np.array(bids), np.array(asks), now)
+        # Most updates fill nobody: compare against the most aggressive quotes first.
+        if len(self.strategies):
+            self._top_bid = np.fmax.reduce(self.bid_quote)
+            self._top_ask = np.fmin.reduce(self.ask_quote)
+
+    def _rest(self, slots: np.ndarray, bids: np.ndarray, asks: np.ndarray, now: float):
+        """Replace the quotes of ``slots`` that filled, are pulled or have rested ``hold_time``."""
+        hold = self._hold[slots]
+        for quotes, placed, desired in ((self.bid_quote, self._bid_placed, bids),
+                                        (self.ask_quote, self._ask_placed, asks)):
+            requote = ~(now - placed[slots] < hold) | np.isnan(quotes[slots]) | np.isnan(desired)
+            if requote.all():
+                quotes[slots] = desired
+                placed[slots] = now
+            else:
+                moved = slots[requote]
+                quotes[moved] = desired[requote]
+                placed[moved] = now
+
+    def _paper_fills(self, bid: float, ask: float, timestamp: int | None):
+        if not (ask <= self._top_bid or bid >= self._top_ask):
+            return
+        self._vacant = True
+        size = self.order_size
+        for side, slots in (("buy", np.flatnonzero(ask <= self.bid_quote)),
+                            ("sell", np.flatnonzero(bid >= self.ask_quote))):
+            if not len(slots):
+                continue
+            quotes = self.bid_quote if side == "buy" else self.ask_quote
+            prices = quotes[slots]
+            notional = size * prices
+            fee = notional * self.fee_rate
+            sign = 1.0 if side == "buy" else -1.0
+            self.inventory[slots] += sign * size
+            self.position[slots] += sign * size
+            self.cash[slots] -= sign * notional + fee
+            self.fees[slots] += fee
+            self.fills[slots] += 1
+            quotes[slots] = np.nan
+            for slot, price, slot_fee in zip(slots.tolist(), prices.tolist(), fee.tolist()):
+                if not self._batched[slot]:
+                    self.strategies[slot].on_order_fill({
+                        "id": f"paper-{slot}-{self.fills[slot]}",
+                        "symbol": self.symbol,
+                        "side": side,
+                        "price": price,
+                        "amount": size,
+                        "filled": size,
+                        "fee": slot_fee,
+                        "timestamp": timestamp,
+                    })
+
+    # ------------- Results ------------- #
+    def sync(self) -> None:
+        """Copy batched strategies' resting quotes, inventory and tick counts back to their objects."""
+        for slot in self._bank.tolist():
+            strategy = self.strategies[slot]
+            if self.fills[slot] or self.base_asset in strategy.inventory:
+                strategy.inventory[self.base_asset] = float(self.inventory[slot])
+            bid, ask = self.bid_quote[slot], self.ask_quote[slot]
+            strategy.bid_quote = None if bid != bid else float(bid)
+            strategy.ask_quote = None if ask != ask else float(ask)
+            strategy.tick_count += self.ticks - self._added_at[slot]
+            self._added_at[slot] = self.ticks
+
+    def pnl(self) -> np.ndarray:
+        """Paper PnL per slot: cash plus the paper position marked to the last mid, net of fees.
+
+        NaN for live strategies, whose fills the runner does not see.
+        """
+        return np.where(self._paper, self.cash + self.position * self.mark, np.nan)
+
+    def report(self):
+        """Per-strategy ``name, paper, ticks, inventory, fills, fees, pnl`` sorted by ``pnl``."""
+        import pandas as pd
+
+        self.sync()
+        table = pd.DataFrame({
+            "name": self.names,
+            "paper": self._paper,
+            "ticks": [s.tick_count for s in self.strategies],
+            "inventory": [s.inventory.get(self.base_asset, 0.0) for s in self.strategies],
+            "fills": self.fills,
+            "fees": self.fees,
+            "pnl": self.pnl(),
+        })
+        return table.sort_values("pnl", ascending=False, ignore_index=True)
+
+    async def report_every(self, interval: float, top: int = 5):
+        """Print the ``top`` strategies by paper PnL every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            table = self.report().head(top)
+            lines = [f"{row.name} pnl={row.pnl:.4f} inv={row.inventory:.4f} fills={row.fills}"
+                     for row in table.itertuples()]
+            print(f"[Runner] {self.symbol} top {len(lines)} of {len(self.strategies)}: " + " | ".join(lines))
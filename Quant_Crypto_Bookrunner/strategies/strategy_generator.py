@@ -1,6 +1,8 @@
 from typing import List, Dict
 import random
 
+import numpy as np
+
 DEFAULT_PARAM_GRID = {
     "spread_bps": [5, 10, 15, 20],
     "inventory_clip": [0.1, 0.2, 0.5],
@@ -24,6 +26,40 @@ def generate_from_research(papers: List[Dict]) -> Dict[str, float]:
     return params
 
 
+def generate_from_features(features) -> Dict[str, float]:
+    """Pick ``DEFAULT_PARAM_GRID`` values suited to a recorded market (``data.feature_store.Features``).
+
+    * ``spread_bps``: the narrowest half-spread covering half the typical quoted
+      spread plus a typical one-tick move;
+    * ``hold_time``: the longest that the expected move over the hold stays within it;
+    * ``inventory_clip``: tighter the more one-sided the book usually is.
+
+    Raises ``ValueError`` when the data is too short for ``realized_vol``
+    (``VOL_WINDOW`` ticks).
+    """
+    vol = features["realized_vol"]
+    if np.isnan(vol).all():
+        from data.feature_store import VOL_WINDOW
+
+        raise ValueError(f"generate_from_features needs at least {VOL_WINDOW} ticks, got {len(vol)}")
+    spread_bps = np.nanmedian(features["spread_bps"])
+    vol_bps = np.nanmedian(vol) * 10_000
+    need = spread_bps / 2 + vol_bps
+    spread_options = DEFAULT_PARAM_GRID["spread_bps"]
+    spread = next((x for x in spread_options if x >= need), spread_options[-1])
+
+    timestamps = features.columns.timestamp
+    span_s = (timestamps[-1] - timestamps[0]) / 1000 if len(timestamps) > 1 else 0.0
+    ticks_per_s = (len(timestamps) - 1) / span_s if span_s else 1.0
+    hold_options = sorted(DEFAULT_PARAM_GRID["hold_time"])
+    hold = next((h for h in reversed(hold_options) if vol_bps * np.sqrt(h * ticks_per_s) <= spread), hold_options[0])
+
+    skew = abs(float(np.nanmean(features["imbalance"])))
+    clips = sorted(DEFAULT_PARAM_GRID["inventory_clip"])
+    clip = clips[0] if skew > 0.2 else clips[len(clips) // 2] if skew > 0.05 else clips[-1]
+    return {"spread_bps": spread, "inventory_clip": clip, "hold_time": hold}
+
+
 if __name__ == "__main__":
     sample = [{"title": "Order Book Depth and Liquidity Provision", "summary": "", "url": ""}]
     print(generate_from_research(sample))
\ No newline at end of file
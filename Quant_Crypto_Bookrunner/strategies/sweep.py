@@ -0,0 +1,176 @@
+from typing import Any, Dict, Iterable, List
+import concurrent.futures
+import hashlib
+import itertools
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from analytics.post_trade import summary
+from data.feature_store import FeatureStore, Features
+from data.order_book import BookColumns
+
+from .backtester import Backtester
+from .bookrunner import BookrunnerStrategy
+from .strategy_generator import DEFAULT_PARAM_GRID
+
+# Per-worker handles set by _init_worker.
+_SHM: shared_memory.SharedMemory | None = None
+_COLUMNS: BookColumns | None = None
+_FEATURES: Features | None = None
+
+
+def expand_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a ``{param: [values, ...]}`` grid."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+def _fingerprint(dataset: str, symbol: str, points: List[Dict[str, Any]], sim_kwargs: Dict[str, Any]) -> str:
+    """Hash of everything a checkpointed row depends on."""
+    h = hashlib.blake2b(digest_size=10)
+    h.update(json.dumps([dataset, symbol, points, sim_kwargs], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _load_checkpoint(path: str, fingerprint: str) -> List[Dict[str, Any]]:
+    """Rows of the checkpoint at ``path``, created with a ``fingerprint`` header if missing.
+
+    Raises ``ValueError`` if it was written for another dataset, grid or
+    simulation settings.  A torn last line (the sweep died mid-write) is dropped
+    from the file so appends start on a fresh line.
+    """
+    rows: List[Dict[str, Any]] = []
+    with open(path, "a+b") as fh:
+        fh.seek(0)
+        header = fh.readline()
+        if not header.endswith(b"\n"):
+            # New, or killed before the header was complete.
+            fh.truncate(0)
+            fh.write((json.dumps({"fingerprint": fingerprint}) + "\n").encode())
+            return rows
+        found = json.loads(header).get("fingerprint")
+        if found != fingerprint:
+            raise ValueError(f"checkpoint {path} was written for another sweep "
+                             f"(fingerprint {found}, expected {fingerprint})")
+        end = fh.tell()
+        for line in fh:
+            if not line.endswith(b"\n"):
+                print(f"[Sweep] dropping incomplete last line of {path}")
+                break
+            rows.append(json.loads(line))
+            end += len(line)
+        fh.truncate(end)
+    return rows
+
+
+def _to_shared(columns: BookColumns):
+    """Copy every array of ``columns`` into one shared block; return it with its layout."""
+    layout, offset = [], 0
+    for field, arr in columns.arrays().items():
+        layout.append((field, arr.dtype.str, arr.shape, offset))
+        offset += arr.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for field, dtype, shape, off in layout:
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)[...] = getattr(columns, field)
+    return shm, layout
+
+
+def _init_worker(shm_name: str, layout, features_root: str, features_key: str):
+    global _SHM, _COLUMNS, _FEATURES
+    _SHM = shared_memory.SharedMemory(name=shm_name)
+    arrays = {
+        field: np.ndarray(shape, dtype=dtype, buffer=_SHM.buf, offset=off)
+        for field, dtype, shape, off in layout
+    }
+    if "bids" in arrays:
+        _COLUMNS = BookColumns.from_depth(arrays["timestamp"], arrays["bids"], arrays["asks"])
+    else:
+        _COLUMNS = BookColumns(*(arrays[f] for f in BookColumns.FIELDS))
+    # The parent computed them: every worker memory-maps the same cached arrays.
+    _FEATURES = FeatureStore(features_root).features(_COLUMNS, features_key)
+
+
+def _evaluate(params: Dict[str, Any], symbol: str, sim_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    strategy = BookrunnerStrategy(exchange=None, verbose=False, **params)
+    perf = Backtester(strategy, _COLUMNS, symbol, features=_FEATURES).simulate(**sim_kwargs)
+    row = dict(params)
+    row.update(summary(perf).to_dict())
+    row["fills"] = int(perf["fills"].sum())
+    return row
+
+
+def run_sweep(
+    columns: BookColumns,
+    symbol: str,
+    grid: Dict[str, Iterable[Any]] | None = None,
+    *,
+    processes: int | None = None,
+    checkpoint: str | None = None,
+    order_size: float = 0.01,
+    latency_ms: float = 50.0,
+    maker_fee_bps: float = 0.0,
+    rank_by: str = "sharpe",
+    store: FeatureStore | None = None,
+    key: str | None = None,
+) -> pd.DataFrame:
+    """Back-test every grid point across a process pool and return a ranked table.
+
+    Each point is replayed through the ``FillSimulator`` and scored with
+    ``analytics.post_trade.summary``.
+
+    ``columns`` is copied once into shared memory that every worker maps, and its
+    fair-price features are computed once into ``store`` (default ``FeatureStore()``,
+    dataset ``key``) and memory-mapped by every worker.  Finished
+    points are appended to ``checkpoint`` (JSON lines) as they complete, and points
+    already present there are skipped, so an interrupted sweep resumes where it stopped.
+    The checkpoint's header line fingerprints the dataset, grid and simulation
+    settings; resuming from a checkpoint of a different sweep raises ``ValueError``.
+    """
+    points = expand_grid(grid or DEFAULT_PARAM_GRID)
+    sim_kwargs = {"order_size": order_size, "latency_ms": latency_ms, "maker_fee_bps": maker_fee_bps}
+    store = store or FeatureStore()
+    features = store.features(columns, key)
+    rows: List[Dict[str, Any]] = []
+    if checkpoint:
+        rows = _load_checkpoint(checkpoint, _fingerprint(features.key, symbol, points, sim_kwargs))
+    done = {_key({k: row.get(k) for k in points[0]}) for row in rows}
+    todo = [p for p in points if _key(p) not in done]
+    print(f"[Sweep] {len(points)} grid points, {len(points) - len(todo)} already done")
+
+    features.compute(("mid", "microprice"))
+    shm, layout = _to_shared(columns)
+    log = open(checkpoint, "a") if checkpoint else None
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker,
+            initargs=(shm.name, layout, store.root, features.key)
+        ) as pool:
+            futures = {pool.submit(_evaluate, p, symbol, sim_kwargs): p for p in todo}
+            for i, fut in enumerate(concurrent.futures.as_completed(futures), 1):
+                row = fut.result()
+                rows.append(row)
+                if log:
+                    log.write(json.dumps(row) + "\n")
+                    log.flush()
+                print(f"[Sweep] {i}/{len(todo)} {futures[fut]} {rank_by}={row[rank_by]:.4f}")
+    finally:
+        if log:
+            log.close()
+        shm.close()
+        shm.unlink()
+
+    table = pd.DataFrame(rows)
+    return table.sort_values(rank_by, ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    from data.synthetic import book_columns
+
+    print(run_sweep(book_columns(100_000, seed=7), "BTC/USDT").head(10))
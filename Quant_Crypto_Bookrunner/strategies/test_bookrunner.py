@@ -0,0 +1,46 @@
+import numpy as np
+
+from data.order_book import BookColumns
+
+from .bookrunner import BookrunnerStrategy, _round_cents
+
+
+def test_round_cents_matches_round():
+    rng = np.random.default_rng(0)
+    values = np.concatenate((
+        rng.uniform(0.0, 100_000.0, 100_000),
+        # Exact and near half-cents, where np.round and round disagree most.
+        np.arange(0, 100_000, dtype=float) / 100 + 0.005,
+        np.nextafter(np.arange(0, 10_000, dtype=float) / 100 + 0.005, 0.0),
+        -rng.uniform(0.0, 1_000.0, 1_000),
+    ))
+    assert _round_cents(values).tolist() == [round(x, 2) for x in values.tolist()]
+
+
+def _columns(n=2_000, seed=1):
+    rng = np.random.default_rng(seed)
+    mid = 30_000 + np.cumsum(rng.normal(0.0, 2.0, n))
+    half = rng.uniform(0.005, 1.0, n)
+    bid_size = rng.uniform(0.0, 3.0, n)
+    ask_size = rng.uniform(0.0, 3.0, n)
+    bid_size[::50] = ask_size[::50] = 0.0  # empty top: microprice falls back to mid
+    return BookColumns(np.arange(n), mid - half, mid + half, bid_size, ask_size)
+
+
+def test_batch_quotes_match_scalar():
+    columns = _columns()
+    inventory = np.linspace(-0.5, 0.5, len(columns))
+    for price_source in ("mid", "microprice"):
+        batch = BookrunnerStrategy(None, verbose=False, price_source=price_source)
+        quotes = batch.on_ticks_batch("BTC/USDT", columns, inventory)
+
+        scalar = BookrunnerStrategy(None, verbose=False, price_source=price_source)
+        bids, asks = [], []
+        for inv, snap in zip(inventory.tolist(), columns.iter_snapshots("BTC/USDT")):
+            scalar.inventory["BTC"] = inv
+            scalar.on_tick("BTC/USDT", snap)
+            bids.append(scalar.bid_quote)
+            asks.append(scalar.ask_quote)
+        assert quotes["bid_quote"].tolist() == bids
+        assert quotes["ask_quote"].tolist() == asks
+        assert (batch.bid_quote, batch.ask_quote) == (scalar.bid_quote, scalar.ask_quote)
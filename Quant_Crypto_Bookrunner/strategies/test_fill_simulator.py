@@ -0,0 +1,50 @@
+import numpy as np
+
+from data.order_book import BookColumns
+
+from .base_strategy import BaseStrategy
+from .fill_simulator import FillSimulator
+
+
+class FixedQuote(BaseStrategy):
+    """Always bids ``price``; never asks."""
+
+    def __init__(self, price):
+        super().__init__(None)
+        self.price = price
+
+    def on_tick(self, symbol, market_data):
+        self.bid_quote = self.price
+
+    def on_order_fill(self, order):
+        self._update_inventory("BTC", float(order["filled"]))
+
+
+def _run(rows):
+    ts, bid, ask, bsz, asz = (np.array(col, dtype=float) for col in zip(*rows))
+    sim = FillSimulator(FixedQuote(99.5), "BTC/USDT", order_size=1.0, latency_ms=0.0, hold_time=0)
+    return sim.run(BookColumns(ts, bid, ask, bsz, asz)), sim
+
+
+def test_order_behind_top_of_book_joins_back_of_visible_queue():
+    frame, sim = _run([
+        (0, 100.0, 101.0, 5.0, 5.0),   # placed behind the touch: level unknown
+        (1, 100.0, 101.0, 5.0, 5.0),
+        (2, 99.5, 101.0, 3.0, 5.0),    # our level reaches the top with 3 shown
+        (3, 99.5, 101.0, 1.0, 5.0),    # 2 of the 3 ahead of us leave
+        (4, 99.5, 101.0, 0.5, 5.0),    # still ahead of us
+    ])
+    assert frame["fills"].sum() == 0
+    assert sim.position == 0.0
+
+
+def test_queue_counts_down_then_fills():
+    frame, sim = _run([
+        (0, 100.0, 101.0, 5.0, 5.0),
+        (1, 99.5, 101.0, 3.0, 5.0),    # visible: 3 ahead of us
+        (2, 99.5, 101.0, 4.0, 5.0),    # 1 joins behind us
+        (3, 99.5, 101.0, 0.5, 5.0),    # 3.5 leaves: the 3 ahead, then 0.5 of ours
+        (4, 99.0, 99.5, 1.0, 5.0),     # trades through: the rest fills
+    ])
+    assert frame["fills"].tolist() == [0, 0, 0, 1, 1]
+    assert [f["filled"] for f in sim.fills] == [0.5, 0.5]
@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import shutil
+
+import ccxt
+
+from data.journal import Journal
+
+from .bookrunner import BookrunnerStrategy
+from .quote_manager import QuoteManager
+
+
+class FakeVenue:
+    """Connector double: ``editOrder`` only with ``can_edit``; cancels fail while ``cancel_fails`` is set."""
+
+    class exchange:
+        id = "fake"
+
+    def __init__(self, can_edit=False):
+        self.open = {}
+        self.orders = {}
+        self.ids = itertools.count(1)
+        self.cancel_fails = False
+        self.can_edit = can_edit
+
+    def supports(self, feature):
+        return self.can_edit and feature == "editOrder"
+
+    async def place_order_async(self, symbol, side, amount, price=None, order_type="limit"):
+        order = {"id": str(next(self.ids)), "symbol": symbol, "side": side, "price": price, "amount": amount,
+                 "filled": 0.0, "status": "open"}
+        self.open[order["id"]] = self.orders[order["id"]] = order
+        return dict(order)
+
+    async def edit_order_async(self, order_id, symbol, side, amount, price):
+        await self.cancel_order_async(order_id, symbol)
+        return await self.place_order_async(symbol, side, amount, price)
+
+    async def cancel_order_async(self, order_id, symbol):
+        if self.cancel_fails:
+            raise ccxt.NetworkError("timed out")
+        if self.open.pop(order_id, None) is None:
+            raise ccxt.OrderNotFound(order_id)
+        self.orders[order_id]["status"] = "canceled"
+
+    async def fetch_open_orders_async(self, symbol):
+        return [dict(o) for o in self.open.values()]
+
+    async def fetch_order_async(self, order_id, symbol):
+        return dict(self.orders[order_id])
+
+    def fill(self, order_id, qty):
+        order = self.orders[order_id]
+        order["filled"] += qty
+        if order["filled"] >= order["amount"]:
+            order["status"] = "closed"
+            del self.open[order_id]
+
+    def resting(self, side):
+        return [o for o in self.open.values() if o["side"] == side]
+
+
+def test_failed_cancel_keeps_order_tracked_and_defers_replacement():
+    async def run():
+        venue = FakeVenue()
+        qm = QuoteManager(venue, order_size=1.0, price_tolerance_bps=0.0)
+        await qm.update("BTC/USDT", 100.0, None)
+        first = qm.orders["BTC/USDT"]["buy"]
+
+        venue.cancel_fails = True
+        await qm.update("BTC/USDT", 101.0, None)
+        # Still live on the venue: still tracked and nothing quoted on top of it.
+        assert len(venue.resting("buy")) == 1
+        assert qm.orders["BTC/USDT"]["buy"] is first and first.cancelling
+
+        venue.cancel_fails = False
+        await qm.update("BTC/USDT", 102.0, None)
+        assert [o["price"] for o in venue.resting("buy")] == [102.0]
+        assert qm.orders["BTC/USDT"]["buy"].price == 102.0
+
+    asyncio.run(run())
+
+
+def test_failed_cancel_of_order_already_gone_is_replaced():
+    async def run():
+        venue = FakeVenue()
+        qm = QuoteManager(venue, order_size=1.0, price_tolerance_bps=0.0)
+        await qm.update("BTC/USDT", 100.0, None)
+        venue.fill(qm.orders["BTC/USDT"]["buy"].id, 1.0)  # filled meanwhile
+        venue.cancel_fails = True
+        await qm.update("BTC/USDT", 101.0, None)
+        assert [o["price"] for o in venue.resting("buy")] == [101.0]
+
+    asyncio.run(run())
+
+
+def test_cancel_all_retries_until_confirmed():
+    async def run():
+        venue = FakeVenue()
+        qm = QuoteManager(venue, order_size=1.0)
+        await qm.update("BTC/USDT", 100.0, 102.0)
+        venue.cancel_fails = True
+        attempts = [0]
+        cancel = venue.cancel_order_async
+
+        async def flaky(order_id, symbol):
+            attempts[0] += 1
+            venue.cancel_fails = attempts[0] <= 2
+            return await cancel(order_id, symbol)
+
+        venue.cancel_order_async = flaky
+        await qm.cancel_all()
+        assert not venue.open
+        assert not qm.orders["BTC/USDT"]
+
+    asyncio.run(run())
+
+
+class Log:
+    """Journal double recording order events."""
+
+    def __init__(self):
+        self.events = []
+
+    def order_new(self, symbol, order_id, side, price, amount):
+        self.events.append(("new", order_id))
+
+    def order_cancel(self, symbol, order_id):
+        self.events.append(("cancel", order_id))
+
+    def order_filled(self, symbol, order_id):
+        self.events.append(("filled", order_id))
+
+
+def test_polled_fills_are_reported_and_filled_side_requoted():
+    async def run():
+        venue = FakeVenue()
+        fills = []
+        qm = QuoteManager(venue, order_size=1.0, on_fill=fills.append)
+        task = asyncio.create_task(qm.run())
+        qm.submit("BTC/USDT", 100.0, 102.0)
+        await asyncio.sleep(0.01)
+        bid, ask = qm.orders["BTC/USDT"]["buy"], qm.orders["BTC/USDT"]["sell"]
+
+        venue.fill(bid.id, 0.4)
+        await qm.reconcile_fills("BTC/USDT")
+        venue.fill(bid.id, 0.6)
+        await qm.reconcile_fills("BTC/USDT")
+        await qm.reconcile_fills("BTC/USDT")  # nothing new
+        assert [(f["side"], f["filled"]) for f in fills] == [("buy", 0.4), ("buy", 0.6)]
+
+        # The filled bid is replaced at once, without waiting for new quotes or hold_time.
+        await asyncio.sleep(0.01)
+        assert qm.orders["BTC/USDT"]["sell"] is ask
+        assert [o["price"] for o in venue.resting("buy")] == [100.0]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+
+
+def test_cancel_of_filled_order_reports_the_fill():
+    async def run():
+        venue = FakeVenue()
+        fills = []
+        log = Log()
+        qm = QuoteManager(venue, order_size=1.0, price_tolerance_bps=0.0, on_fill=fills.append, journal=log)
+        await qm.update("BTC/USDT", 100.0, None)
+        venue.fill(qm.orders["BTC/USDT"]["buy"].id, 1.0)
+        await qm.update("BTC/USDT", 101.0, None)  # the cancel finds the order gone
+        assert [(f["side"], f["filled"], f["price"]) for f in fills] == [("buy", 1.0, 100.0)]
+        assert [o["price"] for o in venue.resting("buy")] == [101.0]
+        assert log.events == [("new", "1"), ("filled", "1"), ("new", "2")]
+
+    asyncio.run(run())
+
+
+def test_edit_journals_the_replaced_id():
+    async def run():
+        venue = FakeVenue(can_edit=True)
+        log = Log()
+        qm = QuoteManager(venue, order_size=1.0, price_tolerance_bps=0.0, journal=log)
+        await qm.update("BTC/USDT", 100.0, None)
+        await qm.update("BTC/USDT", 101.0, None)
+        assert log.events == [("new", "1"), ("cancel", "1"), ("new", "2")]
+
+    asyncio.run(run())
+
+
+def test_filled_order_is_journaled_as_a_fill_and_restored(tmp_path):
+    async def run(journal):
+        venue = FakeVenue()
+        strategy = BookrunnerStrategy(venue, verbose=False)
+        strategy.restore(journal, "BTC/USDT")
+        qm = QuoteManager(venue, order_size=1.0, price_tolerance_bps=0.0, journal=journal,
+                          on_fill=strategy.on_order_fill)
+        await qm.update("BTC/USDT", 100.0, 102.0)
+        venue.fill(qm.orders["BTC/USDT"]["buy"].id, 0.25)
+        await qm.reconcile_fills("BTC/USDT")
+        venue.fill(qm.orders["BTC/USDT"]["buy"].id, 0.75)
+        await qm.update("BTC/USDT", 101.0, 102.0)  # the cancel finds the bid filled
+        return venue
+
+    journal = Journal(str(tmp_path / "live"), commit_interval=0.0, fsync=False)
+    venue = asyncio.run(run(journal))
+    journal.flush()
+    # Recover from the journal as a crash would have left it (no closing snapshot).
+    shutil.copytree(tmp_path / "live", tmp_path / "crashed")
+    journal.close()
+
+    restored = Journal(str(tmp_path / "crashed"), commit_interval=0.0, fsync=False)
+    assert restored.state_for("BTC/USDT")["inventory"] == {"BTC": 1.0}
+    resting = {o["id"] for o in venue.open.values()}
+    assert {o["id"] for o in restored.open_orders("BTC/USDT")} == resting
+    restored.close()
@@ -0,0 +1,33 @@
+from data.order_book import OrderBook
+
+from .runner import StrategyRunner
+
+
+def _book(bid, ask, timestamp):
+    book = OrderBook("BTC/USDT", 5)
+    book.reset([(bid, 1.0)], [(ask, 1.0)], timestamp=timestamp)
+    return book
+
+
+def test_paper_quotes_rest_for_hold_time():
+    runner = StrategyRunner("BTC/USDT", order_size=1.0)
+    _, held = runner.add_grid({"spread_bps": [10], "hold_time": [0, 10]})
+    assert runner.names == ["spread_bps=10 hold_time=0", "spread_bps=10 hold_time=10"]
+
+    runner.on_book(_book(99.95, 100.05, 0))
+    assert runner.ask_quote.tolist() == [100.1, 100.1]
+    # The market drifts up: only the variant without a hold follows it.
+    runner.on_book(_book(100.0, 100.1, 1_000))
+    assert runner.ask_quote.tolist() == [100.15, 100.1]
+    # A bid at the resting ask fills the held quote only; it is replaced right away
+    # (wider, for the inventory it now holds) while its bid keeps resting.
+    runner.on_book(_book(100.1, 100.2, 2_000))
+    assert runner.fills.tolist() == [0, 1]
+    assert runner.ask_quote[held] == 100.35
+    assert runner.bid_quote[held] == 99.9
+
+    # The held bid expires after ten seconds and is requoted off the current book.
+    runner.on_book(_book(100.1, 100.2, 9_000))
+    assert runner.bid_quote[held] == 99.9
+    runner.on_book(_book(100.1, 100.2, 10_000))
+    assert runner.bid_quote.tolist() == [100.05, 99.95]
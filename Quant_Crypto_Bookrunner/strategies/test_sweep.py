@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from data.feature_store import VOL_WINDOW, FeatureStore
+from data.synthetic import book_columns
+
+from .backtester import Backtester
+from .bookrunner import BookrunnerStrategy
+from .strategy_generator import generate_from_features
+from .sweep import run_sweep
+
+
+def test_simulate_with_features_matches_books(tmp_path):
+    columns = book_columns(3_000, seed=8)
+    features = FeatureStore(str(tmp_path)).features(columns)
+    for price_source in ("mid", "microprice"):
+        runs = [
+            Backtester(BookrunnerStrategy(None, verbose=False, price_source=price_source), columns, "BTC/USDT",
+                       features=f).simulate(latency_ms=0.0)
+            for f in (None, features)
+        ]
+        assert runs[0].equals(runs[1])
+
+
+def test_sweep_workers_share_cached_features(tmp_path):
+    columns = book_columns(2_000, seed=9)
+    store = FeatureStore(str(tmp_path))
+    table = run_sweep(columns, "BTC/USDT", {"spread_bps": [5, 10], "price_source": ["mid", "microprice"]},
+                      processes=2, store=store, key="synthetic")
+    assert len(table) == 4
+    cached = sorted(name.split(".")[0] for name in os.listdir(tmp_path / "synthetic"))
+    assert cached == ["microprice", "mid"]
+
+
+def test_generate_from_features_rejects_short_data(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        generate_from_features(store.features(book_columns(VOL_WINDOW - 1, seed=1)))
+    params = generate_from_features(store.features(book_columns(5 * VOL_WINDOW, seed=1)))
+    assert set(params) == {"spread_bps", "inventory_clip", "hold_time"}
+
+
+def test_checkpoint_resumes_only_its_own_sweep(tmp_path):
+    columns = book_columns(2_000, seed=9)
+    store = FeatureStore(str(tmp_path / "features"))
+    grid = {"spread_bps": [5, 10]}
+    path = str(tmp_path / "sweep.jsonl")
+    first = run_sweep(columns, "BTC/USDT", grid, processes=1, checkpoint=path, store=store)
+
+    # Killed mid-write: the torn row is dropped and its point evaluated again.
+    with open(path) as fh:
+        header, *lines = fh.readlines()
+    with open(path, "w") as fh:
+        fh.write(header + lines[0] + lines[1][:20])
+    resumed = run_sweep(columns, "BTC/USDT", grid, processes=1, checkpoint=path, store=store)
+    assert resumed.equals(first)
+    with open(path) as fh:
+        assert len(fh.readlines()) == 3
+
+    with pytest.raises(ValueError):
+        run_sweep(columns, "BTC/USDT", {"spread_bps": [5, 20]}, processes=1, checkpoint=path, store=store)
+    with pytest.raises(ValueError):
+        run_sweep(book_columns(2_000, seed=10), "BTC/USDT", grid, processes=1, checkpoint=path, store=store)
@@ -1,9 +1,9 @@
 import os
 import sys
-import time
-import asyncio
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 import streamlit as st
 
 # Add project root to path to allow absolute imports when running via Streamlit
@@ -11,22 +11,24 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 if ROOT not in sys.path:
     sys.path.append(ROOT)
 
-from data.tiingo_connector import TiingoConnector  # noqa: E402
-from data.exchange_connectors import BinanceConnector, CoinbaseConnector, KrakenConnector  # noqa: E402
-from strategies.bookrunner import BookrunnerStrategy  # noqa: E402
-from data.research_aggregator import gather_research  # noqa: E402
-from strategies.strategy_generator import generate_from_research  # noqa: E402
+from data import exchange_connectors  # noqa: E402
+from analytics.downsample import lttb  # noqa: E402
+from ui.live_feed import FIELDS, FeedPool, LiveFeed  # noqa: E402
 
 # ---------------- Config ---------------- #
-TIINGO_API_KEY = os.getenv("TIINGO_API_KEY", "5c30f6c2e27d1f902ace1d777b29691a610df388")
-
+# Connector classes (and ccxt) are only imported once a feed is started.
 EXCH_MAP = {
-    "Binance": BinanceConnector,
-    "Coinbase": CoinbaseConnector,
-    "Kraken": KrakenConnector,
+    "Binance": "BinanceConnector",
+    "Coinbase": "CoinbaseConnector",
+    "Kraken": "KrakenConnector",
+    "Simulated": "SimulatedConnector",
 }
 
 REFRESH_SEC = 1
+# A feed no session has read for this long (tab closed, settings changed) is stopped.
+FEED_IDLE_SEC = 30
+# Points per chart series; older history is LTTB-downsampled to stay near this.
+MAX_POINTS = 1500
 
 
 # ---------------- UI ---------------- #
@@ -37,74 +39,112 @@ with st.sidebar:
     st.header("Settings")
     exchange_name = st.selectbox("Exchange", list(EXCH_MAP.keys()), index=0)
     symbol = st.text_input("Symbol", "BTC/USDT")
+    use_bus = st.checkbox("Read from market bus (main.py --publish)")
     use_research = st.checkbox("Generate params from research (100+ papers)")
-    run_btn = st.button("▶️ Run / Refresh")
-
-placeholder_header = st.empty()
-placeholder_quotes = st.empty()
-placeholder_metrics = st.empty()
+    if st.button("▶️ Run / Refresh"):
+        st.session_state.running = True
 
 
 @st.cache_data(show_spinner=False)
 def _get_research_params() -> dict:
+    from data.research_aggregator import gather_research
+    from strategies.strategy_generator import generate_from_research
+
     papers = gather_research("crypto market making", min_results=120)
     params = generate_from_research(papers)
     return params
 
 
+@st.cache_resource(show_spinner=False)
+def feed_pool() -> FeedPool:
+    """Background feeds shared by every session and browser tab."""
+    return FeedPool(idle_timeout=FEED_IDLE_SEC)
+
+
+def get_feed(exchange_name: str, symbol: str, spread_bps: int, inventory_clip: float, hold_time: int,
+             use_bus: bool = False) -> LiveFeed:
+    """The pool's feed for this configuration, started on first use."""
+    params = {"spread_bps": spread_bps, "inventory_clip": inventory_clip, "hold_time": hold_time}
+    exchange_cls = getattr(exchange_connectors, EXCH_MAP[exchange_name])
+    key = (exchange_name, symbol, spread_bps, inventory_clip, hold_time, use_bus)
+    return feed_pool().get(key, lambda: LiveFeed(exchange_cls, symbol, params, interval=REFRESH_SEC, use_bus=use_bus))
+
+
+def _downsample(frame: pd.DataFrame, points: int) -> pd.DataFrame:
+    # Keep the union of the LTTB picks for each plotted series.
+    x = frame["timestamp"].to_numpy()
+    per_series = max(3, points // 3)
+    keep = np.unique(np.concatenate([lttb(x, frame[col].to_numpy(), per_series) for col in ("mid", "inventory", "pnl")]))
+    return frame.iloc[keep].reset_index(drop=True)
+
+
+def _history(feed: LiveFeed) -> pd.DataFrame:
+    """This session's chart data: downsampled older points plus the raw rows since the last refresh."""
+    key = f"view-{id(feed)}"
+    view = st.session_state.get(key)
+    if view is None:
+        view = st.session_state[key] = {"seq": 0, "frame": pd.DataFrame(columns=FIELDS, dtype=float)}
+    rows, view["seq"] = feed.history.since(view["seq"])
+    if len(rows["timestamp"]):
+        new = pd.DataFrame(rows)
+        view["frame"] = new if view["frame"].empty else pd.concat([view["frame"], new], ignore_index=True)
+    if len(view["frame"]) > 2 * MAX_POINTS:
+        view["frame"] = _downsample(view["frame"], MAX_POINTS)
+    return view["frame"]
+
+
+@st.fragment(run_every=REFRESH_SEC)
+def live_panel(feed: LiveFeed):
+    """Reruns on its own every REFRESH_SEC; only reads what the feed already published."""
+    pool = feed_pool()
+    pool.touch(feed)
+    pool.reap()
+    if feed.error:
+        st.error(f"Error: {feed.error}")
+    frame = _history(feed)
+    if frame.empty:
+        st.info("Waiting for the first order book…")
+        return
+
+    last = frame.iloc[-1]
+    st.markdown(
+        f"### {feed.symbol}  |  Time: {datetime.utcnow().strftime('%H:%M:%S')}  |  Mid: **{last['mid']:.2f}**"
+    )
+    cols = st.columns(5)
+    cols[0].metric("Bid quote", f"{last['bid_quote']:.2f}")
+    cols[1].metric("Ask quote", f"{last['ask_quote']:.2f}")
+    cols[2].metric("Inventory", f"{last['inventory']:.4f}")
+    cols[3].metric("PnL", f"{feed.performance.total:.2f}", f"max DD {feed.performance.max_drawdown:.2f}",
+                   delta_color="off")
+    cols[4].metric("Ticks", feed.strategy.tick_count)
+
+    chart = frame.assign(time=pd.to_datetime(frame["timestamp"], unit="ms")).set_index("time")
+    st.line_chart(chart[["mid", "bid_quote", "ask_quote"]], height=300)
+    left, right = st.columns(2)
+    left.line_chart(chart[["inventory"]], height=200)
+    right.line_chart(chart[["pnl"]], height=200)
+    st.dataframe(feed.latency.summary(), use_container_width=True)
+
+
 def main():
-    if not run_btn:
+    if not st.session_state.get("running"):
         st.info("Configure settings and press Run to start streaming.")
         return
 
-    # Build exchange + strategy
-    exchange_cls = EXCH_MAP[exchange_name]
-    exchange = exchange_cls()
-
     params = {"spread_bps": 10, "inventory_clip": 0.2, "hold_time": 60}
     if use_research:
         params.update(_get_research_params())
         st.sidebar.success(f"Research-powered params: {params}")
 
-    strategy = BookrunnerStrategy(
-        exchange=exchange,
-        spread_bps=params["spread_bps"],
-        inventory_clip=params["inventory_clip"],
-        hold_time=params["hold_time"],
-    )
-
-    tiingo = TiingoConnector(TIINGO_API_KEY)
-
-    st.success("Streaming started – updates every second.")
-    while True:
-        try:
-            order_book = exchange.get_order_book(symbol)
-            strategy.on_tick(symbol, order_book)
-
-            bid = order_book["bids"][0][0]
-            ask = order_book["asks"][0][0]
-            mid = (bid + ask) / 2
-
-            placeholder_header.markdown(
-                f"### {symbol}  |  Time: {datetime.utcnow().strftime('%H:%M:%S')}  |  Mid: **{mid:.2f}**"
-            )
-
-            placeholder_quotes.table({
-                "Side": ["Bid", "Ask"],
-                "Price": [bid, ask],
-                "Quote": [strategy.inventory.get(symbol.split("/")[0], 0.0), "-"]
-            })
-
-            placeholder_metrics.json({
-                "tick": strategy.tick_count,
-                "inventory": strategy.inventory,
-            })
-
-            time.sleep(REFRESH_SEC)
-        except Exception as e:
-            st.error(f"Error: {e}")
-            time.sleep(REFRESH_SEC)
+    try:
+        feed = get_feed(exchange_name, symbol, params["spread_bps"], params["inventory_clip"], params["hold_time"],
+                        use_bus)
+    except FileNotFoundError:
+        st.error(f"No market bus for {exchange_name}: start `python main.py --publish --exchange {exchange_name.lower()}`.")
+        return
+    st.success(f"Streaming from a shared background feed – updates every {REFRESH_SEC}s.")
+    live_panel(feed)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,166 @@
+"""Background market feed for the dashboard, shared by every browser session.
+
+A ``LiveFeed`` owns one connector and strategy, polls the book on its own thread
+and publishes each tick into a bounded ``RingBuffer``.  Readers keep a sequence
+cursor and pull only the rows published since their last visit.  A ``FeedPool``
+hands out one feed per configuration and stops those no session reads any more.
+"""
+from typing import Callable, Dict, Hashable, Tuple
+import threading
+import time
+
+import numpy as np
+
+from analytics.latency import LatencyRecorder, now_ns
+from analytics.streaming import PerformanceAccumulator
+from data.market_bus import MarketBusReader, bus_name
+from strategies.bookrunner import BookrunnerStrategy
+
+FIELDS = ("timestamp", "mid", "bid_quote", "ask_quote", "inventory", "pnl")
+
+
+class RingBuffer:
+    """Fixed-capacity columnar history; one writer thread, any number of readers."""
+
+    def __init__(self, capacity: int, fields: Tuple[str, ...] = FIELDS):
+        self.capacity = capacity
+        self.fields = fields
+        self.columns = {name: np.full(capacity, np.nan) for name in fields}
+        self.written = 0  # total rows ever appended; row k lives at k % capacity
+        self._lock = threading.Lock()
+
+    def append(self, **row: float):
+        with self._lock:
+            i = self.written % self.capacity
+            for name in self.fields:
+                value = row.get(name)
+                self.columns[name][i] = np.nan if value is None else value
+            self.written += 1
+
+    def since(self, seq: int) -> Tuple[Dict[str, np.ndarray], int]:
+        """Rows appended after sequence number ``seq`` (oldest first) and the new cursor."""
+        with self._lock:
+            end = self.written
+            start = max(seq, end - self.capacity)
+            idx = np.arange(start, end) % self.capacity
+            return {name: col[idx] for name, col in self.columns.items()}, end
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+
+class LiveFeed:
+    """Polls ``symbol`` every ``interval`` seconds, runs the strategy and records the result.
+
+    With ``use_bus`` the book is read from the exchange's market bus (``main.py --publish``)
+    instead of being fetched over the network.
+    """
+
+    def __init__(self, exchange_cls, symbol: str, params: Dict, *, interval: float = 1.0,
+                 capacity: int = 250_000, use_bus: bool = False):
+        self.exchange_name = exchange_cls.__name__.replace("Connector", "")
+        self.exchange = exchange_cls()
+        self.bus = MarketBusReader(bus_name(self.exchange_name)) if use_bus else None
+        self.symbol = symbol
+        self.base_asset = symbol.split("/")[0]
+        self.strategy = BookrunnerStrategy(exchange=self.exchange, verbose=False, **params)
+        self.interval = interval
+        self.history = RingBuffer(capacity)
+        self.performance = PerformanceAccumulator()
+        self.latency = LatencyRecorder()
+        self.last_book = None
+        self.error: str | None = None
+        self._fetch = self.latency.histogram(self.exchange_name, symbol, "fetch")
+        self._strategy = self.latency.histogram(self.exchange_name, symbol, "strategy")
+        self._prev_mid: float | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"feed-{symbol}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._tick()
+                self.error = None
+            except Exception as exc:
+                self.error = str(exc)
+            self._stop.wait(self.interval)
+
+    def _tick(self):
+        start = now_ns()
+        if self.bus is not None:
+            if self.bus.writer_stopped() and not self.bus.reattach():
+                raise TimeoutError(f"market bus {self.bus.name} writer stopped")
+            book = self.bus.read(self.symbol, self.last_book)
+            if book is None:
+                return
+        else:
+            self.exchange.load_markets()  # from the on-disk cache after the first run
+            book = self.exchange.get_book(self.symbol)
+        start = self._fetch.record_since(start)
+        inventory = self.strategy.inventory.get(self.base_asset, 0.0)
+        self.strategy.on_tick(self.symbol, book)
+        self._strategy.record_since(start)
+
+        # Mark-to-mid PnL of the inventory held over the last interval.
+        mid = book.mid
+        if self._prev_mid is not None:
+            self.performance.update(inventory * (mid - self._prev_mid))
+        self._prev_mid = mid
+        self.last_book = book
+        self.history.append(
+            timestamp=time.time() * 1000,
+            mid=mid,
+            bid_quote=self.strategy.bid_quote,
+            ask_quote=self.strategy.ask_quote,
+            inventory=self.strategy.inventory.get(self.base_asset, 0.0),
+            pnl=self.performance.total,
+        )
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        if self.bus is not None:
+            self.bus.close()
+
+
+class FeedPool:
+    """One ``LiveFeed`` per configuration key, shared by every session.
+
+    Readers call ``get`` or ``touch`` on every refresh; a feed nobody has used for
+    ``idle_timeout`` seconds (its sessions closed or switched to another
+    configuration) is stopped so its thread does not keep polling.
+    """
+
+    def __init__(self, idle_timeout: float = 30.0):
+        self.idle_timeout = idle_timeout
+        self.feeds: Dict[Hashable, LiveFeed] = {}
+        self._last_used: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], LiveFeed]) -> LiveFeed:
+        with self._lock:
+            feed = self.feeds.get(key)
+            if feed is None:
+                feed = self.feeds[key] = factory()
+            self._last_used[key] = time.monotonic()
+        self.reap()
+        return feed
+
+    def touch(self, feed: LiveFeed):
+        """Mark ``feed`` as still read by someone."""
+        with self._lock:
+            for key, pooled in self.feeds.items():
+                if pooled is feed:
+                    self._last_used[key] = time.monotonic()
+
+    def reap(self):
+        """Stop feeds idle for longer than ``idle_timeout``."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [key for key, used in self._last_used.items() if now - used > self.idle_timeout]
+            feeds = [self.feeds.pop(key) for key in stale]
+            for key in stale:
+                del self._last_used[key]
+        for feed in feeds:
+            feed.stop()